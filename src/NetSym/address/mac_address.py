@@ -43,6 +43,10 @@ class MACAddress:
         """Returns if a MAC address is the broadcast MAC or not"""
         return bool(self.string_mac.lower() == ADDRESSES.MAC.BROADCAST.lower())
 
+    def is_multicast(self) -> bool:
+        """Returns if a MAC address is a group address (the least significant bit of the first byte is set) - the broadcast is one as well"""
+        return bool(int(self.string_mac.split(ADDRESSES.MAC.SEPARATOR)[0], base=16) & 1)
+
     @classmethod
     def broadcast(cls) -> MACAddress:
         """
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import random
 from collections import deque
+from heapq import heappush, heappop
+from itertools import count
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Optional, List, Type, Generator, Dict, Iterable, Union, Tuple, Any, Set, Callable, Sequence, cast, TypeVar
 
@@ -11,15 +13,20 @@ from NetSym.address.ip_address import IPAddress
 from NetSym.address.mac_address import MACAddress
 from NetSym.computing.internals.filesystem.filesystem import Filesystem
 from NetSym.computing.internals.network_data_structures.arp_cache import ArpCache
-from NetSym.computing.internals.network_data_structures.dns_cache import DNSCache
+from NetSym.computing.internals.network_data_structures.arp_pending_table import ARPPendingTable
+from NetSym.computing.internals.network_data_structures.dns_cache import DNSCache, PendingDNSQuery
+from NetSym.computing.internals.network_data_structures.icmp_rate_limiter import ICMPRateLimiter
+from NetSym.computing.internals.network_data_structures.nameserver_health import NameserverHealth
 from NetSym.computing.internals.network_data_structures.packet_sending_queue import PacketSendingQueue
 from NetSym.computing.internals.network_data_structures.routing_table import RoutingTable
 from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
 from NetSym.computing.internals.network_interfaces.loopback_interface import LoopbackInterface
 from NetSym.computing.internals.network_interfaces.network_interface import NetworkInterface
 from NetSym.computing.internals.network_interfaces.wireless_network_interface import WirelessNetworkInterface
-from NetSym.computing.internals.processes.abstracts.process import PacketMetadata, ReturnedPacket, WaitingFor
-from NetSym.computing.internals.processes.kernelmode_processes.arp_process import ARPProcess, SendPacketWithARPProcess
+from NetSym.computing.internals.processes.abstracts.process import PacketMetadata, ReturnedPacket, WaitingFor, Timeout
+from NetSym.computing.internals.processes.abstracts.process_internal_errors import ProcessInternalError, ProcessInternalError_NoResponseForDNSQuery
+from NetSym.computing.internals.processes.kernelmode_processes.arp_process import ARPProcess, SendPacketWithARPProcess, \
+    ResolveNextHopProcess
 from NetSym.computing.internals.processes.process_scheduler import ProcessScheduler
 from NetSym.computing.internals.processes.usermode_processes.daytime_process.daytime_server_process import DAYTIMEServerProcess
 from NetSym.computing.internals.processes.usermode_processes.dhcp_process.dhcp_client_process import DHCPClientProcess
@@ -43,10 +50,10 @@ from NetSym.gui.tech.shell_graphics import ShellGraphics
 from NetSym.packets.all import ICMP, IP, TCP, UDP, ARP
 from NetSym.packets.usefuls.dns import T_Hostname, validate_domain_hostname, canonize_domain_hostname
 from NetSym.packets.usefuls.ip import needs_fragmentation, fragment_packet, needs_reassembly, reassemble_fragmented_packet, allows_fragmentation, \
-    are_fragments_valid
+    are_fragments_valid, flow_hash
 from NetSym.packets.usefuls.tcp import get_src_port, get_dst_port
 from NetSym.packets.usefuls.usefuls import get_dst_ip
-from NetSym.usefuls.funcs import get_the_one, get_the_one_with_raise
+from NetSym.usefuls.funcs import get_the_one_with_raise
 
 if TYPE_CHECKING:
     from NetSym.packets.packet import Packet
@@ -140,8 +147,11 @@ class Computer:
         #       In `received_raw` every fragment is a separate packet, in `received` they get after they are reassembled into one
 
         self.arp_cache = ArpCache()
+        self.arp_pending_table = ARPPendingTable()
         self.routing_table = RoutingTable.create_default(self.ips)
         self.dns_cache = DNSCache()
+        self.nameserver_health = NameserverHealth()
+        self.icmp_rate_limiter = ICMPRateLimiter()
 
         self.filesystem = Filesystem.with_default_dirs()
         self.process_scheduler = ProcessScheduler(self)
@@ -164,8 +174,11 @@ class Computer:
         self.active_shells: List[ShellGraphics] = []
 
         self.initial_size = IMAGES.SCALE_FACTORS.SPRITES, IMAGES.SCALE_FACTORS.SPRITES
-        self._packet_sending_queues:   List[PacketSendingQueue] = []
-        self._active_packet_fragments: List[ReturnedPacket]     = []
+        self._packet_sending_queues:   Dict[Tuple[int, str], PacketSendingQueue]    = {}
+        self._packet_sending_schedule: List[Tuple[T_Time, int, PacketSendingQueue]] = []
+        # ^ a heap of the queues that have packets to send - ordered by the time they are allowed to send their next packet
+        self._packet_sending_schedule_counter = count()  # breaks ties between queues that are due in the same time
+        self._active_packet_fragments: List[ReturnedPacket] = []
         self.icmp_sequence_number = 0
         self._latest_ip_id = random.randint(0, PROTOCOLS.IP.MAX_IP_ID)
 
@@ -202,17 +215,21 @@ class Computer:
         return [interface for interface in self.interfaces if isinstance(interface, CableNetworkInterface)]
 
     @property
-    def dns_server(self) -> Optional[IPAddress]:
+    def dns_servers(self) -> List[IPAddress]:
         """
-        Read the name of the DNS server from the '/etc/resolv.conf'
+        Read the addresses of all of the DNS servers from the '/etc/resolv.conf' (in the order they are written)
         """
-        dns_servers = self.filesystem.parse_conf_file_format(COMPUTER.FILES.CONFIGURATIONS.DNS_CLIENT_PATH,
-                                                             raise_if_does_not_exist=False).get('nameserver', [])
-
-        if not dns_servers:
-            return None
+        return [IPAddress(dns_server) for dns_server in
+                self.filesystem.parse_conf_file_format(COMPUTER.FILES.CONFIGURATIONS.DNS_CLIENT_PATH,
+                                                       raise_if_does_not_exist=False).get('nameserver', [])]
 
-        return IPAddress(dns_servers[0])  # TODO: IMPROVE: what if multiple DNS servers? why only the first?
+    @property
+    def dns_server(self) -> Optional[IPAddress]:
+        """
+        Read the name of the first DNS server from the '/etc/resolv.conf'
+        """
+        dns_servers = self.dns_servers
+        return dns_servers[0] if dns_servers else None
 
     @dns_server.setter
     def dns_server(self, value: Optional[IPAddress]) -> None:
@@ -225,6 +242,33 @@ class Computer:
             elif 'nameserver' in conf_value:
                 del conf_value['nameserver']
 
+    @property
+    def dns_resolver_policy(self) -> str:
+        """
+        How multiple DNS servers are asked, one of `PROTOCOLS.DNS.RESOLVER_POLICIES`.
+        It is parallel if the '/etc/resolv.conf' has an 'options parallel' line, and sequential otherwise.
+        """
+        options = self.filesystem.parse_conf_file_format(COMPUTER.FILES.CONFIGURATIONS.DNS_CLIENT_PATH,
+                                                         raise_if_does_not_exist=False).get('options', [])
+        if PROTOCOLS.DNS.RESOLVER_POLICIES.PARALLEL in options:
+            return PROTOCOLS.DNS.RESOLVER_POLICIES.PARALLEL
+        return PROTOCOLS.DNS.RESOLVER_POLICIES.SEQUENTIAL
+
+    @dns_resolver_policy.setter
+    def dns_resolver_policy(self, value: str) -> None:
+        """
+        Set the policy of asking multiple DNS servers (in the /etc/resolv.conf file)
+        """
+        with self.filesystem.parsed_editable_conf_file(COMPUTER.FILES.CONFIGURATIONS.DNS_CLIENT_PATH, raise_if_does_not_exist=False) as conf_value:
+            options = [option for option in conf_value.get('options', []) if option != PROTOCOLS.DNS.RESOLVER_POLICIES.PARALLEL]
+            if value == PROTOCOLS.DNS.RESOLVER_POLICIES.PARALLEL:
+                options.append(value)
+
+            if options:
+                conf_value['options'] = options
+            elif 'options' in conf_value:
+                del conf_value['options']
+
     @property
     def domain(self) -> Optional[T_Hostname]:
         """
@@ -422,6 +466,10 @@ class Computer:
         # TODO: This being here is disgusting!!! It is because all computers have the same GraphcisObject and the buttons are dictated there...
         raise NotImplementedError
 
+    def get_storm_control_string(self) -> str:
+        # Same as `get_mac_address_table_string` - only switches have a storm control
+        raise NotImplementedError
+
     # --------------------------------------- v  Computer power  v ------------------------------------------------
 
     def power(self) -> None:
@@ -444,12 +492,16 @@ class Computer:
         self.process_scheduler.on_shutdown()
         self.filesystem.wipe_temporary_directories()
         self.arp_cache.wipe()
+        self.arp_pending_table.wipe()
         self.dns_cache.wipe()
+        self.nameserver_health.wipe()
+        self.icmp_rate_limiter.wipe()
         self._remove_all_sockets()
         self._close_all_shells()
 
         self._active_packet_fragments.clear()
         self._packet_sending_queues.clear()
+        self._packet_sending_schedule.clear()
         self.received.clear()
         self.received_raw.clear()
 
@@ -593,13 +645,14 @@ class Computer:
         return any(interface.has_ip() and interface.get_ip().string_ip == ip_address.string_ip
                    for interface in self.all_interfaces)
 
-    def get_sending_interface_by_routing_table(self, dst_ip: IPAddress) -> NetworkInterface:
+    def get_sending_interface_by_routing_table(self, dst_ip: IPAddress, flow_hash: Optional[int] = None) -> NetworkInterface:
         """
         Receives an `IPAddress` one wishes to send a packet to
         Returns the `CableNetworkInterface` that the packet should be sent from (as the routing table specifies)
+        :param flow_hash: the hash of the flow of a forwarded packet, picks one of the equal-cost routes (see `RoutingTable.route`)
         """
         try:
-            interface_ip = self.routing_table[dst_ip].interface_ip
+            interface_ip = self.routing_table.route(dst_ip, flow_hash).interface_ip
         except RoutingTableCouldNotRouteToIPAddress:
             debugp(f"Routing table could not resolve IP! {dst_ip!r}... Using shitty default interface method...")
             return get_the_one_with_raise(self.interfaces, lambda i: i.has_ip(), NoSuchInterfaceError)
@@ -708,6 +761,9 @@ class Computer:
         if packet_metadata.interface.has_this_ip(packet["IP"].dst_ip) or (
                 packet_metadata.interface is self.loopback and self.has_this_ip(packet["IP"].dst_ip)):
             # ^ only if the packet is for me also on the third layer!
+            if not self.icmp_rate_limiter.allow(OPCODES.ICMP.TYPES.REPLY):
+                return
+
             dst_ip = packet["IP"].src_ip.string_ip
             self.start_ping_process(
                 dst_ip,
@@ -748,6 +804,8 @@ class Computer:
             return
 
         if packet["UDP"].dst_port not in self.get_open_ports("UDP"):
+            if not self.icmp_rate_limiter.allow(OPCODES.ICMP.TYPES.UNREACHABLE):
+                return
             self.send_to(packet["Ether"].src_mac, packet["IP"].src_ip, ICMP(
                 type=OPCODES.ICMP.TYPES.UNREACHABLE,
                 code=OPCODES.ICMP.CODES.PORT_UNREACHABLE))
@@ -791,6 +849,9 @@ class Computer:
         """
         Send an ICMP TTL exceeded for a fragmented packet that could be reassembled
         """
+        if not self.icmp_rate_limiter.allow(OPCODES.ICMP.TYPES.TIME_EXCEEDED):
+            return
+
         self.send_packet_stream_to(
             COMPUTER.PROCESSES.INIT_PID, COMPUTER.PROCESSES.MODES.KERNELMODE,
             PROTOCOLS.IP.FRAGMENT_SENDING_INTERVAL,
@@ -885,13 +946,41 @@ class Computer:
             >>> ip_address = yield from self.resolve_domain_name(...)
 
         If the name is a valid IPAddress - just cast it and return :)
+
+        If the name is already being resolved (by another process), wait for that query instead of sending another one.
         """
         if IPAddress.is_valid(name):
             return IPAddress(name)
 
         validate_domain_hostname(name)
-        yield from DNSClientProcess(requesting_process.pid, self, (dns_server if dns_server is not None else self.dns_server), name).code()
-        return self.dns_cache[self.add_default_domain_prefix_if_necessary(name)].ip_address
+        full_name = self.add_default_domain_prefix_if_necessary(name)
+
+        pending_query = self.dns_cache.pending_queries.get(full_name)
+        if full_name not in self.dns_cache and pending_query is not None:
+            running_query: PendingDNSQuery = pending_query
+            yield WaitingFor(lambda: running_query.is_done, timeout=Timeout(running_query.deadline - MainLoop.get_time()))
+            if full_name not in self.dns_cache:
+                requesting_process.die(f"ERROR: could not resolve '{full_name}' :(",
+                                       raises=(running_query.error or ProcessInternalError_NoResponseForDNSQuery))
+            return self.dns_cache[full_name].ip_address
+
+        dns_client_process = DNSClientProcess(requesting_process.pid,
+                                              self,
+                                              (dns_server if dns_server is not None else self.dns_servers),
+                                              name,
+                                              policy=self.dns_resolver_policy)
+        pending_query = self.dns_cache.pending_queries[full_name] = \
+            PendingDNSQuery(MainLoop.get_time() + dns_client_process.longest_resolution_time)
+        try:
+            yield from dns_client_process.code()
+        except ProcessInternalError as error:
+            pending_query.error = type(error)
+            raise
+        finally:
+            pending_query.is_done = True
+            if self.dns_cache.pending_queries.get(full_name) is pending_query:
+                del self.dns_cache.pending_queries[full_name]
+        return self.dns_cache[full_name].ip_address
 
     def add_dns_entry(self, user_inserted_dns_entry_format: str) -> None:
         """
@@ -932,11 +1021,13 @@ class Computer:
 
         :param packet: a valid `Packet` object.
         :param interface: the `CableNetworkInterface` to send the packet on. If None - calculate by routing table
+            (forwarded packets are routed by their flow, just like when the next hop was picked for them)
         :param sending_socket: the `RawSocket` object that sent the packet (if was sent using a raw socket
             it should not be sniffed on that same one as outgoing)
         """
         if interface is None:
-            interface = self.get_sending_interface_by_routing_table(packet["IP"].dst_ip)
+            is_forwarded = not self.has_this_ip(packet["IP"].src_ip)
+            interface = self.get_sending_interface_by_routing_table(packet["IP"].dst_ip, flow_hash(packet) if is_forwarded else None)
 
         if not packet.is_valid():
             return
@@ -1179,6 +1270,65 @@ class Computer:
         yield from ARPProcess(requesting_process.pid, self, ip_for_the_mac.string_ip).code()
         return ip_for_the_mac, self.arp_cache[ip_for_the_mac].mac
 
+    def send_when_next_hop_is_resolved(self, next_hop: IPAddress, ip_layer: scapy.packet.Packet) -> None:
+        """
+        Sends the IP layer to the next hop once its MAC address is resolved.
+        The packet waits in the ARP pending table - only the first packet that waits for an address starts an ARP process for it,
+        the rest just join the queue (or are dropped if it is full).
+        :param next_hop: the IP address of the next hop (the gateway from the routing table, or the destination itself)
+        :param ip_layer: the IP layer to send - it is sent as is (the TTL is not decreased)
+        """
+        if not self.arp_pending_table.enqueue(next_hop, ip_layer):
+            debugp(f"ARP pending queue of {next_hop} is full! dropping packet...")
+
+        resolving_pid = self.arp_pending_table[next_hop].pid
+        if resolving_pid is not None and self.process_scheduler.is_process_running(resolving_pid, COMPUTER.PROCESSES.MODES.KERNELMODE):
+            return
+
+        resolving_pid = self.process_scheduler.start_kernelmode_process(ResolveNextHopProcess, IPAddress.copy(next_hop))
+        if next_hop in self.arp_pending_table:  # the process may have already flushed the packets if the address is known
+            self.arp_pending_table[next_hop].pid = resolving_pid
+
+    def flush_arp_pending_packets(self, next_hop: IPAddress) -> None:
+        """
+        Sends all of the packets that waited for the MAC address of the next hop (which is now in the ARP cache)
+        """
+        ip_layers = self.arp_pending_table.pop(next_hop)
+        if not ip_layers:
+            return
+
+        interface = self.get_sending_interface_by_routing_table(next_hop)
+        dst_mac = self.arp_cache[next_hop].mac
+        self.send_packet_stream(
+            COMPUTER.PROCESSES.INIT_PID,
+            COMPUTER.PROCESSES.MODES.KERNELMODE,
+            [interface.ethernet_wrap(dst_mac, ip_layer) for ip_layer in ip_layers],
+            COMPUTER.ROUTING.SENDING_INTERVAL,
+        )
+
+    def drop_arp_pending_packets(self, next_hop: IPAddress) -> None:
+        """
+        Drops all of the packets that waited for the MAC address of the next hop (it did not answer)
+        The senders of the packets are notified with an ICMP host unreachable.
+        Senders whose own next hop is not in the ARP cache are not notified (we do not start resolving for an error message)
+        """
+        for ip_layer in self.arp_pending_table.pop(next_hop):
+            sender_ip, dst_ip = ip_layer.src_ip, ip_layer.dst_ip
+            if self.has_this_ip(sender_ip) or (sender_ip not in self.routing_table):
+                continue
+
+            sender_next_hop = self.routing_table[sender_ip].gateway_ip
+            if sender_next_hop not in self.arp_cache or not self.icmp_rate_limiter.allow(OPCODES.ICMP.TYPES.UNREACHABLE):
+                continue
+
+            self.send_ping_to(
+                self.arp_cache[sender_next_hop].mac,
+                sender_ip,
+                OPCODES.ICMP.TYPES.UNREACHABLE,
+                f"Unreachable: {dst_ip}",
+                code=OPCODES.ICMP.CODES.HOST_UNREACHABLE,
+            )
+
     def send_packet_stream(self,
                            pid: int,
                            mode: str,
@@ -1189,14 +1339,13 @@ class Computer:
         """
         Send a large amount of packets that should be sent in quick succession one after the other
         This will make sure they are sent with the appropriate time gaps - in order to allow the user to see them
+        In burst mode (`COMPUTER.PACKET_SENDING_QUEUES.IS_BURST_MODE`) there are no time gaps and the packets are sent right away
         """
-        existing_sending_queue = self.get_packet_sending_queue(pid, mode)
-        if existing_sending_queue is not None:
-            existing_sending_queue.packets.extend(packets)
-            return
-
-        self._packet_sending_queues.append(
-            PacketSendingQueue(
+        packet_sending_queue = self.get_packet_sending_queue(pid, mode)
+        if packet_sending_queue is not None:
+            packet_sending_queue.packets.extend(packets)
+        else:
+            packet_sending_queue = PacketSendingQueue(
                 self,
                 pid,
                 mode,
@@ -1205,30 +1354,61 @@ class Computer:
                 interface,
                 sending_socket,
             )
+            self._packet_sending_queues[packet_sending_queue.key] = packet_sending_queue
+
+        if COMPUTER.PACKET_SENDING_QUEUES.IS_BURST_MODE:
+            packet_sending_queue.send_all_packets()
+            return
+
+        self._schedule_packet_sending_queue(packet_sending_queue)
+
+    def _schedule_packet_sending_queue(self, packet_sending_queue: PacketSendingQueue) -> None:
+        """
+        Insert the queue to the sending schedule - so it will be handled once it is allowed to send its next packet.
+        Queues that have nothing to send (or are already scheduled) are not inserted.
+        """
+        if packet_sending_queue.is_scheduled or not packet_sending_queue.packets:
+            return
+
+        heappush(
+            self._packet_sending_schedule,
+            (packet_sending_queue.next_sending_time, next(self._packet_sending_schedule_counter), packet_sending_queue),
         )
+        packet_sending_queue.is_scheduled = True
 
     def _handle_packet_streams(self) -> None:
         """
-        Allows all of the PacketSendingQueue-s to perform their actions (send their packets with time gaps)
-        Deletes the queues that are done sending.
+        Allows the PacketSendingQueue-s that are due to perform their actions (send their packets with time gaps)
+        Queues that still have packets to send are scheduled again. The rest are not handled until they receive new packets.
         """
-        for packet_sending_queue in self._packet_sending_queues[:]:
+        now = MainLoop.get_time()
+        due_packet_sending_queues = []
+        while self._packet_sending_schedule and self._packet_sending_schedule[0][0] < now:
+            _, _, packet_sending_queue = heappop(self._packet_sending_schedule)
+            packet_sending_queue.is_scheduled = False
+            due_packet_sending_queues.append(packet_sending_queue)
+
+        for packet_sending_queue in due_packet_sending_queues:
+            if self._packet_sending_queues.get(packet_sending_queue.key) is not packet_sending_queue:
+                continue  # the queue was removed since it was scheduled
+
             packet_sending_queue.send_packets_with_time_gaps()
+            self._schedule_packet_sending_queue(packet_sending_queue)
 
     def _cleanup_unused_packet_sending_queues(self) -> None:
         """
         Remove PacketSendingQueues that have no running process attached to them
         """
-        for packet_sending_queue in self._packet_sending_queues[:]:
+        for key, packet_sending_queue in list(self._packet_sending_queues.items()):
             if not self.process_scheduler.is_process_running(packet_sending_queue.pid, packet_sending_queue.process_mode) and \
                packet_sending_queue.pid != COMPUTER.PROCESSES.INIT_PID:
-                self._packet_sending_queues.remove(packet_sending_queue)
+                del self._packet_sending_queues[key]
 
     def get_packet_sending_queue(self, pid: int, mode: str) -> Optional[PacketSendingQueue]:
         """
         Get the PacketSendingQueue object of the process with the given ID
         """
-        return get_the_one(self._packet_sending_queues, lambda psq: (psq.pid == pid and psq.process_mode == mode))
+        return self._packet_sending_queues.get((pid, mode))
 
     # ------------------------------- v  Sockets  v ----------------------------------------------------------------------
 
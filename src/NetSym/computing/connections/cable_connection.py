@@ -2,16 +2,19 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, List, Optional, Sequence
+from heapq import heappush, heappop
+from itertools import count
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
 
 from NetSym.computing.connections.connection import Connection, SentPacket, ConnectionSide
-from NetSym.consts import CONNECTIONS, PACKET
+from NetSym.consts import CONNECTIONS, PACKET, T_Time
 from NetSym.exceptions import *
 from NetSym.gui.main_loop import MainLoop
 from NetSym.gui.tech.cable_connection_graphics import CableConnectionGraphics
 from NetSym.packets.cable_packet import CablePacket
 
 if TYPE_CHECKING:
+    from NetSym.gui.abstracts.animation_graphics import AnimationGraphics
     from NetSym.gui.abstracts.graphics_object import GraphicsObject
     from NetSym.gui.tech.computer_graphics import ComputerGraphics
 
@@ -20,9 +23,54 @@ if TYPE_CHECKING:
 class CableSentPacket(SentPacket):
     """
     a packet that is currently being sent through the connection.
+
+    The progress of the packet is not updated on every tick - it is computed from the time.
+    Since the last change of the speed of the packet (the 'anchor') it moves in a constant pace.
+        `transit_time` is the time it takes to pass the whole connection in the default packet speed (decided when it is sent)
+        `event_progress` is the point in the connection where the packet is dropped or delayed (if it is going to be)
     """
-    packet: CablePacket
-    direction: str = PACKET.DIRECTION.RIGHT
+    packet:          CablePacket
+    direction:       str    = PACKET.DIRECTION.RIGHT
+    transit_time:    T_Time = 1.
+    speed:           float  = CONNECTIONS.PACKETS.DEFAULT_SPEED
+    event_progress:  float  = 1.
+    anchor_time:     T_Time = 0.
+    anchor_progress: float  = 0.
+    is_in_flight:    bool   = True
+
+    def __post_init__(self) -> None:
+        self.anchor_time = self.sending_time
+
+    def progress_at(self, time: T_Time) -> float:
+        """The progress of the packet in the connection in a given time (a number from 0 to 1)"""
+        return self.anchor_progress + ((time - self.anchor_time) / self.transit_time) * self.speed
+
+    @property
+    def progress(self) -> float:
+        return self.progress_at(MainLoop.get_time())
+
+    def time_of_progress(self, progress: float) -> T_Time:
+        """The time in which the packet will reach a given progress in the connection (if its speed does not change)"""
+        return self.anchor_time + ((progress - self.anchor_progress) * self.transit_time) / self.speed
+
+    @property
+    def next_event_time(self) -> T_Time:
+        """The time of the next thing that will happen to the packet - being dropped, delayed or arriving"""
+        next_event_progress = self.event_progress if (self.will_be_dropped or self.will_be_delayed) else 1.
+        return self.time_of_progress(max(next_event_progress, self.anchor_progress))
+
+    @property
+    def arrival_time(self) -> T_Time:
+        return self.time_of_progress(1.)
+
+    def set_speed(self, speed: float) -> None:
+        """
+        Change the speed of the packet from now on. The progress it already made stays the same.
+        """
+        now = MainLoop.get_time()
+        self.anchor_progress = self.progress_at(now)
+        self.anchor_time = now
+        self.speed = speed
 
 
 class CableConnection(Connection):
@@ -44,19 +92,26 @@ class CableConnection(Connection):
                  speed: float = CONNECTIONS.DEFAULT_SPEED,
                  packet_loss: float = 0,
                  latency: float = 0,
+                 bandwidth: float = CONNECTIONS.DEFAULT_BANDWIDTH,
                  ) -> None:
         """
         Initiates a CableConnection object.
 
         `self.sent_packets` is the list of packets that are currently being sent through the connection.
+        `self._packet_events` is a heap of these packets ordered by the time of the next thing that should happen to them
+            (being dropped, delayed or arriving). Only the packets at the head of the heap are handled in each tick.
 
         :param length: The length of the cable connection (in pixels)
         :param speed: The speed of the connection (in pixels per second)
+        :param bandwidth: The bandwidth of the connection (in bits per second)
         """
         self.speed = speed
+        self.bandwidth = bandwidth
         self.initial_length = length
         self.sent_packets: List[CableSentPacket] = []
         # ^ represents the packets that are currently being sent through the connection
+        self._packet_events: List[Tuple[T_Time, int, CableSentPacket]] = []
+        self._packet_event_counter = count()  # breaks ties between packets with events in the same time
 
         self.right_side, self.left_side = CableConnectionSide(self), CableConnectionSide(self)
 
@@ -128,34 +183,43 @@ class CableConnection(Connection):
         """
         Add a packet that was sent on one of the `CableConnectionSide`-s to the `self.sent_packets` list.
         This method starts the motion of the packet through the connection.
+        The time of everything that will happen to the packet in the connection is computed here.
 
         :direction: the direction the packet is going to (PACKET.DIRECTION.RIGHT or PACKET.DIRECTION.LEFT)
         """
-        self.sent_packets.append(
-            CableSentPacket(
-                packet         =packet,
-                sending_time   =MainLoop.get_time(),
-                will_be_dropped=(random.random() < self.packet_loss),
-                will_be_delayed=(random.random() < self.latency),
-                direction      =direction,
-            )
+        sent_packet = CableSentPacket(
+            packet         =packet,
+            sending_time   =MainLoop.get_time(),
+            will_be_dropped=(random.random() < self.packet_loss),
+            will_be_delayed=(random.random() < self.latency),
+            direction      =direction,
+            transit_time   =self.deliver_time,
+            speed          =packet.get_graphics().speed,
+            event_progress =random.uniform(*CONNECTIONS.PACKETS.EVENT_PROGRESS_RANGE),
         )
+        packet.get_graphics().sent_packet = sent_packet
+        self.sent_packets.append(sent_packet)
+        self._schedule_packet_event(sent_packet)
+
+    def _schedule_packet_event(self, sent_packet: CableSentPacket) -> None:
+        """
+        Insert the packet to the heap of packet events - by the time of the next thing that should happen to it
+        """
+        heappush(self._packet_events, (sent_packet.next_event_time, next(self._packet_event_counter), sent_packet))
 
     def _remove_packet(self, sent_packet: SentPacket) -> None:
         if not isinstance(sent_packet, CableSentPacket):
             return  # It is not in the `sent_packets` list...
 
+        sent_packet.is_in_flight = False
         self.sent_packets.remove(sent_packet)
 
     def _receive_on_sides_if_reached_destination(self, sent_packet: CableSentPacket) -> None:
         """
         Adds the packet to its appropriate destination side's `received_packets` list.
-        This is called to check when the packet finished its route through this connection and is ready to be received at the
+        This is called when the packet finished its route through this connection and is ready to be received at the
         connected `CableNetworkInterface`.
         """
-        if sent_packet.packet.get_graphics().progress < 1:
-            return  # did not reach...
-
         sent_packet.packet.get_graphics().unregister()
 
         if sent_packet.direction == PACKET.DIRECTION.RIGHT:
@@ -165,7 +229,7 @@ class CableConnection(Connection):
         else:
             raise WrongUsageError('The packet can only go left or right!')
 
-        self.sent_packets.remove(sent_packet)
+        self._remove_packet(sent_packet)
 
     def _send_packets_from_side(self, side: ConnectionSide) -> List[GraphicsObject]:
         """
@@ -183,49 +247,64 @@ class CableConnection(Connection):
                 if not isinstance(packet, CablePacket):
                     continue
 
-                self._add_packet(packet, direction)
                 new_graphics_to_register.extend(packet.init_graphics(self.get_graphics(), direction))
+                self._add_packet(packet, direction)
         return new_graphics_to_register
 
-    def _update_packet(self, sent_packet: CableSentPacket) -> None:
+    def _handle_packet_event(self, sent_packet: CableSentPacket) -> List[AnimationGraphics]:
         """
-        Receives a CableSentPacket object and updates its progress on the connection.
-        If the packet has reached the end of the connection, make it be received at the appropriate CableConnectionSide
-        :param sent_packet: a `CableSentPacket`
-        :return: None
+        Performs the next thing that should happen to a packet whose time has come.
+        Drops it, delays it (and schedules its arrival) or receives it on the other side of the connection.
+        :return: the animations that should be registered
         """
-        sent_packet.packet.get_graphics().progress += \
-            (MainLoop.get_time_since(sent_packet.last_update_time) / self.deliver_time) * sent_packet.packet.get_graphics().speed
-        sent_packet.last_update_time = MainLoop.get_time()
+        packet_graphics = sent_packet.packet.get_graphics()
 
-    def _is_lucky_packet(self, sent_packet: SentPacket) -> bool:
+        if sent_packet.will_be_dropped:
+            self.stop_packet(sent_packet)
+            return [packet_graphics.get_drop_animation()]
+
+        if sent_packet.will_be_delayed:
+            sent_packet.will_be_delayed = False
+            packet_graphics.decrease_speed()
+            self._schedule_packet_event(sent_packet)
+            return [packet_graphics.get_decrease_speed_animation()]
+
+        self._receive_on_sides_if_reached_destination(sent_packet)
+        return []
+
+    def _handle_due_packet_events(self) -> List[AnimationGraphics]:
         """
-        Checks whether a certain event should happen to a packet
-        The chances go up as the packet moves further and further down the connection
+        Handles all of the packets whose next event is due.
+        Packets that were slowed down since they were scheduled are scheduled again by their new time.
+        :return: the animations that should be registered
         """
-        if not isinstance(sent_packet, CableSentPacket):
-            raise WrongUsageError(f"Do not call this function with a `sent_packet` which is not a `CableSentPacket`. "
-                                  f"You inserted: {sent_packet} which is a {type(sent_packet)}")
+        now = MainLoop.get_time()
+        animations_to_register = []
+        while self._packet_events and self._packet_events[0][0] <= now:
+            _, _, sent_packet = heappop(self._packet_events)
+            if not sent_packet.is_in_flight:
+                continue  # the packet was removed since it was scheduled
+
+            if sent_packet.next_event_time > now:
+                self._schedule_packet_event(sent_packet)
+                continue
 
-        return bool(sent_packet.packet.get_graphics().progress >= (random.random() + 0.3))
+            animations_to_register.extend(self._handle_packet_event(sent_packet))
+        return animations_to_register
 
     def move_packets(self, main_loop: MainLoop) -> None:
         """
         This method is inserted into the main loop of the simulation when this `Connection` object is initialized.
         The packets in the connection should always be moving. (unless paused)
-        This method sends new packets from the `CableConnectionSide` object, updates the time they have been in the cable, and
-            removes them if they reached the end.
+        This method sends new packets from the `CableConnectionSide` object, and handles the packets that something should
+            happen to (by their precomputed time) - drops, delays and arrivals.
+        The packets that are in the middle of the connection cost nothing - their graphics compute their location when drawn.
         """
         for side in self.get_sides():
             new_packet_graphics_objects = self._send_packets_from_side(side)
             main_loop.register_graphics_object(new_packet_graphics_objects)
 
-        for sent_packet in self.sent_packets[:]:  # we copy the list because we alter it during the run
-            self._update_packet(sent_packet)
-            self._receive_on_sides_if_reached_destination(sent_packet)
-
-        main_loop.register_graphics_object(self._drop_predetermined_dropped_packets())
-        main_loop.register_graphics_object(self._delay_predetermined_delayed_packets())
+        main_loop.register_graphics_object(self._handle_due_packet_events())
 
     def __repr__(self) -> str:
         """The ip_layer representation of the connection"""
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, List, Sequence
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Sequence, Deque
 
-from NetSym.consts import T_Time
+from NetSym.consts import T_Time, CONNECTIONS
 from NetSym.exceptions import *
-from NetSym.gui.abstracts.animation_graphics import AnimationGraphics
 from NetSym.gui.main_loop import MainLoop
 
 if TYPE_CHECKING:
@@ -23,8 +23,6 @@ class SentPacket:
     will_be_dropped:  bool   = False
     will_be_delayed:  bool   = False
 
-    last_update_time: T_Time = field(default_factory=MainLoop.get_time)
-
 
 class Connection(ABC):
     """
@@ -39,8 +37,12 @@ class Connection(ABC):
 
     The `Connection` object keeps references to its two `CableConnectionSide` objects. These are nice interfaces for
         the `CableNetworkInterface` object to talk to its connection.
+
+    The `bandwidth` of the connection (in bits per second) decides how long it takes to put a packet on the connection
+        (the serialization delay). Packets that wait for their turn are queued in the transmit queue of their side.
     """
     speed:        float
+    bandwidth:    float
     packet_loss:  float
     latency:      float
     sent_packets: Sequence[SentPacket]
@@ -55,6 +57,16 @@ class Connection(ABC):
             raise ConnectionsError("A connection cannot have negative speed!")
         self.speed = new_speed
 
+    def set_bandwidth(self, new_bandwidth: float) -> None:
+        """Sets the bandwidth of the connection (in bits per second)"""
+        if new_bandwidth <= 0:
+            raise ConnectionsError("A connection cannot have a non-positive bandwidth!")
+        self.bandwidth = new_bandwidth
+
+    def serialization_delay(self, packet: Packet) -> T_Time:
+        """The time in seconds it takes to put the packet on the connection (by the length of the packet and the bandwidth)"""
+        return (len(packet.data) * 8) / self.bandwidth
+
     def set_pl(self, new_pl: float) -> None:
         """Sets the PL amount of this connection"""
         if not (0 <= new_pl <= 1):
@@ -71,46 +83,12 @@ class Connection(ABC):
 
         self.latency = new_latency
 
-    @abstractmethod
-    def _is_lucky_packet(self, sent_packet: SentPacket) -> bool:
-        """
-        Checks whether a certain event should happen to a packet
-        The chances go up as the packet moves further and further down the connection
-        """
-
     @abstractmethod
     def _remove_packet(self, sent_packet: SentPacket) -> None:
         """
         Remove a packet from the `sent_packets` list
         """
 
-    def _drop_predetermined_dropped_packets(self) -> List[AnimationGraphics]:
-        """
-        Goes through the packets that are being sent, When they reach the middle of the connection, check if they need
-        to be dropped (by PL) if so, remove them from the list, and do the animation.
-        """
-        animations_to_register = []
-        for sent_packet in self.sent_packets[:]:
-            if sent_packet.will_be_dropped and self._is_lucky_packet(sent_packet):
-                self._remove_packet(sent_packet)
-                sent_packet.packet.get_graphics().unregister()
-                animations_to_register.append(sent_packet.packet.get_graphics().get_drop_animation())
-        return animations_to_register
-
-    def _delay_predetermined_delayed_packets(self) -> List[AnimationGraphics]:
-        """
-        Goes through the packets that are being sent, When they reach the middle of the connection, check if they need
-        to be dropped (by PL) if so, remove them from the list, and do the animation.
-        :return: None
-        """
-        animations_to_register = []
-        for sent_packet in self.sent_packets:
-            if sent_packet.will_be_delayed and self._is_lucky_packet(sent_packet):
-                sent_packet.will_be_delayed = False
-                sent_packet.packet.get_graphics().decrease_speed()
-                animations_to_register.append(sent_packet.packet.get_graphics().get_decrease_speed_animation())
-        return animations_to_register
-
     @abstractmethod
     def move_packets(self, main_loop: MainLoop) -> None:
         """
@@ -120,14 +98,20 @@ class Connection(ABC):
             removes them if they reached the end.
         """
 
+    def stop_packet(self, sent_packet: SentPacket) -> None:
+        """
+        Kills a single packet in the connection (it will never arrive) and unregisters its `GraphicsObject`
+        """
+        sent_packet.packet.get_graphics().unregister()
+        self._remove_packet(sent_packet)
+
     def stop_packets(self) -> None:
         """
         This is used to stop all of the action in the connection.
         Kills all of the packets in the connection and unregisters their `GraphicsObject`-s
         """
         for sent_packet in self.sent_packets[:]:
-            sent_packet.packet.get_graphics().unregister()
-            self._remove_packet(sent_packet)
+            self.stop_packet(sent_packet)
 
 
 class ConnectionSide(ABC):
@@ -136,15 +120,34 @@ class ConnectionSide(ABC):
     This is the API that the `CableNetworkInterface` object sees.
     Each Connection object holds two of these, one for each of its sides (Duh).
 
-    The `ConnectionSide` has a list of packets the user sent, but were not yet picked up by the main `Connection`.
+    The `ConnectionSide` has a transmit queue of packets the user sent, but were not yet picked up by the main `Connection`.
+    Each packet in the queue is picked up only after it is serialized (by the bandwidth of the connection) and the
+        packets before it are. The queue has a finite length - packets that are sent when it is full are dropped.
     It also has a list of packets that reached this side but were not yet picked up by the appropriate connected
         `NetworkInterface` object.
     """
     def __init__(self, main_connection: Connection) -> None:
-        self._packets_to_send: List[Packet] = []
+        self._packets_to_send: Deque[Packet] = deque()
+        self._transmission_end_times: Deque[T_Time] = deque()
+        # ^ the time each of the packets in `self._packets_to_send` finishes being serialized onto the connection
         self._packets_to_receive: List[Packet] = []
         self.connection: Connection = main_connection
 
+        self.transmit_queue_length = CONNECTIONS.DEFAULT_TRANSMIT_QUEUE_LENGTH
+        self.transmitted_packets_count = 0
+        self.dropped_packets_count = 0
+
+    @property
+    def transmit_queue_occupancy(self) -> int:
+        """The amount of packets that are waiting in the transmit queue of this side"""
+        return len(self._packets_to_send)
+
+    def set_transmit_queue_length(self, new_length: int) -> None:
+        """Sets the maximum amount of packets that can wait in the transmit queue of this side"""
+        if new_length <= 0:
+            raise ConnectionsError(f"A transmit queue cannot have this length!!! {new_length}")
+        self.transmit_queue_length = new_length
+
     def get_packet_from_connection(self, sent_packet: SentPacket) -> None:
         """
         This will be called by the connection when a new packet arrives at this side of it
@@ -154,10 +157,20 @@ class ConnectionSide(ABC):
     def send(self, packet: Packet) -> None:
         """
         This is an API for the CableNetworkInterface class to send its packets to the Connection object.
+        The packet is put at the end of the transmit queue. If the queue is full - the packet is dropped (tail-drop).
         :param packet: The packet to send. An `Ethernet` object.
         :return: None
         """
+        if len(self._packets_to_send) >= self.transmit_queue_length:
+            self.dropped_packets_count += 1
+            return
+
+        transmission_start_time = MainLoop.get_time()
+        if self._transmission_end_times:
+            transmission_start_time = max(transmission_start_time, self._transmission_end_times[-1])
+
         self._packets_to_send.append(packet)
+        self._transmission_end_times.append(transmission_start_time + self.connection.serialization_delay(packet))
 
     def receive(self) -> List[Packet]:
         """
@@ -170,13 +183,18 @@ class ConnectionSide(ABC):
         return returned
 
     def is_sending(self) -> bool:
-        """Returns whether or not this side has packets that needs to be sent"""
-        return bool(self._packets_to_send)
+        """Returns whether or not this side has packets that finished their serialization and should be sent"""
+        return bool(self._transmission_end_times) and self._transmission_end_times[0] <= MainLoop.get_time()
 
     def pop_packets_to_send(self) -> Sequence[Packet]:
         """
-        Get all packets that should be sent and clear the sending queue
+        Get all packets that finished their serialization and remove them from the transmit queue
         """
-        returned = self._packets_to_send[:]
-        self._packets_to_send.clear()
+        now = MainLoop.get_time()
+        returned = []
+        while self._transmission_end_times and self._transmission_end_times[0] <= now:
+            self._transmission_end_times.popleft()
+            returned.append(self._packets_to_send.popleft())
+
+        self.transmitted_packets_count += len(returned)
         return returned
@@ -50,12 +50,9 @@ class LoopbackConnection(CableConnection):
         performs the super-method of `reach_destination` but also checks if the connection should disappear.
         All of the packets are received on the left side, all of them will also be sent on it.
         """
-        if sent_packet.packet.get_graphics().progress < 1:
-            return  # did not reach...
-
         sent_packet.packet.get_graphics().unregister()
         self.left_side.get_packet_from_connection(sent_packet)  # the direction does not matter
-        self.sent_packets.remove(sent_packet)
+        self._remove_packet(sent_packet)
 
         if not self.sent_packets:
             self.get_graphics().hide()
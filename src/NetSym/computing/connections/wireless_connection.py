@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, List, Sequence
+from heapq import heappush, heappop, heapify
+from itertools import count
+from typing import TYPE_CHECKING, List, Sequence, Tuple
 
 from NetSym.computing.connections.connection import SentPacket, Connection, ConnectionSide
-from NetSym.consts import CONNECTIONS, T_Color, WINDOWS
+from NetSym.consts import CONNECTIONS, T_Color, WINDOWS, T_Time
 from NetSym.exceptions import NoSuchConnectionSideError, WrongUsageError
 from NetSym.gui.main_loop import MainLoop
 from NetSym.packets.cable_packet import CablePacket
@@ -14,14 +16,52 @@ from NetSym.packets.wireless_packet import WirelessPacket
 from NetSym.usefuls.funcs import distance
 
 if TYPE_CHECKING:
+    from NetSym.gui.abstracts.animation_graphics import AnimationGraphics
     from NetSym.gui.abstracts.graphics_object import GraphicsObject
     from NetSym.computing.internals.network_interfaces.wireless_network_interface import WirelessNetworkInterface
 
 
 @dataclass
 class WirelessSentPacket(SentPacket):
-    packet: WirelessPacket
-    id: int = 0
+    """
+    a packet that is currently being transmitted on the frequency.
+
+    Its distance from the sending antenna is computed from the time - it is not updated on every tick.
+    Since the last change of the speed of the packet (the 'anchor') it moves in a constant pace.
+        `event_distance` is the distance in which the packet is dropped or delayed (if it is going to be)
+    """
+    packet:          WirelessPacket
+    id:              int    = 0
+    speed:           float  = CONNECTIONS.WIRELESS.DEFAULT_SPEED
+    event_distance:  float  = 0.
+    is_in_flight:    bool   = True
+    anchor_time:     T_Time = 0.
+    anchor_distance: float  = 0.
+
+    def __post_init__(self) -> None:
+        self.anchor_time = self.sending_time
+
+    def distance_at(self, time: T_Time) -> float:
+        """The distance of the packet from the antenna that sent it in a given time"""
+        return self.anchor_distance + (time - self.anchor_time) * self.speed
+
+    @property
+    def distance(self) -> float:
+        """The distance of the packet from the antenna that sent it"""
+        return self.distance_at(MainLoop.get_time())
+
+    def time_of_distance(self, distance_: float) -> T_Time:
+        """The time in which the packet will reach a given distance from the antenna that sent it (if its speed does not change)"""
+        return self.anchor_time + ((distance_ - self.anchor_distance) / self.speed)
+
+    def set_speed(self, speed: float) -> None:
+        """
+        Change the speed of the packet from now on. The distance it already passed stays the same.
+        """
+        now = MainLoop.get_time()
+        self.anchor_distance = self.distance_at(now)
+        self.anchor_time = now
+        self.speed = speed
 
 
 class WirelessConnection(Connection):
@@ -31,6 +71,10 @@ class WirelessConnection(Connection):
     Each antenna can be connected to one frequency, And an antenna can see only packets transmitted on the frequency it is on.
 
     The packets transmitted on each frequency have different colors.
+
+    When a packet is transmitted, the time it reaches each of the other antennas on the frequency is computed (by their
+        distance from the sending antenna). These deliveries are kept in a heap ordered by time, so in each tick only
+        the deliveries that are due are handled - instead of checking every packet against every antenna.
     """
     sent_packets: List[WirelessSentPacket]
 
@@ -38,8 +82,10 @@ class WirelessConnection(Connection):
                  frequency: float,
                  longest_line_on_the_screen: float,
                  speed: float = CONNECTIONS.WIRELESS.DEFAULT_SPEED,
-                 packet_loss: float = 0, latency: float = 0) -> None:
+                 packet_loss: float = 0, latency: float = 0,
+                 bandwidth: float = CONNECTIONS.DEFAULT_BANDWIDTH) -> None:
         self.speed = speed
+        self.bandwidth = bandwidth
         self.sent_packets = []
         self.connection_sides: List[WirelessConnectionSide] = []
 
@@ -53,6 +99,10 @@ class WirelessConnection(Connection):
 
         self.sent_packet_id = 0
 
+        self._deliveries: List[Tuple[T_Time, int, WirelessSentPacket, WirelessConnectionSide, float]] = []
+        self._packet_events: List[Tuple[T_Time, int, WirelessSentPacket]] = []
+        self._delivery_counter = count()  # breaks ties between deliveries and events in the same time
+
         self.color: T_Color = (random.randint(0, 150), random.randint(0, 150), random.randint(0, 150))
 
     def get_side(self, wireless_interface: WirelessNetworkInterface) -> WirelessConnectionSide:
@@ -74,63 +124,86 @@ class WirelessConnection(Connection):
         """Returns the two sides of the connection as a tuple (they are `CableConnectionSide` objects)"""
         return self.connection_sides
 
-    def _add_packet(self, packet: Packet, sending_side: WirelessConnectionSide) -> WirelessPacket:
+    def _add_packet(self, packet: Packet, sending_side: WirelessConnectionSide) -> WirelessSentPacket:
         """
         Add a packet that was sent on one of the `WirelessConnectionSide`-s to the `self.sent_packets` list.
-        This method starts the motion of the packet through the connection.
+        This method starts the motion of the packet through the connection, and schedules its arrival at the other sides.
         :param packet: a `Packet` object
         :param sending_side: the connection side the packet was sent from
         """
-        wireless_packet = WirelessPacket(packet.data)
-        self.sent_packets.append(
-            WirelessSentPacket(
-                packet=wireless_packet,
-                sending_time=MainLoop.get_time(),
-                id=self.sent_packet_id,
-            )
+        sent_packet = WirelessSentPacket(
+            packet=WirelessPacket(packet.data),
+            sending_time=MainLoop.get_time(),
+            will_be_dropped=(random.random() < self.packet_loss),
+            will_be_delayed=(random.random() < self.latency),
+            id=self.sent_packet_id,
+            speed=self.speed,
+            event_distance=random.uniform(*CONNECTIONS.PACKETS.EVENT_PROGRESS_RANGE) * (WINDOWS.MAIN.WIDTH / 2),
         )
-        sending_side.recognize_sent_packet(self.sent_packet_id)
+        self.sent_packets.append(sent_packet)
+        self._schedule_deliveries(sent_packet, sending_side)
+        self._schedule_packet_event(sent_packet)
         self.sent_packet_id += 1
-        return wireless_packet
+        return sent_packet
 
-    def _remove_packet(self, sent_packet: SentPacket) -> None:
-        if not isinstance(sent_packet, WirelessSentPacket):
-            return  # It is not in the `sent_packets` list...
-
-        self.sent_packets.remove(sent_packet)
-
-    def _receive_on_sides_if_reached_destination(self, sent_packet: WirelessSentPacket) -> None:
+    def _schedule_deliveries(self, sent_packet: WirelessSentPacket, sending_side: WirelessConnectionSide) -> None:
         """
-        Adds the packet to its appropriate destination side's `received_packets` list.
-        This is called when the packet finished its route through this connection and is ready to be received at the
-        connected `CableNetworkInterface`.
-        :param sent_packet: a `CableSentPacket` namedtuple.
-        :return: None
+        Computes the time the packet reaches each of the sides of the connection (except the one that sent it)
+        and inserts these deliveries to the heap.
+        The edge of the packet reaches a side when it is `RECEIVING_DISTANCE` pixels away from it.
         """
-        wireless_packet = sent_packet.packet
-
+        origin = sending_side.wireless_interface.get_graphics().location
         for side in self.connection_sides:
-            location = side.wireless_interface.get_graphics().location
+            if side is sending_side:
+                continue
 
-            if 0 != distance(location, wireless_packet.get_graphics().center_location) - wireless_packet.get_graphics().distance < 20:
-                if side.was_already_received(sent_packet):  # dont get packets twice!
-                    continue
+            reach_distance = max(distance(origin, side.wireless_interface.get_graphics().location) -
+                                 CONNECTIONS.WIRELESS.RECEIVING_DISTANCE, 0)
+            if reach_distance > self.longest_line_on_the_screen:
+                continue  # the packet will be removed before it gets there
 
-                side.get_packet_from_connection(sent_packet)
+            heappush(self._deliveries,
+                     (sent_packet.time_of_distance(reach_distance), next(self._delivery_counter), sent_packet, side, reach_distance))
 
-    def _remove_packet_if_out_of_screen(self, sent_packet: WirelessSentPacket) -> None:
+    def _reschedule_deliveries(self, sent_packet: WirelessSentPacket) -> None:
         """
-        When a packet gets too far from its origin (the Antenna) it is not longer displayed nor used, so
-        it should be deleted
-        :param sent_packet: a `CableSentPacket`
-        :return:
+        Recomputes the time the packet reaches each of the sides it did not reach yet - after its speed was changed.
+        """
+        self._deliveries = [
+            (sent_packet.time_of_distance(reach_distance) if packet is sent_packet else time, counter, packet, side, reach_distance)
+            for time, counter, packet, side, reach_distance in self._deliveries
+        ]
+        heapify(self._deliveries)
+
+    def _schedule_packet_event(self, sent_packet: WirelessSentPacket) -> None:
         """
-        if self._get_distance(sent_packet) <= self.longest_line_on_the_screen:
-            return  # packet still visible in screen...
+        Insert the packet to the heap of packet events - by the time it should be dropped, delayed or leave the screen
+        """
+        if sent_packet.will_be_dropped or sent_packet.will_be_delayed:
+            event_time = sent_packet.time_of_distance(sent_packet.event_distance)
+        else:
+            event_time = sent_packet.time_of_distance(self.longest_line_on_the_screen)
+        heappush(self._packet_events, (event_time, next(self._delivery_counter), sent_packet))
+
+    def _remove_packet(self, sent_packet: SentPacket) -> None:
+        if not isinstance(sent_packet, WirelessSentPacket):
+            return  # It is not in the `sent_packets` list...
 
-        sent_packet.packet.get_graphics().unregister()
+        sent_packet.is_in_flight = False
         self.sent_packets.remove(sent_packet)
 
+    def _receive_on_sides_if_reached_destination(self) -> None:
+        """
+        Adds the packets that reached sides of the connection to these sides' `received_packets` list.
+        Only the deliveries that are due are popped out of the heap - the rest are not looked at.
+        Deliveries of packets that were dropped and to sides that were removed since are ignored.
+        """
+        now = MainLoop.get_time()
+        while self._deliveries and self._deliveries[0][0] <= now:
+            _, _, sent_packet, side, _ = heappop(self._deliveries)
+            if sent_packet.is_in_flight and side in self.connection_sides:
+                side.get_packet_from_connection(sent_packet)
+
     def _send_packets_from_side(self, side: WirelessConnectionSide) -> List[GraphicsObject]:
         """
         Takes all of the packets that are waiting to be sent on one CableConnectionSide and sends them down the main connection.
@@ -142,52 +215,61 @@ class WirelessConnection(Connection):
         packet_graphics_to_register = []
         if side.is_sending():
             for packet in side.pop_packets_to_send():
-                wireless_packet = self._add_packet(packet, side)
-                packet_graphics_to_register.extend(wireless_packet.init_graphics(self, side.wireless_interface))
+                sent_packet = self._add_packet(packet, side)
+                packet_graphics_to_register.extend(sent_packet.packet.init_graphics(self, side.wireless_interface))
+                sent_packet.packet.get_graphics().sent_packet = sent_packet
         return packet_graphics_to_register
 
-    def _update_packet(self, sent_packet: WirelessSentPacket) -> None:
+    def _handle_packet_event(self, sent_packet: WirelessSentPacket) -> List[AnimationGraphics]:
         """
-        Receives a CableSentPacket object and updates its progress on the connection.
-        If the packet has reached the end of the connection, make it be received at the appropriate CableConnectionSide
-        :param sent_packet: a `CableSentPacket` namedtuple
+        Performs the thing that should happen to a packet whose time has come.
+        Drops it, delays it (and reschedules its arrivals) or removes it when it gets too far from its origin
+            (and is no longer displayed nor used)
+        :return: the animations that should be registered
         """
-        distance_ = self._get_distance(sent_packet)
-        sent_packet.packet.get_graphics().distance = distance_
+        packet_graphics = sent_packet.packet.get_graphics()
 
-        self._remove_packet_if_out_of_screen(sent_packet)
+        if sent_packet.will_be_dropped:
+            self.stop_packet(sent_packet)
+            return [packet_graphics.get_drop_animation()]
 
-    def _get_distance(self, sent_packet: SentPacket) -> float:
-        """
-        Returns the distance of the packet from the source of origin
-        Calculated by the time and speed of the wireless packet
-        """
-        return MainLoop.get_time_since(sent_packet.sending_time) * self.speed
+        if sent_packet.will_be_delayed:
+            sent_packet.will_be_delayed = False
+            packet_graphics.decrease_speed()
+            self._reschedule_deliveries(sent_packet)
+            self._schedule_packet_event(sent_packet)
+            return [packet_graphics.get_decrease_speed_animation()]
+
+        self.stop_packet(sent_packet)
+        return []
 
-    def _is_lucky_packet(self, sent_packet: SentPacket) -> bool:
+    def _handle_due_packet_events(self) -> List[AnimationGraphics]:
         """
-        Checks whether a certain event should happen to a packet
-        The chances go up as the packet moves further and further away from the center of origin.
+        Handles all of the packets whose next event is due.
+        :return: the animations that should be registered
         """
-        return (2 * (self._get_distance(sent_packet) / WINDOWS.MAIN.WIDTH)) >= (random.random() + 0.3)
+        now = MainLoop.get_time()
+        animations_to_register = []
+        while self._packet_events and self._packet_events[0][0] <= now:
+            _, _, sent_packet = heappop(self._packet_events)
+            if sent_packet.is_in_flight:
+                animations_to_register.extend(self._handle_packet_event(sent_packet))
+        return animations_to_register
 
     def move_packets(self, main_loop: MainLoop) -> None:
         """
         This method is inserted into the main loop of the simulation when this `Connection` object is initialized.
         The packets in the connection should always be moving. (unless paused)
-        This method sends new packets from the `CableConnectionSide` object, updates the time they have been in the cable, and
-            removes them if they reached the end.
+        This method sends new packets from the `WirelessConnectionSide` objects, and handles the deliveries and the packet
+            events that are due (by their precomputed time).
+        The packets in the middle of their way cost nothing - their graphics compute their size when drawn.
         """
         for side in self.get_sides():
             new_packet_graphics_objects = self._send_packets_from_side(side)
             main_loop.register_graphics_object(new_packet_graphics_objects)
 
-        for sent_packet in self.sent_packets[:]:  # we copy the list because we alter it during the run
-            self._update_packet(sent_packet)
-            self._receive_on_sides_if_reached_destination(sent_packet)
-
-        main_loop.register_graphics_object(self._drop_predetermined_dropped_packets())
-        main_loop.register_graphics_object(self._delay_predetermined_delayed_packets())
+        self._receive_on_sides_if_reached_destination()
+        main_loop.register_graphics_object(self._handle_due_packet_events())
 
     def __repr__(self) -> str:
         """The ip_layer representation of the connection"""
@@ -205,7 +287,6 @@ class WirelessConnectionSide(ConnectionSide):
         super(WirelessConnectionSide, self).__init__(main_connection)
 
         self.wireless_interface = wireless_interface
-        self._received_packet_ids: List[int] = []
 
     def get_packet_from_connection(self, sent_packet: SentPacket) -> None:
         """
@@ -215,18 +296,3 @@ class WirelessConnectionSide(ConnectionSide):
             raise WrongUsageError(f"Only call this function with a WirelessSentPacket object not {type(sent_packet)} like {sent_packet!r}!!!")
 
         self._packets_to_receive.append(CablePacket(sent_packet.packet.data))
-        self._received_packet_ids.append(sent_packet.id)
-
-    def was_already_received(self, sent_packet: WirelessSentPacket) -> bool:
-        """
-        Return whether or not the packet was already received on this side of the `WirelessConnection` and translated into a regular packet :)
-        Does it by looking at the ID of that packet :)
-        """
-        return bool(sent_packet.id in self._received_packet_ids)
-
-    def recognize_sent_packet(self, id_: int) -> None:
-        """
-        Lets the connection side know that a certain packet was sent by itself.
-        That way it will not take it in at any case.
-        """
-        self._received_packet_ids.append(id_)
@@ -18,8 +18,12 @@ class File:
         """
         self.name = name
         self.__content = content
+        self.__appended: List[str] = []
+        # ^ data that was appended and not joined to the content yet - so many small appends do not copy the file each time
         self.creation_time = datetime.now()
         self.last_edit_time = datetime.now()
+        self.version = 0
+        # ^ increased on every write, so whoever caches a parsed version of the file knows when it is outdated.
 
         self._is_open_for_reading = False
         self._is_open_for_writing = False
@@ -40,7 +44,7 @@ class File:
         :return:
         """
         if self._is_open_for_reading:
-            return self.__content
+            return self._joined_content()
         raise FileNotOpenError("Cannot read from closed file for reading!")
 
     def write(self, data: str) -> None:
@@ -49,17 +53,32 @@ class File:
         """
         if self._is_open_for_writing:
             self.__content = data
-            self.last_edit_time = datetime.now()
+            self.__appended.clear()
+            self._mark_edited()
         else:
             raise FileNotOpenError("Cannot write to closed file for writing!")
 
     def append(self, data: str) -> None:
         """
         Append data to the end of a file.
+        The data is only joined to the rest of the file when it is read, so appending does not depend on the file size.
         :param data:
         :return:
         """
-        self.write(self.read() + data)
+        if not self._is_open_for_writing:
+            raise FileNotOpenError("Cannot write to closed file for writing!")
+        self.__appended.append(data)
+        self._mark_edited()
+
+    def _mark_edited(self) -> None:
+        self.last_edit_time = datetime.now()
+        self.version += 1
+
+    def _joined_content(self) -> str:
+        if self.__appended:
+            self.__content = ''.join([self.__content, *self.__appended])
+            self.__appended.clear()
+        return self.__content
 
     def close(self) -> None:
         """
@@ -97,7 +116,7 @@ class File:
             "name": self.name,
             "creation_time": repr(self.creation_time),
             "last_edit_time": repr(self.last_edit_time),
-            "content": self.__content,
+            "content": self._joined_content(),
         }
 
     @classmethod
@@ -117,7 +136,7 @@ class File:
         :return:
         """
         name = self.name if new_name is None else new_name
-        return self.__class__(name, self.__content)
+        return self.__class__(name, self._joined_content())
 
     def readlines(self) -> List[str]:
         """read and split by line"""
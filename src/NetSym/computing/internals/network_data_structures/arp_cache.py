@@ -82,17 +82,35 @@ class ArpCache:
             string += f"{str(ip): >19}{str(arp_cache_item.mac): >22}\n"
         return string
 
+    def _find(self, ip_address: IPAddress) -> Optional[ARPCacheItem]:
+        """
+        Returns the item of the given address or None if it is not in the cache.
+        Keys are compared by the IP itself - the subnet mask is ignored
+        (the direct lookup is tried first since most of the time the masks are the same)
+        """
+        arp_cache_item = self.__cache.get(ip_address)
+        if arp_cache_item is not None:
+            return arp_cache_item
+
+        for ip, value in self.__cache.items():
+            if ip.string_ip == ip_address.string_ip:
+                return value
+        return None
+
     def __contains__(self, item: Union[str, IPAddress]) -> bool:
         if not isinstance(item, (str, IPAddress)):
             raise InvalidAddressError(f"Key of an arp cache must be a string or IPAddress object!!! not {type(item)} like {repr(item)}")
 
-        return IPAddress(item).string_ip in {ip.string_ip: value for ip, value in self.__cache.items()}
+        return self._find(IPAddress(item)) is not None
 
     def __getitem__(self, item: Union[str, IPAddress]) -> ARPCacheItem:
         if not isinstance(item, (str, IPAddress)):
             raise KeyError(f"Only search the arp cache for string or IPAddress! not {type(item)}!")
 
-        return {ip.string_ip: value for ip, value in self.__cache.items()}[IPAddress(item).string_ip]
+        arp_cache_item = self._find(IPAddress(item))
+        if arp_cache_item is None:
+            raise KeyError(IPAddress(item).string_ip)
+        return arp_cache_item
 
     def __iter__(self) -> Iterator:
         return iter(self.__cache)
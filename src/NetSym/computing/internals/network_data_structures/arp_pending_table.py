@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Deque, List, Optional, Union
+
+import scapy
+
+from NetSym.address.ip_address import IPAddress
+from NetSym.consts import PROTOCOLS, T_Time
+from NetSym.gui.main_loop import MainLoop
+
+
+@dataclass
+class PendingResolution:
+    """
+    The packets that wait for the MAC address of a single next hop to be resolved, and the process that resolves it.
+    """
+    pid:           Optional[int]
+    packets:       Deque[scapy.packet.Packet] = field(default_factory=deque)
+    creation_time: T_Time                     = field(default_factory=MainLoop.get_time)
+
+
+class ARPPendingTable:
+    """
+    Holds the IP packets that cannot be sent yet since the MAC address of their next hop is unknown.
+    The table is keyed by the next hop IP address so a burst of packets to a new host only waits for a single ARP resolution.
+
+    Every address holds a bounded queue of packets - when it is full new packets are dropped.
+    """
+    def __init__(self, max_queue_length: int = PROTOCOLS.ARP.PENDING_QUEUE_LENGTH) -> None:
+        """
+        Create an empty table
+        :param max_queue_length: the maximum amount of packets that can wait for a single address
+        """
+        self._pending: Dict[str, PendingResolution] = {}
+        self.max_queue_length = max_queue_length
+        self.dropped_count = 0
+
+    def __contains__(self, ip_address: Union[str, IPAddress]) -> bool:
+        """Whether or not packets wait for the supplied address"""
+        return IPAddress(ip_address).string_ip in self._pending
+
+    def __getitem__(self, ip_address: Union[str, IPAddress]) -> PendingResolution:
+        return self._pending[IPAddress(ip_address).string_ip]
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, ip_address: Union[str, IPAddress], pid: Optional[int] = None) -> PendingResolution:
+        """
+        Start waiting for the resolution of the given address (if it is not waited for already)
+        :param ip_address: the next hop that is resolved
+        :param pid: the ID of the process that resolves the address
+        """
+        return self._pending.setdefault(IPAddress(ip_address).string_ip, PendingResolution(pid))
+
+    def enqueue(self, ip_address: Union[str, IPAddress], ip_layer: scapy.packet.Packet) -> bool:
+        """
+        Insert a packet to wait for the resolution of the given next hop.
+        :return: whether or not the packet was inserted (False if the queue of the address is full and the packet was dropped)
+        """
+        pending_resolution = self.add(ip_address)
+        if len(pending_resolution.packets) >= self.max_queue_length:
+            self.dropped_count += 1
+            return False
+
+        pending_resolution.packets.append(ip_layer)
+        return True
+
+    def pop(self, ip_address: Union[str, IPAddress]) -> List[scapy.packet.Packet]:
+        """
+        Stop waiting for the address and return all of the packets that waited for it (in the order they were inserted)
+        """
+        pending_resolution = self._pending.pop(IPAddress(ip_address).string_ip, None)
+        return list(pending_resolution.packets) if pending_resolution is not None else []
+
+    def wipe(self) -> None:
+        """
+        Forget all of the waiting packets
+        """
+        self._pending.clear()
+
+    def __repr__(self) -> str:
+        return f"ARPPendingTable({', '.join(f'{ip}: {len(pending.packets)}' for ip, pending in self._pending.items())})"
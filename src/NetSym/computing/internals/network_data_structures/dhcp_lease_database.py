@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Iterable, Iterator, Union
+
+from NetSym.address.ip_address import IPAddress
+from NetSym.consts import ADDRESSES, PROTOCOLS, T_Time
+from NetSym.exceptions import *
+from NetSym.gui.main_loop import MainLoop
+
+if TYPE_CHECKING:
+    from NetSym.address.mac_address import MACAddress
+    from NetSym.computing.internals.network_interfaces.network_interface import NetworkInterface
+
+
+class AddressPool:
+    """
+    The addresses of a single subnet that a DHCP server can hand out.
+    Every address in the subnet (except for the network and broadcast addresses) is a single bit in a bitmap,
+        so allocating and freeing an address does not depend on the amount of clients that were served before.
+
+    Allocation always returns the lowest free address after the address of the server (wrapping around),
+        so freed addresses are reused before the pool grows.
+    """
+    def __init__(self, server_ip: IPAddress, reserved: Iterable[IPAddress] = ()) -> None:
+        """
+        Create a pool of all of the addresses in the subnet of the server
+        :param server_ip: the address of the serving interface (with its subnet mask)
+        :param reserved: addresses in the subnet that must never be handed out (the gateway, for example)
+        """
+        self.server_ip = IPAddress.copy(server_ip)
+        self.subnet_mask = int(server_ip.subnet_mask)
+
+        self._first_address = self._as_number(server_ip.subnet()) + 1
+        self.size = max(0, 2 ** (ADDRESSES.IP.BIT_LENGTH - self.subnet_mask) - 2)
+        self._all_addresses = (1 << self.size) - 1
+
+        self._bitmap = 0
+        self._used_count = 0
+
+        for address in [server_ip, *reserved]:
+            self.allocate(address)
+        self._start_index = (self._index(server_ip) + 1) if server_ip in self else 0
+
+    @staticmethod
+    def _as_number(address: IPAddress) -> int:
+        return int(IPAddress.as_bits(address.string_ip), base=2)
+
+    def _index(self, address: IPAddress) -> int:
+        return self._as_number(address) - self._first_address
+
+    def _address(self, index: int) -> IPAddress:
+        bits = bin(self._first_address + index)[2:].zfill(ADDRESSES.IP.BIT_LENGTH)
+        return IPAddress.from_bits(bits, self.subnet_mask)
+
+    def __contains__(self, address: IPAddress) -> bool:
+        """Whether or not the address is one of the addresses of the pool"""
+        return bool(0 <= self._index(address) < self.size)
+
+    def __len__(self) -> int:
+        """The amount of addresses that are in use"""
+        return self._used_count
+
+    @property
+    def utilization(self) -> float:
+        """The part of the pool that is in use (between 0 and 1)"""
+        return (self._used_count / self.size) if self.size else 1.0
+
+    def is_free(self, address: IPAddress) -> bool:
+        return bool(address in self and not self._bitmap & (1 << self._index(address)))
+
+    def allocate(self, address: Optional[IPAddress] = None) -> Optional[IPAddress]:
+        """
+        Mark an address of the pool as used.
+        :param address: a specific address to allocate. If not supplied - the lowest free address is allocated.
+        :return: the allocated address, or None if it is taken (or if the whole pool is)
+        """
+        if address is not None:
+            if not self.is_free(address):
+                return None
+            index = self._index(address)
+        else:
+            free = ~self._bitmap & self._all_addresses
+            free_after_start = (free >> self._start_index) << self._start_index
+            free = free_after_start or free
+            if not free:
+                return None
+            index = (free & -free).bit_length() - 1
+
+        self._bitmap |= (1 << index)
+        self._used_count += 1
+        return self._address(index)
+
+    def free(self, address: IPAddress) -> None:
+        """
+        Return an address to the pool. Freeing an address that is not in use does nothing.
+        """
+        if address not in self or self.is_free(address):
+            return
+
+        self._bitmap &= ~(1 << self._index(address))
+        self._used_count -= 1
+
+    def __repr__(self) -> str:
+        return f"AddressPool({self.server_ip!r}, {self._used_count}/{self.size})"
+
+
+@dataclass
+class DHCPLease:
+    """
+    An address that was handed to a single client.
+    A lease is first only offered to the client (for a short while) and it is bound once the client requests it.
+    """
+    client_mac:      str
+    ip:              IPAddress
+    interface:       NetworkInterface
+    expiration_time: T_Time
+    is_bound:        bool = False
+
+    @property
+    def time_left(self) -> T_Time:
+        return max(0, self.expiration_time - MainLoop.get_time())
+
+
+class DHCPLeaseDatabase:
+    """
+    The leases of a DHCP server, keyed by the MAC address of the client.
+    Every serving interface has an `AddressPool` that the addresses of the leases are taken from.
+
+    A returning client gets the same lease back without searching the pool.
+    Leases that were not renewed in time expire and their address goes back to the pool.
+    """
+    def __init__(self,
+                 lease_time: T_Time = PROTOCOLS.DHCP.LEASE_TIME,
+                 offer_time: T_Time = PROTOCOLS.DHCP.OFFER_TIME) -> None:
+        """
+        Create an empty database
+        :param lease_time: how long a bound lease lasts before the client must renew it
+        :param offer_time: how long an offered address is kept for the client before it requests it
+        """
+        self.lease_time = lease_time
+        self.offer_time = offer_time
+
+        self.pools: Dict[NetworkInterface, AddressPool] = {}
+        self._leases: Dict[str, DHCPLease] = {}
+        self._expirations: List[Tuple[T_Time, str]] = []
+        # ^ a heap of (expiration time, client mac). Entries of leases that were renewed or released are skipped when popped.
+
+        self.expired_count = 0
+
+    def __contains__(self, client_mac: Union[MACAddress, str]) -> bool:
+        return str(client_mac) in self._leases
+
+    def __getitem__(self, client_mac: Union[MACAddress, str]) -> DHCPLease:
+        return self._leases[str(client_mac)]
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+    def __iter__(self) -> Iterator[DHCPLease]:
+        return iter(list(self._leases.values()))
+
+    def get(self, client_mac: Union[MACAddress, str]) -> Optional[DHCPLease]:
+        return self._leases.get(str(client_mac))
+
+    def add_pool(self, interface: NetworkInterface, reserved: Iterable[IPAddress] = ()) -> AddressPool:
+        """
+        Start serving addresses in the subnet of the interface. Leases of a previous pool of the interface are forgotten.
+        :param interface: the interface that serves the subnet (must have an IP address)
+        :param reserved: addresses in the subnet that must never be handed out
+        """
+        self.remove_pool(interface)
+        self.pools[interface] = AddressPool(interface.get_ip(), reserved)
+        return self.pools[interface]
+
+    def remove_pool(self, interface: NetworkInterface) -> None:
+        """
+        Stop serving the subnet of the interface and forget all of its leases
+        """
+        for lease in self:
+            if lease.interface is interface:
+                del self._leases[lease.client_mac]
+        self.pools.pop(interface, None)
+
+    def _set_expiration(self, lease: DHCPLease, duration: T_Time) -> None:
+        lease.expiration_time = MainLoop.get_time() + duration
+        heapq.heappush(self._expirations, (lease.expiration_time, lease.client_mac))
+
+    def _new_lease(self, client_mac: str, interface: NetworkInterface, address: Optional[IPAddress] = None) -> Optional[DHCPLease]:
+        """
+        Allocate an address from the pool of the interface and create a lease for it.
+        Expired leases are reclaimed first if the pool is full.
+        :return: the lease, or None if no address could be allocated
+        """
+        pool = self.pools[interface]
+        allocated = pool.allocate(address)
+        if allocated is None and self.expire_leases():
+            allocated = pool.allocate(address)
+        if allocated is None:
+            return None
+
+        lease = DHCPLease(client_mac, allocated, interface, MainLoop.get_time())
+        self._leases[client_mac] = lease
+        return lease
+
+    def offer(self, client_mac: Union[MACAddress, str], interface: NetworkInterface) -> IPAddress:
+        """
+        Choose the address to offer a client that asked the interface for one.
+        A client that already holds a lease on this interface is offered the same address.
+        :return: the offered `IPAddress`
+        """
+        client_mac = str(client_mac)
+        lease = self._leases.get(client_mac)
+        if lease is not None and lease.interface is not interface:
+            self.release(client_mac)
+            lease = None
+
+        if lease is None:
+            lease = self._new_lease(client_mac, interface)
+            if lease is None:
+                raise DHCPPoolExhaustedError(f"No free addresses are left in {self.pools[interface]!r}")
+
+        if not lease.is_bound:
+            self._set_expiration(lease, self.offer_time)
+        return IPAddress.copy(lease.ip)
+
+    def bind(self,
+             client_mac: Union[MACAddress, str],
+             interface: NetworkInterface,
+             requested_ip: Optional[IPAddress] = None) -> Optional[DHCPLease]:
+        """
+        Bind (or renew) the lease of a client that requested its address.
+        A client without a lease receives the address it requested if it is free.
+        :param client_mac: the MAC address of the client
+        :param interface: the interface that received the request
+        :param requested_ip: the address that the client requested (None means the address it already holds)
+        :return: the bound lease, or None if the client cannot receive the address it requested
+        """
+        client_mac = str(client_mac)
+        lease = self._leases.get(client_mac)
+        if lease is not None and (lease.interface is not interface or
+                                  (requested_ip is not None and lease.ip.string_ip != requested_ip.string_ip)):
+            self.release(client_mac)
+            lease = None
+
+        if lease is None:
+            if requested_ip is None or interface not in self.pools:
+                return None
+            lease = self._new_lease(client_mac, interface, requested_ip)
+            if lease is None:
+                return None
+
+        lease.is_bound = True
+        self._set_expiration(lease, self.lease_time)
+        return lease
+
+    def renew(self, client_mac: Union[MACAddress, str]) -> Optional[DHCPLease]:
+        """
+        Extend the lease of a client that already has one
+        :return: the renewed lease or None if the client has no lease
+        """
+        lease = self._leases.get(str(client_mac))
+        if lease is None:
+            return None
+        return self.bind(client_mac, lease.interface)
+
+    def release(self, client_mac: Union[MACAddress, str]) -> bool:
+        """
+        Return the address of the client to the pool
+        :return: whether or not the client had a lease
+        """
+        lease = self._leases.pop(str(client_mac), None)
+        if lease is None:
+            return False
+
+        if lease.interface in self.pools:
+            self.pools[lease.interface].free(lease.ip)
+        return True
+
+    def expire_leases(self) -> int:
+        """
+        Release all of the leases whose time has passed.
+        :return: the amount of leases that expired
+        """
+        now = MainLoop.get_time()
+        expired = 0
+        while self._expirations and self._expirations[0][0] <= now:
+            expiration_time, client_mac = heapq.heappop(self._expirations)
+            lease = self._leases.get(client_mac)
+            if lease is not None and lease.expiration_time == expiration_time:
+                self.release(client_mac)
+                expired += 1
+
+        self.expired_count += expired
+        return expired
+
+    def __repr__(self) -> str:
+        return f"DHCPLeaseDatabase({', '.join(f'{lease.client_mac}: {lease.ip}' for lease in self._leases.values())})"
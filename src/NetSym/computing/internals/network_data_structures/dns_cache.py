@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Optional, Type
 
 from NetSym.address.ip_address import IPAddress
 from NetSym.consts import T_Time
@@ -15,6 +15,18 @@ class DNSCacheItem:
     creation_time: T_Time
 
 
+@dataclass
+class PendingDNSQuery:
+    """
+    A name that is being resolved right now.
+    Whoever needs the same name waits for this query to end instead of sending another one.
+        `deadline` is the time in which the query surely ended (even if none of the servers answered)
+    """
+    deadline: T_Time
+    is_done:  bool                           = False
+    error:    Optional[Type[BaseException]] = None
+
+
 class DNSCache:
     """
     A cache that m aps a name to an IP address
@@ -26,6 +38,8 @@ class DNSCache:
         self._cache: Dict[T_Hostname, DNSCacheItem] = initial_dict if initial_dict is not None else {}
         self.transaction_counter = 0
 
+        self.pending_queries: Dict[T_Hostname, PendingDNSQuery] = {}
+
     def __getitem__(self, item: T_Hostname) -> DNSCacheItem:
         """
         Resolve a DNS name
@@ -63,6 +77,7 @@ class DNSCache:
         Clear the DNS cache of all entries
         """
         self._cache.clear()
+        self.pending_queries.clear()
 
     def __repr__(self) -> str:
         """
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict
+
+from NetSym.computing.internals.network_data_structures.token_bucket import TokenBucket
+from NetSym.consts import OPCODES, PROTOCOLS
+
+
+@dataclass
+class ICMPTypeStatistics:
+    sent_count:       int = 0
+    suppressed_count: int = 0
+
+
+class ICMPRateLimiter:
+    """
+    Limits the ICMP messages that the computer generates by itself (echo replies and error messages) - like the
+        `icmp_ratelimit` of the linux kernel.
+    Every ICMP type has its own token bucket, so a ping flood does not silence the error messages of a router, and a
+        traceroute sweep does not stop it from answering pings.
+    """
+    def __init__(self,
+                 rate: float = PROTOCOLS.ICMP.RATE_LIMIT.RATE,
+                 burst: int = PROTOCOLS.ICMP.RATE_LIMIT.BURST) -> None:
+        """
+        Create a limiter where all of the ICMP types have the same limit
+        :param rate: the amount of messages of each type that are allowed every second
+        :param burst: the amount of messages of each type that are allowed at once
+        """
+        self.default_rate = rate
+        self.default_burst = burst
+        self._limits: Dict[int, TokenBucket] = {}
+        self.statistics: Dict[int, ICMPTypeStatistics] = {}
+
+    def configure(self, icmp_type: int, rate: float, burst: int) -> None:
+        """
+        Set the limit of a single ICMP type (the bucket starts full)
+        """
+        self._limits[icmp_type] = TokenBucket(rate, burst)
+
+    def allow(self, icmp_type: int) -> bool:
+        """
+        Decide whether or not an ICMP message of the given type may be sent now, and count the decision
+        :return: True if the message should be sent, False if it should be suppressed
+        """
+        if icmp_type not in self._limits:
+            self.configure(icmp_type, self.default_rate, self.default_burst)
+
+        is_allowed = self._limits[icmp_type].take()
+
+        statistics = self.statistics.setdefault(icmp_type, ICMPTypeStatistics())
+        if is_allowed:
+            statistics.sent_count += 1
+        else:
+            statistics.suppressed_count += 1
+        return is_allowed
+
+    @property
+    def suppressed_count(self) -> int:
+        return sum(statistics.suppressed_count for statistics in self.statistics.values())
+
+    def wipe(self) -> None:
+        """Refill all of the buckets and forget the counters"""
+        for icmp_type, bucket in list(self._limits.items()):
+            self.configure(icmp_type, bucket.rate, bucket.burst)
+        self.statistics.clear()
+
+    def __repr__(self) -> str:
+        type_names = {value: name.lower() for name, value in vars(OPCODES.ICMP.TYPES).items() if not name.startswith('_')}
+        return '\n'.join(f"{type_names.get(icmp_type, icmp_type): <16} sent: {statistics.sent_count} "
+                         f"suppressed: {statistics.suppressed_count}"
+                         for icmp_type, statistics in sorted(self.statistics.items()))
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, List, Union
+
+from NetSym.address.ip_address import IPAddress
+from NetSym.consts import PROTOCOLS, T_Time
+from NetSym.gui.main_loop import MainLoop
+
+
+@dataclass
+class NameserverStatistics:
+    answer_count:         int              = 0
+    timeout_count:        int              = 0
+    consecutive_timeouts: int              = 0
+    last_timeout_time:    Optional[T_Time] = None
+    last_response_time:   Optional[T_Time] = None
+    # ^ how long the last answer of the server took to arrive
+
+
+class NameserverHealth:
+    """
+    Tracks how the DNS servers of the computer respond to queries.
+    Servers that timed out recently are asked after the ones that did not, until they answer again
+        (or until `penalty_time` passes since their last timeout).
+    """
+    def __init__(self, penalty_time: T_Time = PROTOCOLS.DNS.NAMESERVER_PENALTY_TIME) -> None:
+        """
+        Create an empty table
+        :param penalty_time: how long a server that timed out stays deprioritized
+        """
+        self._statistics: Dict[str, NameserverStatistics] = {}
+        self.penalty_time = penalty_time
+
+    def __getitem__(self, server: Union[str, IPAddress]) -> NameserverStatistics:
+        return self._statistics.setdefault(IPAddress(server).string_ip, NameserverStatistics())
+
+    def record_answer(self, server: Union[str, IPAddress], response_time: T_Time) -> None:
+        """
+        The server answered a query - it is healthy again
+        :param response_time: how long it took the answer to arrive
+        """
+        statistics = self[server]
+        statistics.answer_count += 1
+        statistics.consecutive_timeouts = 0
+        statistics.last_response_time = response_time
+
+    def record_timeout(self, server: Union[str, IPAddress]) -> None:
+        """
+        The server did not answer a query in time
+        """
+        statistics = self[server]
+        statistics.timeout_count += 1
+        statistics.consecutive_timeouts += 1
+        statistics.last_timeout_time = MainLoop.get_time()
+
+    def penalty(self, server: Union[str, IPAddress]) -> int:
+        """
+        How far back the server should be pushed when choosing which server to ask (0 for a healthy server)
+        """
+        statistics = self[server]
+        if statistics.last_timeout_time is None or MainLoop.get_time_since(statistics.last_timeout_time) > self.penalty_time:
+            return 0
+        return statistics.consecutive_timeouts
+
+    def ordered(self, servers: List[IPAddress]) -> List[IPAddress]:
+        """
+        The servers in the order they should be asked - healthy servers first, and otherwise in the configured order
+        """
+        return sorted(servers, key=self.penalty)
+
+    def wipe(self) -> None:
+        self._statistics.clear()
+
+    def __repr__(self) -> str:
+        return '\n'.join(f"{server: <16} answers: {statistics.answer_count} timeouts: {statistics.timeout_count} "
+                         f"(consecutive: {statistics.consecutive_timeouts})"
+                         for server, statistics in self._statistics.items())
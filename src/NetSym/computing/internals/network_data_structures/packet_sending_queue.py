@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Optional, Deque
+from typing import TYPE_CHECKING, Optional, Deque, Tuple
 
 from NetSym.consts import T_Time
 from NetSym.gui.main_loop import MainLoop
@@ -17,6 +17,9 @@ if TYPE_CHECKING:
 class PacketSendingQueue:
     """
     a set of packets that should be sent one after the other, with some gaps of time in between - for visual prettiness
+
+    The computer keeps its queues on a heap ordered by `next_sending_time` so only the queues that are due are handled in each tick.
+    `is_scheduled` tells whether or not the queue currently has an entry in that heap.
     """
     computer:                 Computer
     pid:                      int
@@ -26,6 +29,17 @@ class PacketSendingQueue:
     interface:                Optional[NetworkInterface] = None
     sending_socket:           Optional[RawSocket] = None
     last_packet_sending_time: T_Time              = field(default_factory=MainLoop.get_time)
+    is_scheduled:             bool                = False
+
+    @property
+    def key(self) -> Tuple[int, str]:
+        """The key of the queue in the computer - every process has (at most) a single queue"""
+        return self.pid, self.process_mode
+
+    @property
+    def next_sending_time(self) -> T_Time:
+        """The time after which the next packet of the queue is allowed to be sent"""
+        return self.last_packet_sending_time + self.interval
 
     def send_packets_with_time_gaps(self) -> None:
         """
@@ -40,3 +54,11 @@ class PacketSendingQueue:
         packet = self.packets.popleft()
         self.computer.send(packet, self.interface, self.sending_socket)
         self.last_packet_sending_time = MainLoop.get_time()
+
+    def send_all_packets(self) -> None:
+        """
+        Send all of the packets in the queue right now - with no time gaps at all
+        """
+        while self.packets:
+            self.computer.send(self.packets.popleft(), self.interface, self.sending_socket)
+        self.last_packet_sending_time = MainLoop.get_time()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from operator import attrgetter
 from os import linesep
-from typing import NamedTuple, Optional, Union, Dict, List
+from typing import NamedTuple, Optional, Union, Dict, List, Tuple
 
 from NetSym.address.ip_address import IPAddress
 from NetSym.consts import ADDRESSES
@@ -42,14 +42,25 @@ class RoutingTable:
     destination and netmask in the key)
 
     The class is based on an `OrderedDict` because the order matters in a routing table!
+
+    A destination may have multiple equal-cost next hops (ECMP). They are kept in `multipath`, and `dictionary` holds
+    the first of them. Forwarded packets pick one of the next hops by the hash of their flow, so the packets of a
+    single flow always take the same path (and are not reordered) while different flows are spread over all of them.
     """
 
     dictionary: Dict[IPAddress, RoutingTableItem]
+    multipath:  Dict[IPAddress, List[RoutingTableItem]]
 
-    def __init__(self, initial_dict: Optional[Dict[IPAddress, RoutingTableItem]] = None) -> None:
+    def __init__(self,
+                 initial_dict: Optional[Dict[IPAddress, RoutingTableItem]] = None,
+                 multipath: Optional[Dict[IPAddress, List[RoutingTableItem]]] = None) -> None:
         """
         Initiates the RoutingTable with some default entries.
         """
+        self.multipath = multipath if multipath is not None else {}
+        self.next_hop_counters: Dict[Tuple[str, str], int] = {}
+        # ^ the amount of packets that were forwarded to each (gateway, interface) pair
+
         if initial_dict is not None:
             self.dictionary = initial_dict
             return
@@ -72,8 +83,8 @@ class RoutingTable:
         from the computer to it.
         :return: None
         """
-        self.dictionary[IPAddress("0.0.0.0/0")]          = RoutingTableItem(gateway, interface_ip)
-        self.dictionary[IPAddress("255.255.255.255/32")] = RoutingTableItem(gateway, interface_ip)
+        self.route_add(IPAddress("0.0.0.0/0"),          gateway, interface_ip)
+        self.route_add(IPAddress("255.255.255.255/32"), gateway, interface_ip)
 
     @classmethod
     def create_default(cls, ips: List[IPAddress], expect_normal_gateway: bool = True) -> RoutingTable:
@@ -95,29 +106,65 @@ class RoutingTable:
             table.add_interface(ip)
         return table
 
-    def route_add(self, destination_ip: IPAddress, gateway_ip: Union[str, IPAddress], interface_ip: IPAddress) -> None:
+    def route_add(self,
+                  destination_ip: IPAddress,
+                  gateway_ip: Union[str, IPAddress],
+                  interface_ip: IPAddress,
+                  append: bool = False) -> None:
         """
         Adds a route from all of the required ip_layer to do that
         :param destination_ip: an `IPAddress` of the destination.
         :param gateway_ip: an `IPAddress` of the gateway to send things to.
         :param interface_ip: an `IPAddress` of the interface to send through it things to the gateway.
+        :param append: whether to add the gateway as another equal-cost next hop of the destination (instead of
+            replacing the route to it)
         :return: None
         """
         if gateway_ip is not ADDRESSES.IP.ON_LINK:
             gateway_ip = IPAddress(gateway_ip)
-        self.dictionary[IPAddress(destination_ip)] = RoutingTableItem(gateway_ip, IPAddress(interface_ip))
+        destination_ip = IPAddress(destination_ip)
+        item = RoutingTableItem(gateway_ip, IPAddress(interface_ip))
+
+        if not append or destination_ip not in self.dictionary:
+            self.dictionary[destination_ip] = item
+            self.multipath.pop(destination_ip, None)
+            return
+
+        next_hops = self.next_hops(destination_ip)
+        if item not in next_hops:
+            self.multipath[destination_ip] = next_hops + [item]
 
-    def route_delete(self, destination_ip: IPAddress) -> None:
+    def route_delete(self, destination_ip: IPAddress, gateway_ip: Optional[IPAddress] = None) -> None:
         """
         Deletes a route from the routing table
         :param destination_ip: The destination IP address and netmask
+        :param gateway_ip: delete only the next hop with this gateway (None means the route with all of its next hops)
         :return: None
         """
         destination_ip = IPAddress(destination_ip)
         if destination_ip not in self.dictionary:
             raise RoutingTableError(f"Cannot remove route. it is not in the routing table {destination_ip}!!!")
 
-        del self.dictionary[destination_ip]
+        next_hops = self.next_hops(destination_ip)
+        remaining = [] if gateway_ip is None else [item for item in next_hops if item.gateway_ip != gateway_ip]
+        if len(remaining) == len(next_hops):
+            raise RoutingTableError(f"Cannot remove route. {destination_ip} is not routed via {gateway_ip}!!!")
+
+        self.multipath.pop(destination_ip, None)
+        if not remaining:
+            del self.dictionary[destination_ip]
+            return
+
+        self.dictionary[destination_ip] = remaining[0]
+        if len(remaining) > 1:
+            self.multipath[destination_ip] = remaining
+
+    def next_hops(self, destination_ip: IPAddress) -> List[RoutingTableItem]:
+        """
+        Returns the equal-cost next hops of a destination in the table (a single one for most of the destinations)
+        :param destination_ip: the destination IP address and netmask, exactly as it is in the table
+        """
+        return self.multipath.get(destination_ip, [self.dictionary[destination_ip]])
 
     def add_interface(self, interface_ip: IPAddress) -> None:
         """
@@ -139,23 +186,45 @@ class RoutingTable:
         self.route_delete(interface_ip.subnet())
         self.route_delete(IPAddress(interface_ip.string_ip + "/32"))
 
-    def __getitem__(self, item: Union[str, IPAddress]) -> TypeSafeRoutingTableItem:
+    def route(self, item: Union[str, IPAddress], flow_hash: Optional[int] = None) -> TypeSafeRoutingTableItem:
         """
-        allows the dictionary notation of dict[key].
-        :param item: The key. Has to be an `IPAddress` object.
-        :return: a `RoutingTableItem` object.
+        Finds the route to an IP address - the route of the longest prefix that contains it.
+        :param item: the IP address to route to
+        :param flow_hash: the hash of the flow of the routed packet (`packets.usefuls.ip.flow_hash`) - it picks one of
+            the equal-cost next hops of the route. If None, the first next hop is returned.
+        :return: a `TypeSafeRoutingTableItem` object.
         """
         requested_address = IPAddress(item)
         possible_addresses = list(filter(lambda destination: destination.is_same_subnet(requested_address), self.dictionary))
         if not possible_addresses:
             raise RoutingTableCouldNotRouteToIPAddress(f"IP: {requested_address!r}... ")  # Routing Table: \n{self!r}")
 
-        result = self.dictionary[max(possible_addresses, key=attrgetter("subnet_mask"))]
+        destination = max(possible_addresses, key=attrgetter("subnet_mask"))
+        result = self.dictionary[destination]
+        if flow_hash is not None and destination in self.multipath:
+            next_hops = self.multipath[destination]
+            result = next_hops[flow_hash % len(next_hops)]
+
         if isinstance(result.gateway_ip, str):  # is ON_LINK
             return TypeSafeRoutingTableItem(requested_address, result.interface_ip)
 
         return TypeSafeRoutingTableItem(result.gateway_ip, result.interface_ip)
 
+    def count_forwarded(self, route: TypeSafeRoutingTableItem) -> None:
+        """
+        Count a packet that was forwarded using the supplied route (the result of `route`)
+        """
+        next_hop = route.gateway_ip.string_ip, route.interface_ip.string_ip
+        self.next_hop_counters[next_hop] = self.next_hop_counters.get(next_hop, 0) + 1
+
+    def __getitem__(self, item: Union[str, IPAddress]) -> TypeSafeRoutingTableItem:
+        """
+        allows the dictionary notation of dict[key].
+        :param item: The key. Has to be an `IPAddress` object.
+        :return: a `RoutingTableItem` object.
+        """
+        return self.route(item)
+
     def __contains__(self, item: Union[str, IPAddress]) -> bool:
         """
         Returns whether or not the routing table knows how to route to the supplied ip address.
@@ -168,33 +237,51 @@ class RoutingTable:
 
     def __str__(self) -> str:
         """string representation of the routing table"""
-        return f"RoutingTable({self.dictionary}, default={self.default_gateway})"
+        return f"RoutingTable({self.dictionary}, multipath={self.multipath}, default={self.default_gateway})"
 
     def __repr__(self) -> str:
-        """allows a 'route print' """
+        """allows a 'route print' (equal-cost next hops are printed on the lines under the first one)"""
+        routes = linesep.join(
+            ''.join([(repr(key) if i == 0 else '').rjust(20, ' '), str(item.gateway_ip).rjust(20, ' '),
+                     str(item.interface_ip).rjust(20, ' ')])
+            for key in self.dictionary for i, item in enumerate(self.next_hops(key))
+        )
+        counters = linesep.join(
+            ''.join([gateway.rjust(20, ' '), interface.rjust(20, ' '), str(count).rjust(20, ' ')])
+            for (gateway, interface), count in self.next_hop_counters.items()
+        )
         return f"""
 ====================================================================
 Active Routes:
 Network Destination             Gateway           Interface  
-{linesep.join(''.join([repr(key).rjust(20, ' '), str(self.dictionary[key].gateway_ip).rjust(20, ' '), 
-                       str(self.dictionary[key].interface_ip).rjust(20, ' ')]) for key in self.dictionary)}	
+{routes}	
 
 Default Gateway:        {getattr(self.default_gateway, "ip_address", None)}
 ===================================================================
-"""
+""" + (f"""Forwarded Packets:
+            Next Hop           Interface             Packets
+{counters}
+===================================================================
+""" if self.next_hop_counters else "")
 
     def dict_save(self) -> Dict:
         """
         Save the routing table as a dict that can later be reassembled to a routing table
         :return:
         """
-        return {
+        saved = {
             "class": "RoutingTable",
             "dict": {
                 repr(ip): list(map(str, routing_table_item))
                 for ip, routing_table_item in self.dictionary.items()
             }
         }
+        if self.multipath:
+            saved["multipath"] = {
+                repr(ip): [list(map(str, routing_table_item)) for routing_table_item in next_hops]
+                for ip, next_hops in self.multipath.items()
+            }
+        return saved
 
     @classmethod
     def from_dict_load(cls, dict_: Dict) -> RoutingTable:
@@ -210,5 +297,7 @@ Default Gateway:        {getattr(self.default_gateway, "ip_address", None)}
 
         return cls(
             {IPAddress(ip): RoutingTableItem(ip_or_on_link(item[0]), IPAddress(item[1]))
-             for ip, item in dict_["dict"].items()}
+             for ip, item in dict_["dict"].items()},
+            {IPAddress(ip): [RoutingTableItem(ip_or_on_link(item[0]), IPAddress(item[1])) for item in next_hops]
+             for ip, next_hops in dict_.get("multipath", {}).items()},
         )
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from NetSym.computing.internals.network_data_structures.token_bucket import TokenBucket
+from NetSym.consts import COMPUTER, T_Time
+from NetSym.gui.main_loop import MainLoop
+
+if TYPE_CHECKING:
+    from NetSym.computing.internals.network_interfaces.network_interface import NetworkInterface
+
+
+STORM_CONTROL = COMPUTER.STORM_CONTROL
+TRAFFIC_TYPES = (STORM_CONTROL.TRAFFIC_TYPES.BROADCAST, STORM_CONTROL.TRAFFIC_TYPES.MULTICAST, STORM_CONTROL.TRAFFIC_TYPES.UNKNOWN_UNICAST)
+
+
+@dataclass
+class StormControlPort:
+    """
+    The storm control state of a single port of the switch
+    """
+    buckets:             Dict[str, TokenBucket] = field(default_factory=dict)
+    drop_counts:         Dict[str, int]         = field(default_factory=lambda: dict.fromkeys(TRAFFIC_TYPES, 0))
+    shutdown_time:       Optional[T_Time]       = None  # when the port was shut down (None if it is enabled)
+    shutdown_drop_count: int                    = 0  # frames of any kind that were dropped while the port was shut down
+
+    @property
+    def is_shut_down(self) -> bool:
+        return self.shutdown_time is not None
+
+
+class StormControl:
+    """
+    Limits the frames that a switch floods, so a switching loop or a burst of broadcasts does not multiply without limit.
+    Every port has a token bucket for each kind of flooded traffic (broadcast, multicast and unknown unicast) that is
+        received on it. Frames above the threshold are dropped and counted.
+    If the action is `SHUTDOWN`, a port that crosses a threshold is disabled (like an err-disabled port) until
+        `recovery_time` passes.
+    """
+    def __init__(self,
+                 rate: Optional[float] = STORM_CONTROL.RATE,
+                 burst: int = STORM_CONTROL.BURST,
+                 action: str = STORM_CONTROL.ACTION,
+                 recovery_time: Optional[T_Time] = STORM_CONTROL.SHUTDOWN_RECOVERY_TIME) -> None:
+        """
+        Create the storm control of a switch where all of the kinds of traffic have the same threshold
+        :param rate: the amount of frames of each kind that a port may receive every second (None means no limit)
+        :param burst: the amount of frames of each kind that a port may receive at once
+        :param action: `ACTIONS.DROP` or `ACTIONS.SHUTDOWN`
+        :param recovery_time: how long a port that was shut down stays down (None means until `enable` is called)
+        """
+        self.thresholds: Dict[str, Optional[Tuple[float, int]]] = \
+            dict.fromkeys(TRAFFIC_TYPES, None if rate is None else (rate, burst))
+        self.action = action
+        self.recovery_time = recovery_time
+
+        self.ports: Dict[NetworkInterface, StormControlPort] = {}
+        self.shutdown_count = 0
+
+    def __getitem__(self, port: NetworkInterface) -> StormControlPort:
+        return self.ports.setdefault(port, StormControlPort())
+
+    def configure(self, traffic_type: str, rate: Optional[float], burst: int = STORM_CONTROL.BURST) -> None:
+        """
+        Set the threshold of a single kind of traffic for all of the ports (the buckets start full)
+        :param rate: frames per second, or None to stop limiting this kind of traffic
+        """
+        self.thresholds[traffic_type] = None if rate is None else (rate, burst)
+        for port in self.ports.values():
+            port.buckets.pop(traffic_type, None)
+
+    def is_shut_down(self, port: NetworkInterface) -> bool:
+        """
+        Whether or not the port was shut down by the storm control (and did not recover yet)
+        """
+        storm_control_port = self.ports.get(port)
+        shutdown_time = storm_control_port.shutdown_time if storm_control_port is not None else None
+        if shutdown_time is None:
+            return False
+
+        if self.recovery_time is not None and MainLoop.get_time_since(shutdown_time) >= self.recovery_time:
+            self.enable(port)
+            return False
+        return True
+
+    def enable(self, port: NetworkInterface) -> None:
+        """
+        Enable a port that was shut down, with full buckets
+        """
+        storm_control_port = self[port]
+        storm_control_port.shutdown_time = None
+        storm_control_port.buckets.clear()
+
+    def allow(self, port: NetworkInterface, traffic_type: str) -> bool:
+        """
+        Decide whether or not a flooded frame that was received on the port may be switched.
+        Frames that are not allowed are counted, and with the `SHUTDOWN` action the port is shut down.
+        """
+        threshold = self.thresholds[traffic_type]
+        if threshold is None:
+            return True
+
+        storm_control_port = self[port]
+        if traffic_type not in storm_control_port.buckets:
+            storm_control_port.buckets[traffic_type] = TokenBucket(*threshold)
+        if storm_control_port.buckets[traffic_type].take():
+            return True
+
+        storm_control_port.drop_counts[traffic_type] += 1
+        if self.action == STORM_CONTROL.ACTIONS.SHUTDOWN and not storm_control_port.is_shut_down:
+            storm_control_port.shutdown_time = MainLoop.get_time()
+            self.shutdown_count += 1
+        return False
+
+    def __repr__(self) -> str:
+        thresholds = ' '.join(f"{traffic_type}: {'-' if threshold is None else f'{threshold[0]}/s'}"
+                              for traffic_type, threshold in self.thresholds.items())
+        ports = '\n'.join(
+            f"{getattr(port, 'name', port): <10} {'shutdown' if storm_control_port.is_shut_down else 'forwarding': <12} dropped: " +
+            ' '.join(f"{traffic_type}: {count}" for traffic_type, count in storm_control_port.drop_counts.items()) +
+            f" while shut down: {storm_control_port.shutdown_drop_count}"
+            for port, storm_control_port in self.ports.items()
+        )
+        return f"action: {self.action} {thresholds}\n{ports}"
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Optional, Union
+
+from NetSym.consts import PROTOCOLS
+
+
+class TCPReceiveBuffer:
+    """
+    The data that a TCP connection received and the process that owns the socket did not read yet.
+    The buffer has a capacity in bytes - the receiving side advertises the space that is left in it as its receive
+        window, so the sender never sends more than the process can hold.
+
+    The data is kept in the pieces it arrived in. A read that does not take a whole piece only moves an offset into it,
+        so the unread remainder is never copied.
+    """
+    def __init__(self, capacity: int = PROTOCOLS.TCP.RECEIVE_BUFFER_SIZE) -> None:
+        """
+        Create an empty buffer
+        :param capacity: the amount of bytes the buffer can hold
+        """
+        self.capacity = capacity
+        self._pieces: Deque[memoryview] = deque()
+        self._head_offset = 0  # how much of the first piece was already read
+        self._length = 0
+
+    def __len__(self) -> int:
+        """The amount of bytes that were not read yet"""
+        return self._length
+
+    @property
+    def free_space(self) -> int:
+        return max(0, self.capacity - self._length)
+
+    def append(self, data: Union[bytes, memoryview]) -> None:
+        """
+        Add data that was received (in-order) to the end of the buffer
+        """
+        if not data:
+            return
+        self._pieces.append(data if isinstance(data, memoryview) else memoryview(data))
+        self._length += len(data)
+
+    def read(self, count: Optional[int] = None) -> bytes:
+        """
+        Take data out of the start of the buffer
+        :param count: the maximum amount of bytes to read (None means everything)
+        :return: the data that was read
+        """
+        if count is None or count >= self._length:
+            count = self._length
+
+        read = []
+        left = count
+        while left:
+            piece = self._pieces[0]
+            end = min(len(piece), self._head_offset + left)
+            read.append(piece[self._head_offset:end])
+            left -= end - self._head_offset
+
+            if end == len(piece):
+                self._pieces.popleft()
+                self._head_offset = 0
+            else:
+                self._head_offset = end
+
+        self._length -= count
+        return b''.join(read)
+
+    def clear(self) -> None:
+        self._pieces.clear()
+        self._head_offset = 0
+        self._length = 0
+
+    def __repr__(self) -> str:
+        return f"TCPReceiveBuffer({self._length}/{self.capacity} bytes)"
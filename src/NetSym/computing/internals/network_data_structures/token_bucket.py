@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from NetSym.consts import T_Time
+from NetSym.gui.main_loop import MainLoop
+
+
+@dataclass
+class TokenBucket:
+    """
+    Allows `rate` events every second on average, and up to `burst` events at once.
+    The bucket is refilled lazily - only when an event asks for a token.
+    """
+    rate:             float
+    burst:            int
+    tokens:           float            = field(init=False)
+    last_refill_time: Optional[T_Time] = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        self.tokens = self.burst
+
+    def _refill(self) -> None:
+        now = MainLoop.get_time()
+        if self.last_refill_time is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill_time) * self.rate)
+        self.last_refill_time = now
+
+    def take(self) -> bool:
+        """
+        Take a single token out of the bucket
+        :return: whether or not there was a token to take
+        """
+        self._refill()
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Dict, Type
+
+from NetSym.consts import PROTOCOLS, T_Time
+from NetSym.exceptions import UnknownCongestionControlError
+from NetSym.gui.main_loop import MainLoop
+
+
+class CongestionControl(ABC):
+    """
+    Decides how many packets a TCP connection may have in flight (the congestion window - `cwnd`), by the ACKs and
+    the losses it sees.
+
+    All of the algorithms start with slow start (the window grows by a packet for each ACKed packet) until the window reaches
+    `ssthresh`. Then they move to congestion avoidance, which is what the subclasses implement.
+    On a loss the window is multiplicatively decreased, and on a retransmission timeout it goes back to a single packet.
+    The windows are measured in packets, like the rest of the TCP implementation.
+    """
+    name: str
+
+    def __init__(self,
+                 initial_window: float = PROTOCOLS.TCP.CONGESTION_CONTROL.INITIAL_WINDOW,
+                 initial_ssthresh: float = PROTOCOLS.TCP.MAX_WINDOW_SIZE) -> None:
+        self.cwnd = float(initial_window)
+        self.ssthresh = float(initial_ssthresh)
+
+    @property
+    def is_in_slow_start(self) -> bool:
+        return self.cwnd < self.ssthresh
+
+    def on_ack(self, acked_count: int) -> None:
+        """
+        Called when new packets are ACKed - grows the window
+        :param acked_count: the amount of packets that were ACKed
+        """
+        for _ in range(acked_count):
+            if self.is_in_slow_start:
+                self.cwnd += 1
+            else:
+                self._congestion_avoidance_on_ack()
+
+    @abstractmethod
+    def _congestion_avoidance_on_ack(self) -> None:
+        """
+        Grows the window for a single ACKed packet when not in slow start
+        """
+
+    @abstractmethod
+    def _decreased_window(self, flight_size: int) -> float:
+        """
+        Returns the new `ssthresh` after a loss
+        :param flight_size: the amount of packets that were in flight when the loss was detected
+        """
+
+    def on_loss(self, flight_size: int) -> None:
+        """
+        Called when a lost packet is detected (but ACKs still arrive) - multiplicatively decreases the window
+        """
+        self.ssthresh = max(self._decreased_window(flight_size), PROTOCOLS.TCP.CONGESTION_CONTROL.MIN_SSTHRESH)
+        self.cwnd = self.ssthresh
+
+    def on_timeout(self, flight_size: int) -> None:
+        """
+        Called when the retransmission timer expires - nothing is going through, so start from scratch
+        """
+        self.ssthresh = max(self._decreased_window(flight_size), PROTOCOLS.TCP.CONGESTION_CONTROL.MIN_SSTHRESH)
+        self.cwnd = 1.
+
+    def __repr__(self) -> str:
+        return f"{self.name} cwnd: {self.cwnd:.2f} ssthresh: {self.ssthresh:.2f}"
+
+
+class RenoCongestionControl(CongestionControl):
+    """
+    The classic TCP Reno - the window grows by a single packet every round trip and is halved on a loss.
+    """
+    name = PROTOCOLS.TCP.CONGESTION_CONTROL.RENO
+
+    def _congestion_avoidance_on_ack(self) -> None:
+        self.cwnd += 1 / self.cwnd
+
+    def _decreased_window(self, flight_size: int) -> float:
+        return flight_size * PROTOCOLS.TCP.CONGESTION_CONTROL.RENO_BETA
+
+
+class CubicCongestionControl(CongestionControl):
+    """
+    TCP CUBIC - the window grows as a cubic function of the time since the last loss, so it quickly gets back to the
+    window where the loss happened (`w_max`), stays around it, and only then probes for more.
+        W(t) = C * (t - K)^3 + w_max        where K = cbrt(w_max * (1 - beta) / C)
+    """
+    name = PROTOCOLS.TCP.CONGESTION_CONTROL.CUBIC
+
+    def __init__(self,
+                 initial_window: float = PROTOCOLS.TCP.CONGESTION_CONTROL.INITIAL_WINDOW,
+                 initial_ssthresh: float = PROTOCOLS.TCP.MAX_WINDOW_SIZE) -> None:
+        super(CubicCongestionControl, self).__init__(initial_window, initial_ssthresh)
+        self.w_max = 0.
+        self.epoch_start: T_Time = MainLoop.get_time()
+
+    @property
+    def k(self) -> float:
+        """The time it takes the window to grow back to `w_max` after a loss"""
+        return float((self.w_max * (1 - PROTOCOLS.TCP.CONGESTION_CONTROL.CUBIC_BETA) / PROTOCOLS.TCP.CONGESTION_CONTROL.CUBIC_C) ** (1 / 3))
+
+    def target_window(self) -> float:
+        """The window the cubic function says we should have right now"""
+        t = MainLoop.get_time_since(self.epoch_start)
+        return PROTOCOLS.TCP.CONGESTION_CONTROL.CUBIC_C * ((t - self.k) ** 3) + self.w_max
+
+    def _congestion_avoidance_on_ack(self) -> None:
+        target = self.target_window()
+        if target > self.cwnd:
+            self.cwnd += (target - self.cwnd) / self.cwnd
+        else:
+            self.cwnd += 0.01 / self.cwnd  # very slowly probe around `w_max`
+
+    def _decreased_window(self, flight_size: int) -> float:
+        self.w_max = max(self.cwnd, float(flight_size))
+        self.epoch_start = MainLoop.get_time()
+        return self.w_max * PROTOCOLS.TCP.CONGESTION_CONTROL.CUBIC_BETA
+
+
+CONGESTION_CONTROL_ALGORITHMS: Dict[str, Type[CongestionControl]] = {
+    PROTOCOLS.TCP.CONGESTION_CONTROL.RENO:  RenoCongestionControl,
+    PROTOCOLS.TCP.CONGESTION_CONTROL.CUBIC: CubicCongestionControl,
+}
+
+
+def get_congestion_control(name: str = PROTOCOLS.TCP.CONGESTION_CONTROL.DEFAULT) -> CongestionControl:
+    """
+    Returns a new `CongestionControl` object of the algorithm with the given name
+    """
+    try:
+        return CONGESTION_CONTROL_ALGORITHMS[name]()
+    except KeyError:
+        raise UnknownCongestionControlError(f"No congestion control named '{name}'! only {list(CONGESTION_CONTROL_ALGORITHMS)}")
@@ -2,32 +2,42 @@ from __future__ import annotations
 
 import random
 from abc import abstractmethod
+from bisect import bisect_right, insort
 from collections import deque
 from dataclasses import dataclass, astuple
-from operator import attrgetter
-from typing import Optional, List, TYPE_CHECKING, Iterable, Union, Tuple, Deque
+from typing import Optional, List, TYPE_CHECKING, Iterable, Union, Tuple, Deque, Dict, Any
+
+from scapy.packet import Raw
 
 from NetSym.address.ip_address import IPAddress
 from NetSym.address.mac_address import MACAddress
 from NetSym.computing.internals.processes.abstracts.process import Process, Timeout, ReturnedPacket, T_ProcessCode, WaitingFor
 from NetSym.computing.internals.processes.abstracts.process_internal_errors import ProcessInternalError
+from NetSym.computing.internals.processes.abstracts.tcp_congestion_control import get_congestion_control
+from NetSym.computing.internals.processes.abstracts.tcp_rtt_estimator import RTTEstimator
 from NetSym.consts import OPCODES, T_Time, COMPUTER, PORTS, PROTOCOLS, TCPFlag
 from NetSym.exceptions import TCPDataLargerThanMaxSegmentSize, ThisValueShouldNeverBeNone
 from NetSym.gui.main_loop import MainLoop
 from NetSym.packets.all import TCP
 from NetSym.packets.packet import Packet
-from NetSym.usefuls.funcs import insort, raise_on_none
-from NetSym.usefuls.funcs import split_by_size
+from NetSym.usefuls.funcs import raise_on_none
 
 if TYPE_CHECKING:
+    from typing import Protocol
     from NetSym.computing.computer import Computer
 
+    class ReceivedData(Protocol):
+        """Anything the received data can be appended to - a list, or the receive buffer of a socket"""
+        def append(self, item: Any) -> None: ...
+
 
 @dataclass
 class NotAckedPacket:
-    packet:       Packet
-    sending_time: T_Time
-    is_sent:      bool
+    packet:            Packet
+    sending_time:      T_Time
+    is_sent:           bool
+    was_retransmitted: bool = False
+    has_sent_copies:   bool = False  # the copies that were sent share the layers of the packet - so it should not be modified
 
 
 @dataclass
@@ -49,6 +59,21 @@ def get_tcp_packet_data_length(tcp_packet: Packet) -> int:
     return len(tcp_packet["TCP"].payload.build())
 
 
+def get_tcp_packet_payload(tcp_packet: Packet) -> bytes:
+    """
+    Returns the data of the TCP packet (without building it, if it is raw data)
+    """
+    payload = tcp_packet["TCP"].payload
+    return bytes(payload.load) if isinstance(payload, Raw) else bytes(payload.build())
+
+
+def get_tcp_packet_end_sequence_number(tcp_packet: Packet) -> int:
+    """
+    Returns the sequence number right after the data of the TCP packet
+    """
+    return int(tcp_packet["TCP"].sequence_number + get_tcp_packet_data_length(tcp_packet))
+
+
 def is_number_acking_packet(ack_number: int, packet: Packet) -> bool:
     """
     Receives an ACK number and a packet and returns whether or not the packet is ACKed in that ACK
@@ -86,7 +111,9 @@ class TCPProcess(Process):
                  dst_port: Optional[int] = None,
                  src_port: Optional[int] = None,
                  is_client: bool = True,
-                 mss: int = PROTOCOLS.TCP.MAX_MSS) -> None:
+                 mss: int = PROTOCOLS.TCP.MAX_MSS,
+                 congestion_control: str = PROTOCOLS.TCP.CONGESTION_CONTROL.DEFAULT,
+                 no_delay: bool = False) -> None:
         """
         Initiates a TCP process.
         :param computer: the `Computer` running the process
@@ -95,6 +122,8 @@ class TCPProcess(Process):
         (If unknown at initiation - None)
         :param is_client: whether or not this computer sends the initial SYN packet.
         :param src_port: the source port of the process (If unknown - None - and it will be randomized)
+        :param congestion_control: the name of the congestion control algorithm of the connection (reno, cubic...)
+        :param no_delay: whether or not small segments are sent right away (without coalescing them - Nagle's algorithm)
         """
         super(TCPProcess, self).__init__(pid, computer)
 
@@ -108,14 +137,26 @@ class TCPProcess(Process):
         self.sequence_number = 0  # randint(0, TCP_MAX_SEQUENCE_NUMBER)
         # self.next_sequence_number = 1 + self.sequence_number
 
+        self.received_syn: Optional[Packet] = None  # a SYN that was received for this process before it started
+
         self.receiving_window = ReceivingWindow()
-        self.sending_window = SendingWindow(self.pid, self.computer)
+        self.sending_window = SendingWindow(self.pid, self.computer, congestion_control=congestion_control)
         self.mss = mss
+        self.no_delay = no_delay
+
+        self.send_buffer = bytearray()  # the data that was sent by the process and was not divided into segments yet
+        self.send_buffer_offset = 0  # where the data that was not divided yet starts in the `send_buffer`
+
+        self.delayed_ack_count = 0  # in-order segments that were received and not ACKed yet
+        self.delayed_ack_time: Optional[T_Time] = None  # when the first of them was received
+
+        self.advertised_window: Optional[int] = None  # the receive window in the last packet that was sent
+        self.out_of_window_drop_count = 0  # segments that were dropped since they did not fit in the receive window
 
         for signum in COMPUTER.PROCESSES.SIGNALS.KILLING_SIGNALS:
             self.signal_handlers[signum] = self.kill_signal_handler
 
-    def _create_packet(self, flags: Union[TCPFlag, int], data: str = '', is_retransmission: bool = False) -> Packet:
+    def _create_packet(self, flags: Union[TCPFlag, int], data: Union[str, bytes] = '', is_retransmission: bool = False) -> Packet:
         """
         Creates a full packet that contains TCP with all of the appropriate fields according to the state of
         this process
@@ -130,35 +171,73 @@ class TCPProcess(Process):
                                            sequence_number=self.sequence_number,
                                            flags=flags,
                                            ack_number=self.receiving_window.ack_number,
-                                           window_size=self.sending_window.window_size,
+                                           window_size=self.receive_window,
                                            options=[("MSS", self.mss)],
                                        ) / data
                                        )
+        self.advertised_window = packet["TCP"].window_size
         packet["TCP"].is_retransmission = is_retransmission
         self.sequence_number += get_tcp_packet_data_length(packet)
         return packet
 
-    def _send_ack_for(self, packet: Packet, additional_flags: Optional[TCPFlag] = None) -> None:
+    def receive_buffer_free_space(self) -> int:
         """
-        Creates and sends an ACK packet for the given `Packet` that was received from the other side.
+        The amount of received data the process can still hold before it reads anything.
+        Processes that deliver the data into a bounded buffer should override this.
         """
-        is_retransmission = False
-        additional_flags = OPCODES.TCP.NO_FLAGS if additional_flags is None else additional_flags
+        return PROTOCOLS.TCP.MAX_RECEIVE_WINDOW
+
+    @property
+    def receive_window(self) -> int:
+        """
+        The amount of bytes after the ACK number that the other side is allowed to send (rwnd).
+        In-order data that was not delivered yet still takes space in the buffer.
+        """
+        free_space = self.receive_buffer_free_space() - self.receiving_window.undelivered_in_order_length
+        return max(0, min(free_space, PROTOCOLS.TCP.MAX_RECEIVE_WINDOW))
+
+    def _is_in_receive_window(self, packet: Packet) -> bool:
+        """Whether or not all of the data of the packet fits in the space that is left for it"""
+        return get_tcp_packet_end_sequence_number(packet) <= self.receiving_window.ack_number + self.receive_window
+
+    def _send_window_update_if_needed(self) -> None:
+        """
+        If the window that was last advertised was too small for a full segment and the process read enough data since -
+        tells the other side that it may send again, instead of letting it wait for a probe.
+        """
+        if self.advertised_window is None or self.dst_mac is None or self.advertised_window >= self.mss:
+            return
+
+        if self.receive_window >= self.mss:
+            self._send_ack()
 
+    def _update_ack_number_with(self, packet: Packet) -> bool:
+        """
+        Updates the ACK number (and the SACK blocks) of the receiving window with a packet that was received from the
+        other side.
+        :return: whether or not the packet is in-order (the next one that was expected)
+        """
         if packet["TCP"].sequence_number == self.receiving_window.ack_number:
             # ^ the received packet is in-order
             self.receiving_window.ack_number += get_tcp_packet_data_length(packet)
+            self.receiving_window.merge_sack_blocks()  # it might have filled a hole before SACKed data
+            return True
 
-        elif packet["TCP"].sequence_number < self.receiving_window.ack_number:
-            # ^ the packet was already received (lost ACK)
-            is_retransmission = True
-
-        elif packet["TCP"].sequence_number > self.receiving_window.ack_number:
+        if packet["TCP"].sequence_number > self.receiving_window.ack_number:
             # ^ a sequence number was jumped (lost packet)
-            is_retransmission = True
             self.receiving_window.add_to_sack(packet)
             self.receiving_window.merge_sack_blocks()
 
+        # ^ otherwise the packet was already received (lost ACK)
+        return False
+
+    def _send_ack(self, additional_flags: Optional[TCPFlag] = None, is_retransmission: bool = False) -> None:
+        """
+        Creates and sends an ACK packet with the current ACK number and SACK blocks of the receiving window.
+        This ACKs all of the segments whose ACK was delayed as well.
+        """
+        additional_flags = OPCODES.TCP.NO_FLAGS if additional_flags is None else additional_flags
+
         ack = self._create_packet((OPCODES.TCP.ACK | additional_flags), is_retransmission=is_retransmission)
         ack["TCP"].parsed_options.SACK = self.receiving_window.get_sack_blocks_as_tuple()
 
@@ -167,6 +246,50 @@ class TCPProcess(Process):
         else:
             self.sending_window.add_no_wait(ack)
 
+        self._clear_delayed_ack()
+
+    def _send_ack_for(self, packet: Packet, additional_flags: Optional[TCPFlag] = None) -> None:
+        """
+        Creates and sends an ACK packet for the given `Packet` that was received from the other side.
+        """
+        is_in_order = self._update_ack_number_with(packet)
+        self._send_ack(additional_flags, is_retransmission=not is_in_order)
+
+    def _delay_ack_for(self, packet: Packet) -> None:
+        """
+        Handles the ACK of a data segment that was received from the other side.
+        In-order segments are not ACKed right away - a single cumulative ACK is sent for every
+        `DELAYED_ACK.SEGMENTS` of them, or when the first of them waited `DELAYED_ACK.TIMEOUT`, or it is piggybacked on
+        the data that is sent to the other side.
+        Segments that are out-of-order (or fill a hole) are ACKed immediately, so the sender learns about the loss.
+        """
+        had_holes = bool(self.receiving_window.sack_blocks)
+        is_in_order = self._update_ack_number_with(packet)
+
+        if not is_in_order or had_holes or self.receiving_window.sack_blocks:
+            self._send_ack(is_retransmission=not is_in_order)
+            return
+
+        self.delayed_ack_count += 1
+        if self.delayed_ack_time is None:
+            self.delayed_ack_time = MainLoop.get_time()
+
+    def _send_delayed_ack_if_needed(self) -> None:
+        """
+        Sends a cumulative ACK for the in-order segments that were received, if there are enough of them or if
+        they waited too long.
+        """
+        if not self.delayed_ack_count or self.delayed_ack_time is None:
+            return
+
+        if self.delayed_ack_count >= PROTOCOLS.TCP.DELAYED_ACK.SEGMENTS or \
+                MainLoop.get_time_since(self.delayed_ack_time) >= PROTOCOLS.TCP.DELAYED_ACK.TIMEOUT:
+            self._send_ack()
+
+    def _clear_delayed_ack(self) -> None:
+        self.delayed_ack_count = 0
+        self.delayed_ack_time = None
+
     def _my_tcp_packets(self, packet: Packet) -> bool:
         """
         This is a tester function that checks if a packet is for this TCP session.
@@ -205,12 +328,15 @@ class TCPProcess(Process):
         """
         self.dst_port = packet["TCP"].src_port
         self.dst_ip = packet["IP"].src_ip
-        self.sending_window.window_size = min(packet["TCP"].window_size, self.sending_window.window_size)
         self.mss = min(packet["TCP"].parsed_options.MSS, self.mss)
 
     def _acknowledge_with_packet(self, packet: Packet) -> None:
         """
         Takes in an ACk number and releases all of the packets that are ACKed by it.
+        Packets that are selectively ACKed (SACK) are released as well, and the sending window learns which packets are
+        missing on the other side (the holes between them).
+        An ACK that does not ACK anything new (or open the receive window) is a duplicate ACK - which means a packet was
+        probably lost.
         :param packet: a packet that contains the ACK information to remove sent packets from my sending window.
         """
         ack_number = packet["TCP"].ack_number
@@ -223,13 +349,29 @@ class TCPProcess(Process):
         self.sending_window.slide_window(acked_count)
 
         sack_blocks = ReceivingWindow.get_sack_blocks_from_tuple(getattr(packet["TCP"].parsed_options, 'SACK', ()))
-        if not isinstance(sack_blocks, list) or not sack_blocks:
-            return
+        if isinstance(sack_blocks, list) and sack_blocks:
+            for not_acked_packet in list(self.sending_window.window):
+                for block in sack_blocks:
+                    if (block.left <= not_acked_packet.packet["TCP"].sequence_number) and is_number_acking_packet(block.right, not_acked_packet.packet):
+                        self.sending_window.window.remove(not_acked_packet)
+                        break
+            self.sending_window.update_highest_sacked(max(block.right for block in sack_blocks))
 
-        for not_acked_packet in list(self.sending_window.window):
-            for block in sack_blocks:
-                if (block.left <= not_acked_packet.packet["TCP"].sequence_number) and is_number_acking_packet(block.right, not_acked_packet.packet):
-                    self.sending_window.window.remove(not_acked_packet)
+        is_window_update = self.sending_window.update_receive_window(ack_number, packet["TCP"].window_size)
+        if acked_count:
+            self.sending_window.on_new_ack(ack_number)
+        elif self._is_duplicate_ack(packet) and not is_window_update:
+            self.sending_window.on_duplicate_ack()
+
+    def _is_duplicate_ack(self, packet: Packet) -> bool:
+        """
+        Whether or not the packet is a pure ACK which does not ACK anything new - while there are packets in flight
+        """
+        return bool(
+            packet["TCP"].flags == OPCODES.TCP.ACK and
+            packet["TCP"].ack_number == self.sending_window.last_ack_number and
+            self.sending_window.flight_size > 0
+        )
 
     def on_connection_reset(self) -> None:
         """
@@ -265,9 +407,10 @@ class TCPProcess(Process):
     def _server_hello_handshake(self) -> T_ProcessCode:
         """
         The initial handshake on the server side. waits for syn, sends syn ack waits for ack
+        If the SYN was already received (by a listening socket) - does not wait for it.
         :return:
         """
-        tcp_syn_list: List[Packet] = []
+        tcp_syn_list: List[Packet] = [] if self.received_syn is None else [self.received_syn]
         while not tcp_syn_list or \
                 not isinstance(tcp_syn_list[0], Packet) or \
                 "TCP" not in tcp_syn_list[0] or \
@@ -291,6 +434,7 @@ class TCPProcess(Process):
         """
         if initiate:
             self.sending_window.clear()
+            self._clear_send_buffer()
             self.sending_window.add_waiting(self._create_packet(OPCODES.TCP.FIN))
             fin_ack_list: List[Packet] = []
             while not fin_ack_list or \
@@ -317,42 +461,74 @@ class TCPProcess(Process):
         This is mostly for servers that serve multiple clients in the same process. It resets everything and gets ready
         to serve another client.
         """
-        self.sending_window.clear()
+        self.sending_window.reset()
         self.receiving_window.clear()
+        self._clear_send_buffer()
+        self.received_syn = None
         self.sequence_number = 0
         self.receiving_window.ack_number = 0
+        self.advertised_window = None
+        self._clear_delayed_ack()
         self.dst_port = None
         self.dst_mac = None
 
-    def send(self, data, packet_constructor=lambda d: d) -> None:
+    def send(self, data: Union[str, bytes, memoryview]) -> None:
         """
         Takes in some data and sends it over TCP as soon as possible.
+        The data is only buffered here. It is divided into segments when the sending window has room for them.
         :param data: the piece of the data that the child process class wants to send over TCP
-        :param packet_constructor: a function is applied to the data after it is divided to TCP segments and before
-        it is sent.
         :return: None
         """
-        if isinstance(data, str):
-            for data_part in split_by_size(data, self.mss):
-                self.send_no_split(packet_constructor(data_part))
-        else:
-            self.send_no_split(data)
+        self.send_buffer += data.encode() if isinstance(data, str) else data
 
-    def send_no_split(self, data: str) -> None:
+    def send_no_split(self, data: Union[str, bytes]) -> None:
         """
+        Sends the data in a single segment, right after all of the data that was sent before it.
         This function assumes that the length of the data is not larger than the MSS of the process.
         If it is larger, raises an exception.
         """
         if len(data) > self.mss:
             raise TCPDataLargerThanMaxSegmentSize("To split string data, use the `TCPProcess.send` method")
+        self._segment_send_buffer(force=True)
         self.sending_window.add_waiting(self._create_packet(OPCODES.TCP.PSH, data))
 
+    @property
+    def buffered_data_length(self) -> int:
+        """The amount of bytes that were sent and not yet divided into segments"""
+        return len(self.send_buffer) - self.send_buffer_offset
+
+    def _segment_send_buffer(self, force: bool = False) -> None:
+        """
+        Divides the buffered data into segments of the MSS - only as many as the sending window has room for.
+        The segments are sliced out of the buffer, so each byte is copied once, into the packet.
+        A segment that is smaller than the MSS is only sent when nothing else is in the sending window - so many small writes
+        are coalesced into a single segment (Nagle's algorithm). Unless `no_delay` is set.
+        :param force: divide all of the data, even if there is no room for it and the last segment is small.
+        """
+        offset = self.send_buffer_offset
+        with memoryview(self.send_buffer) as buffer:
+            while offset < len(buffer) and (force or self.sending_window.has_room()):
+                segment_length = min(self.mss, len(buffer) - offset)
+                if segment_length < self.mss and not (force or self.no_delay or self.sending_window.is_empty()):
+                    break
+                self.sending_window.add_waiting(self._create_packet(OPCODES.TCP.PSH, bytes(buffer[offset:offset + segment_length])))
+                offset += segment_length
+
+        self.send_buffer_offset = offset
+        if self.send_buffer_offset * 2 >= len(self.send_buffer):
+            del self.send_buffer[:self.send_buffer_offset]  # only move the rest of the data when most of it is gone
+            self.send_buffer_offset = 0
+
+    def _clear_send_buffer(self) -> None:
+        self.send_buffer.clear()
+        self.send_buffer_offset = 0
+
     def is_done_transmitting(self) -> bool:
         """
         Returns whether or not the process has finished transmitting all of the desired data.
         :return: bool
         """
-        return self.sending_window.nothing_to_send()
+        return self.sending_window.nothing_to_send() and not self.buffered_data_length
 
     def _session_timeout(self) -> bool:
         """Returns whether or not the connection should be timed-out"""
@@ -360,7 +536,7 @@ class TCPProcess(Process):
         # return MainLoop.instance.time_since(self.last_packet_sent_time) >= PROTOCOLS.TCP.MAX_UNUSED_CONNECTION_TIME
 
     def handle_tcp_and_receive(self,
-                               received_data: List,
+                               received_data: ReceivedData,
                                is_blocking: bool = False,
                                insert_flag_packets_to_received_data: bool = False) -> T_ProcessCode:
         """
@@ -385,8 +561,12 @@ class TCPProcess(Process):
 
             self.receiving_window.add_data_and_remove_from_window(received_data)
 
+            self._segment_send_buffer()
             self.sending_window.fill_window()  # if the amount of sent packets is not the window size, fill it up
-            self.sending_window.send_window()  # send the packets that were not yet sent
+            if self.sending_window.send_window(self.receiving_window.ack_number, self.receive_window):  # send the packets that were not yet sent
+                self._clear_delayed_ack()  # the ACK was piggybacked on the sent data
+            self._send_delayed_ack_if_needed()
+            self._send_window_update_if_needed()
             self.sending_window.retransmit_unacked()  # send the packets that were sent a long time ago and not ACKed.
 
             if not is_blocking:
@@ -394,7 +574,7 @@ class TCPProcess(Process):
 
     def _handle_packet(self,
                        packet: Packet,
-                       received_data: List,
+                       received_data: ReceivedData,
                        insert_flag_packets_to_received_data: bool) -> T_ProcessCode:
         """
         Receives a packet and handles it, sends ack, learns, and adds the data to a given `received_data` list.
@@ -406,9 +586,14 @@ class TCPProcess(Process):
         tcp_layer = packet["TCP"]
 
         if OPCODES.TCP.PSH & tcp_layer.flags:
-            if not is_number_acking_packet(self.receiving_window.ack_number, packet):
-                self.receiving_window.add_packet(packet)  # if the packet was not received already
-            self._send_ack_for(packet)
+            if is_number_acking_packet(self.receiving_window.ack_number, packet):
+                self._delay_ack_for(packet)  # the packet was received already
+            elif self._is_in_receive_window(packet):
+                self.receiving_window.add_packet(packet)
+                self._delay_ack_for(packet)
+            else:
+                self.out_of_window_drop_count += 1
+                self._send_ack()  # the other side learns the current window
 
         if (OPCODES.TCP.SYN & tcp_layer.flags) or (OPCODES.TCP.FIN | OPCODES.TCP.ACK) == tcp_layer.flags:
             if insert_flag_packets_to_received_data:
@@ -450,60 +635,191 @@ class SendingWindow:
     A class that represents the sending window in a TCP process.
     It has three queues, the packets that are not yet sent, the packets that are sent and not yet acked and a list of
     `sent` packets that need to be physically sent one by one (in the `TCP_SENDING_INTERVAL` time gaps).
+
+    The amount of packets in the window is the smaller of `window_size` and the congestion window, which the
+    `CongestionControl` algorithm decides by the ACKs and losses of the connection.
+    Data is also only sent up to the receive window the other side advertised (the free space in its receive buffer).
+    While that window is closed, a single segment is sent every retransmission timeout to probe it.
+    Packets are retransmitted after the retransmission timeout that the `RTTEstimator` computes from the measured RTT.
+
+    Packets are also retransmitted before the timeout, once three duplicate ACKs arrive (fast retransmit).
+    Then the window is in loss recovery until everything that was in flight is ACKed. During the recovery, the packets
+    that are below the highest SACKed sequence number and are still in the window are the holes the other side is
+    missing - exactly these are retransmitted (once per recovery).
     """
 
-    def __init__(self, pid: int, computer: Computer, window_size: int = PROTOCOLS.TCP.MAX_WINDOW_SIZE) -> None:
+    def __init__(self,
+                 pid: int,
+                 computer: Computer,
+                 window_size: int = PROTOCOLS.TCP.MAX_WINDOW_SIZE,
+                 congestion_control: str = PROTOCOLS.TCP.CONGESTION_CONTROL.DEFAULT) -> None:
         """
         Initiates the three queues of the window.
         """
         self.pid = pid
         self.computer = computer
         self.window_size = window_size
+        self.congestion_control = get_congestion_control(congestion_control)
+        self.rtt_estimator = RTTEstimator()
+
+        self.last_ack_number = 0
+        self.duplicate_ack_count = 0
+        self.highest_sacked = 0
+        self.recovery_point: Optional[int] = None  # the end of the data that was in flight when the recovery started
+        self.recovery_start_time: T_Time = 0
+        self.fast_retransmission_count = 0
+
+        self.receive_window_edge: Optional[int] = None  # the sequence number the other side can receive up to (None if unknown)
+        self.receive_window_update_time: T_Time = 0
+        self.zero_window_probe_count = 0
 
         self.waiting_for_sending: Deque[Packet] = deque()
         self.window: Deque[NotAckedPacket] = deque()
 
     @property
     def sent(self) -> Iterable[Packet]:
-        return raise_on_none(self.computer.get_packet_sending_queue(self.pid, COMPUTER.PROCESSES.MODES.KERNELMODE)).packets
+        packet_sending_queue = self.computer.get_packet_sending_queue(self.pid, COMPUTER.PROCESSES.MODES.KERNELMODE)
+        return [] if packet_sending_queue is None else packet_sending_queue.packets  # no queue until something is sent
+
+    @property
+    def effective_window_size(self) -> int:
+        """The amount of packets that are allowed to be in the window right now (at least one)"""
+        return max(1, min(self.window_size, int(self.congestion_control.cwnd)))
+
+    @property
+    def flight_size(self) -> int:
+        """The amount of packets that were sent and not yet ACKed"""
+        return sum(1 for non_acked_packet in self.window if non_acked_packet.is_sent)
 
     def clear(self) -> None:
         """
-        Clears all of the attributes of the window.
+        Clears all of the packets of the window.
         :return:
         """
         self.waiting_for_sending.clear()
         self.window.clear()
+        self.duplicate_ack_count = 0
+        self.recovery_point = None
+
+    def reset(self) -> None:
+        """
+        Resets the window like it was just created - for a new connection.
+        What was learned about the path of the previous connection (congestion window, RTT) is forgotten.
+        """
+        self.clear()
+        self.congestion_control = get_congestion_control(self.congestion_control.name)
+        self.rtt_estimator = RTTEstimator()
+        self.last_ack_number = 0
+        self.highest_sacked = 0
+        self.receive_window_edge = None
+
+    def update_receive_window(self, ack_number: int, window_size: int) -> bool:
+        """
+        Learn the receive window that the other side advertised in a packet that ACKs `ack_number`.
+        Packets that ACK less than the last one are older - their window is ignored.
+        :return: whether or not the window opened further than it was
+        """
+        if ack_number < self.last_ack_number:
+            return False
+
+        edge = ack_number + window_size
+        is_opened = self.receive_window_edge is not None and edge > self.receive_window_edge
+        self.receive_window_edge = edge
+        self.receive_window_update_time = MainLoop.get_time()
+        return is_opened
+
+    def _is_allowed_by_receive_window(self, packet: Packet) -> bool:
+        """
+        Whether or not the data of the packet fits in the receive window of the other side.
+        While the window is closed and nothing is in flight, a packet is allowed every retransmission timeout - as a probe.
+        """
+        if self.receive_window_edge is None or not (OPCODES.TCP.PSH & packet["TCP"].flags) or \
+                get_tcp_packet_end_sequence_number(packet) <= self.receive_window_edge:
+            return True
+
+        if self.flight_size == 0 and MainLoop.get_time_since(self.receive_window_update_time) >= self.rtt_estimator.rto:
+            self.zero_window_probe_count += 1
+            self.receive_window_update_time = MainLoop.get_time()
+            return True
+        return False
+
+    def has_room(self) -> bool:
+        """Whether or not the window can take more packets than the ones that are already waiting for it"""
+        return len(self.window) + len(self.waiting_for_sending) < self.effective_window_size
+
+    def is_empty(self) -> bool:
+        """Whether or not there are no packets in the window, or waiting to get into it"""
+        return not self.window and not self.waiting_for_sending
 
     def fill_window(self) -> None:
         """
         Fills the window until it is in its full window size
         """
-        while len(self.window) < self.window_size and self.waiting_for_sending:
+        while len(self.window) < self.effective_window_size and self.waiting_for_sending:
             self.window.append(NotAckedPacket(self.waiting_for_sending.popleft(), MainLoop.get_time(), False))
 
     def slide_window(self, count: int) -> None:
         """
-        Moves the window `count` packets to the right.
+        Moves the window `count` packets to the right. (`count` packets were ACKed)
+        The newest of them that was never retransmitted is used to measure the RTT.
         Also fills up the window if it is not full.
         """
+        acked_count = 0
+        measured: Optional[NotAckedPacket] = None
         for _ in range(count):
             if not self.window:
                 break
-            self.window.popleft()
+            acked = self.window.popleft()
+            acked_count += 1
+            if not acked.was_retransmitted:
+                measured = acked
+
+        if measured is not None:
+            self.rtt_estimator.add_sample(MainLoop.get_time_since(measured.sending_time))
+        self.congestion_control.on_ack(acked_count)
         self.fill_window()
 
-    def send_window(self) -> None:
+    def send_window(self, ack_number: Optional[int] = None, receive_window: Optional[int] = None) -> bool:
         """
         Sends all of the packets in the window (adds them to the `sent` queue)
-        Only does that to NotAckedPackets where the `is_sent` attribute is False.
+        Only does that to NotAckedPackets where the `is_sent` attribute is False, and only to the ones the congestion window
+        and the receive window of the other side allow.
+        :param ack_number: if given, it is piggybacked on the data packets that are sent (they are also ACKs)
+        :param receive_window: if given, the sent data packets advertise it instead of the window they were created with
+        :return: whether or not an ACK was piggybacked on a sent packet
         """
         sent_packets = []
-        for non_acked_packet in self.window:
+        is_ack_piggybacked = False
+        for non_acked_packet in list(self.window)[:self.effective_window_size]:
             if not non_acked_packet.is_sent:
-                sent_packets.append(non_acked_packet.packet.copy())
+                if not self._is_allowed_by_receive_window(non_acked_packet.packet):
+                    break
+                if ack_number is not None and (OPCODES.TCP.PSH & non_acked_packet.packet["TCP"].flags):
+                    tcp_layer = self._tcp_layer_to_modify(non_acked_packet)
+                    tcp_layer.flags |= OPCODES.TCP.ACK
+                    tcp_layer.ack_number = ack_number
+                    is_ack_piggybacked = True
+                if receive_window is not None:
+                    self._tcp_layer_to_modify(non_acked_packet).window_size = receive_window
+                sent_packets.append(non_acked_packet.packet.shallow_copy())
+                non_acked_packet.has_sent_copies = True
                 non_acked_packet.is_sent = True
+                non_acked_packet.sending_time = MainLoop.get_time()
         self.computer.send_packet_stream(self.pid, COMPUTER.PROCESSES.MODES.KERNELMODE, sent_packets, PROTOCOLS.TCP.SENDING_INTERVAL)
+        return is_ack_piggybacked
+
+    @staticmethod
+    def _tcp_layer_to_modify(non_acked_packet: NotAckedPacket) -> TCP:
+        """
+        Returns the TCP layer of a packet in the window, so it could be modified.
+        The copies of the packet that were already sent share its layers - so in that case the packet is copied first.
+        """
+        if non_acked_packet.has_sent_copies:
+            is_retransmission = non_acked_packet.packet["TCP"].is_retransmission
+            non_acked_packet.packet = non_acked_packet.packet.copy()
+            non_acked_packet.packet["TCP"].is_retransmission = is_retransmission
+            non_acked_packet.has_sent_copies = False
+        return non_acked_packet.packet["TCP"]
 
     def add_waiting(self, packet: Packet) -> None:
         """
@@ -518,7 +834,7 @@ class SendingWindow:
         :param packet:
         :return:
         """
-        self.computer.send_packet_stream(self.pid, COMPUTER.PROCESSES.MODES.KERNELMODE, [packet.copy()], PROTOCOLS.TCP.SENDING_INTERVAL)
+        self.computer.send_packet_stream(self.pid, COMPUTER.PROCESSES.MODES.KERNELMODE, [packet.shallow_copy()], PROTOCOLS.TCP.SENDING_INTERVAL)
 
     def nothing_to_send(self) -> bool:
         """
@@ -526,15 +842,98 @@ class SendingWindow:
         """
         return not self.sent and not self.window and not self.waiting_for_sending
 
+    @property
+    def is_in_recovery(self) -> bool:
+        return self.recovery_point is not None
+
+    def update_highest_sacked(self, sequence_number: int) -> None:
+        self.highest_sacked = max(self.highest_sacked, sequence_number)
+
+    def on_new_ack(self, ack_number: int) -> None:
+        """
+        Called when an ACK that ACKs new data arrives.
+        If the window is in recovery and not everything that was in flight is ACKed (a partial ACK) - the next hole is retransmitted.
+        """
+        self.last_ack_number = ack_number
+        self.duplicate_ack_count = 0
+
+        if self.recovery_point is None:
+            return
+
+        if ack_number >= self.recovery_point:
+            self.recovery_point = None
+            return
+
+        self._retransmit_holes()
+
+    def on_duplicate_ack(self) -> None:
+        """
+        Called when a duplicate ACK arrives. The third one starts a fast retransmission (and a loss recovery).
+        More duplicate ACKs during the recovery carry more SACK information - so the new holes are retransmitted.
+        """
+        self.duplicate_ack_count += 1
+
+        if self.is_in_recovery:
+            self._retransmit_holes()
+            return
+
+        if self.duplicate_ack_count < PROTOCOLS.TCP.DUPLICATE_ACK_THRESHOLD:
+            return
+
+        sent = [non_acked_packet for non_acked_packet in self.window if non_acked_packet.is_sent]
+        self.recovery_point = max(get_tcp_packet_end_sequence_number(non_acked_packet.packet) for non_acked_packet in sent)
+        self.recovery_start_time = MainLoop.get_time()
+        self.congestion_control.on_loss(len(sent))
+        self._retransmit_holes()
+
+    def _retransmit_holes(self) -> None:
+        """
+        Retransmits the packets that the other side is missing, that were not retransmitted yet in this recovery.
+        The first packet in the window is always missing (the ACK number points to it). The others are missing if there is
+        SACKed data after them.
+        """
+        for i, non_acked_packet in enumerate(self.window):
+            if not non_acked_packet.is_sent:
+                continue
+            if i > 0 and non_acked_packet.packet["TCP"].sequence_number >= self.highest_sacked:
+                break
+            if non_acked_packet.was_retransmitted and non_acked_packet.sending_time >= self.recovery_start_time:
+                continue  # already retransmitted in this recovery
+
+            self._tcp_layer_to_modify(non_acked_packet).is_retransmission = True
+            non_acked_packet.was_retransmitted = True
+            non_acked_packet.sending_time = MainLoop.get_time()
+            self.add_no_wait(non_acked_packet.packet)
+            non_acked_packet.has_sent_copies = True
+            self.fast_retransmission_count += 1
+
     def retransmit_unacked(self) -> None:
         """
-        Retransmits all of the packets that were not ACKed for too long!
+        Handles the packets that were not ACKed for too long! (longer than the retransmission timeout)
+        The congestion window goes back to a single packet, so only the oldest of them is retransmitted right away.
+        The rest of the sent packets are marked as not sent - they are sent again as the congestion window allows.
+        The retransmission timeout is doubled until a new RTT is measured.
         """
-        for non_acked_packet in list(self.window):
-            if MainLoop.get_time_since(non_acked_packet.sending_time) > PROTOCOLS.TCP.RESEND_TIME:
-                non_acked_packet.packet["TCP"].is_retransmission = True
-                self.add_no_wait(non_acked_packet.packet)
-                non_acked_packet.sending_time = MainLoop.get_time()
+        timed_out = [non_acked_packet for non_acked_packet in self.window
+                     if non_acked_packet.is_sent and MainLoop.get_time_since(non_acked_packet.sending_time) > self.rtt_estimator.rto]
+        if not timed_out:
+            return
+
+        self.congestion_control.on_timeout(self.flight_size)
+        self.rtt_estimator.back_off()
+        self.recovery_point = None
+        self.duplicate_ack_count = 0
+
+        oldest = timed_out[0]
+        for non_acked_packet in self.window:
+            if non_acked_packet.is_sent:
+                self._tcp_layer_to_modify(non_acked_packet).is_retransmission = True
+                non_acked_packet.was_retransmitted = True
+                non_acked_packet.is_sent = (non_acked_packet is oldest)
+
+        self.add_no_wait(oldest.packet)
+        oldest.has_sent_copies = True
+        oldest.sending_time = MainLoop.get_time()
 
     def __repr__(self) -> str:
         """
@@ -546,6 +945,8 @@ class SendingWindow:
 waiting to be sent: {[packet["TCP"].sequence_number for packet in self.waiting_for_sending]}
 window: {window}
 window size: {self.window_size}
+congestion control: {self.congestion_control}
+{self.rtt_estimator}
 sent: {[packet["TCP"].sequence_number for packet in self.sent]}
 """
 
@@ -554,78 +955,113 @@ class ReceivingWindow:
     """
     The receiving window of the process
     Handles the SACk option of TCP
+
+    The byte ranges that were received after a hole are kept as an interval map - the SACK blocks - which are sorted,
+    disjoint and never touch each other. A new range is placed in it with a binary search and is merged only with the
+    blocks it overlaps.
+    The data of the received segments is kept by their sequence numbers until everything before it is received, then
+    all of the contiguous data is delivered at once.
     """
 
     def __init__(self) -> None:
         """
         Initiates the receiving window with an empty window.
         """
-        self.window: List[Packet] = []
         self.ack_number = 0
         self.sack_blocks: List[SackEdges] = []
+        self._sack_block_lefts: List[int] = []  # the left edges of the `sack_blocks` - to binary search them
+
+        self.segments: Dict[int, bytes] = {}  # the data that was not delivered yet, by its sequence number
+        self._segment_sequence_numbers: List[int] = []  # the keys of `segments` - sorted
 
     def clear(self) -> None:
         """
         Clears the window and resets it like it was just created
         :return:
         """
-        self.window.clear()
+        self.segments.clear()
+        self._segment_sequence_numbers.clear()
         self.sack_blocks.clear()
+        self._sack_block_lefts.clear()
         self.ack_number = 0
 
     def add_packet(self, packet: Packet) -> None:
         """
-        Adds a packet to the window.
+        Adds the data of a packet to the window.
         """
-        insort(self.window, packet, key=lambda p: p["TCP"].sequence_number)
+        sequence_number = packet["TCP"].sequence_number
+        if sequence_number in self.segments:
+            return  # a retransmission of a packet that is already here
+
+        self.segments[sequence_number] = get_tcp_packet_payload(packet)
+        insort(self._segment_sequence_numbers, sequence_number)
+
+    @property
+    def undelivered_in_order_length(self) -> int:
+        """The amount of bytes that arrived in-order and were not added to the received data yet"""
+        length = 0
+        for sequence_number in self._segment_sequence_numbers:
+            if sequence_number >= self.ack_number:
+                break
+            length += len(self.segments[sequence_number])
+        return length
 
-    def add_data_and_remove_from_window(self, received_data: List) -> None:
+    def add_data_and_remove_from_window(self, received_data: ReceivedData) -> None:
         """
-        Adds the data from all of the packets that arrived in-order to the given list.
+        Adds the data of all of the packets that arrived in-order to the given list - as a single `memoryview`.
         Also removes them from the receiving window.
         :param received_data: a list of data that is received from the destination computer.
         """
-        for packet in self.window[:]:
-            if is_number_acking_packet(self.ack_number, packet):
-                received_data.append(packet["TCP"].payload.build())
-                self.window.remove(packet)
-            else:
-                break  # the window is sorted by the sequence number.
+        contiguous_data = []
+        for sequence_number in self._segment_sequence_numbers:
+            if sequence_number + len(self.segments[sequence_number]) > self.ack_number:
+                break  # the sequence numbers are sorted
+            contiguous_data.append(self.segments.pop(sequence_number))
+
+        if not contiguous_data:
+            return
+
+        del self._segment_sequence_numbers[:len(contiguous_data)]
+        received_data.append(memoryview(contiguous_data[0] if len(contiguous_data) == 1 else b''.join(contiguous_data)))
 
     def add_to_sack(self, packet: Packet) -> None:
         """
         Adds a packet to the SACK data of the process.
         """
-        packet_start = packet["TCP"].sequence_number
-        packet_length = get_tcp_packet_data_length(packet)
-        packet_end = packet_start + packet_length
+        self.add_range_to_sack(packet["TCP"].sequence_number, get_tcp_packet_end_sequence_number(packet))
 
-        for block in self.sack_blocks:
-            if block.left == packet_end:
-                block.left = packet_start
-                return
-            elif block.right == packet_start:
-                block.right = packet_end
-                return
+    def add_range_to_sack(self, left: int, right: int) -> None:
+        """
+        Adds a range of received sequence numbers to the SACK blocks, merging it with the blocks it overlaps or touches.
+        :param left: the first sequence number in the range
+        :param right: the sequence number right after the range
+        """
+        end_index = bisect_right(self._sack_block_lefts, right)  # the blocks before it start before the range ends
+        start_index = end_index
+        while start_index > 0 and self.sack_blocks[start_index - 1].right >= left:
+            start_index -= 1  # the right edges are sorted as well - so the merged blocks are one after the other
 
-        insort(self.sack_blocks, SackEdges(packet_start, packet_end), key=attrgetter('left'))
+        if start_index < end_index:
+            left = min(left, self.sack_blocks[start_index].left)
+            right = max(right, self.sack_blocks[end_index - 1].right)
+
+        self.sack_blocks[start_index:end_index] = [SackEdges(left, right)]
+        self._sack_block_lefts[start_index:end_index] = [left]
 
     def merge_sack_blocks(self) -> None:
         """
-        Merges the SACK blocks to the ack number.
+        Merges the SACK blocks that the ack number reached into it.
         :return: None
         """
-        for block in self.sack_blocks[:]:
-            if self.ack_number == block.left:
-                self.ack_number = block.right
-                self.sack_blocks.remove(block)
-
-        for i, block in enumerate(self.sack_blocks[:-1]):
-            next_block = self.sack_blocks[i + 1]
+        merged_count = 0
+        for block in self.sack_blocks:
+            if block.left > self.ack_number:
+                break
+            self.ack_number = max(self.ack_number, block.right)
+            merged_count += 1
 
-            if block.right == next_block.left:
-                self.sack_blocks.remove(block)
-            next_block.left = block.left
+        del self.sack_blocks[:merged_count]
+        del self._sack_block_lefts[:merged_count]
 
     def get_sack_blocks_as_tuple(self) -> Union[Tuple[int], Tuple]:
         """
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from NetSym.consts import PROTOCOLS, T_Time
+
+
+class RTTEstimator:
+    """
+    Estimates the round trip time of a TCP connection and decides the retransmission timeout (RTO) from it.
+    (The Jacobson/Karels algorithm, RFC 6298)
+
+        SRTT   = (1 - alpha) * SRTT + alpha * R
+        RTTVAR = (1 - beta) * RTTVAR + beta * |SRTT - R|
+        RTO    = SRTT + K * RTTVAR
+
+    By Karn's rule, segments that were retransmitted are never measured (it is unknown which copy was ACKed).
+    Every timeout doubles the RTO (exponential backoff) until the next valid measurement.
+    """
+
+    def __init__(self) -> None:
+        self.srtt: Optional[T_Time] = None
+        self.rttvar: Optional[T_Time] = None
+        self.rto: T_Time = PROTOCOLS.TCP.RTO.INITIAL
+
+        self.sample_count = 0
+        self.min_rtt: Optional[T_Time] = None
+        self.max_rtt: Optional[T_Time] = None
+        self.backoff_count = 0
+
+    def add_sample(self, rtt: T_Time) -> None:
+        """
+        Updates the estimation with a new RTT measurement and recomputes the RTO (this also resets the backoff)
+        """
+        if self.srtt is None or self.rttvar is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - PROTOCOLS.TCP.RTO.BETA) * self.rttvar + PROTOCOLS.TCP.RTO.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - PROTOCOLS.TCP.RTO.ALPHA) * self.srtt + PROTOCOLS.TCP.RTO.ALPHA * rtt
+
+        self.rto = min(max(self.srtt + PROTOCOLS.TCP.RTO.K * self.rttvar, PROTOCOLS.TCP.RTO.MIN), PROTOCOLS.TCP.RTO.MAX)
+
+        self.sample_count += 1
+        self.min_rtt = rtt if self.min_rtt is None else min(self.min_rtt, rtt)
+        self.max_rtt = rtt if self.max_rtt is None else max(self.max_rtt, rtt)
+        self.backoff_count = 0
+
+    def back_off(self) -> None:
+        """
+        Called when the retransmission timer expires - waits longer before the next retransmission
+        """
+        self.rto = min(self.rto * PROTOCOLS.TCP.RTO.BACKOFF_FACTOR, PROTOCOLS.TCP.RTO.MAX)
+        self.backoff_count += 1
+
+    def __repr__(self) -> str:
+        if self.srtt is None or self.rttvar is None:
+            return f"rto: {self.rto:.2f} (no RTT samples)"
+        return f"rtt: {self.srtt:.2f}/{self.rttvar:.2f} min/max: {self.min_rtt:.2f}/{self.max_rtt:.2f} " \
+            f"rto: {self.rto:.2f} samples: {self.sample_count} backoffs: {self.backoff_count}"
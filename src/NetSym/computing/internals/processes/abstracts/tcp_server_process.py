@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Type, TYPE_CHECKING, Optional
 
 from NetSym.computing.internals.processes.abstracts.process import Process, T_ProcessCode
-from NetSym.consts import T_Port
+from NetSym.consts import T_Port, PROTOCOLS
 
 if TYPE_CHECKING:
     from NetSym.computing.internals.sockets.tcp_socket import TCPSocket
@@ -14,15 +14,18 @@ class TCPServerProcess(Process):
     """
     A process that waits for TCP connections.
     For each connection it starts a child process with the connection's `Socket` object
+    The handshakes are handled by the listening socket in the kernel, so many clients can connect at the same time.
     """
     def __init__(self,
                  pid: int,
                  computer: Computer,
                  src_port: T_Port,
-                 connection_process_type: Type[Process]) -> None:
+                 connection_process_type: Type[Process],
+                 backlog: int = PROTOCOLS.TCP.LISTEN.DEFAULT_BACKLOG) -> None:
         super(TCPServerProcess, self).__init__(pid, computer)
         self.src_port = src_port
         self.connection_process_type = connection_process_type
+        self.backlog = backlog
         self.socket: Optional[TCPSocket] = None
         self.set_killing_signals_handler(self.handle_killing_signals)
 
@@ -39,9 +42,8 @@ class TCPServerProcess(Process):
     def code(self) -> T_ProcessCode:
         self.socket = self.computer.get_tcp_socket(self.pid)
         self.socket.bind((None, self.src_port))
-        self.socket.listen()
+        self.socket.listen(self.backlog)
 
         while True:
-            server_socket = yield from self.socket.blocking_accept(self.pid)
-            self.computer.process_scheduler.start_usermode_process(self.connection_process_type, self.socket)
-            self.socket = server_socket
+            connection_socket = yield from self.socket.blocking_accept()
+            self.computer.process_scheduler.start_usermode_process(self.connection_process_type, connection_socket)
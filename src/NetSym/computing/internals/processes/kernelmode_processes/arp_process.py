@@ -108,3 +108,30 @@ class SendPacketWithARPProcess(Process):
 
     def __repr__(self) -> str:
         return f"[kwarp]"
+
+
+class ResolveNextHopProcess(ARPProcess):
+    """
+    Resolves the MAC address of a next hop that packets wait for in the ARP pending table of the computer.
+    A single process runs for every address - no matter how many packets wait for it.
+    Once the address is resolved all of the packets are sent, if it is not - they are all dropped.
+    """
+    def __init__(self, pid: int, computer: Computer, next_hop: IPAddress) -> None:
+        """
+        Initiates the process with the address of the next hop to resolve
+        """
+        super(ResolveNextHopProcess, self).__init__(pid, computer, next_hop.string_ip)
+        self.next_hop = next_hop
+
+    def code(self) -> T_ProcessCode:
+        """The code of the process"""
+        try:
+            yield from super(ResolveNextHopProcess, self).code()
+        except ProcessInternalError_NoResponseForARP:
+            self.computer.drop_arp_pending_packets(self.next_hop)
+            raise
+
+        self.computer.flush_arp_pending_packets(self.next_hop)
+
+    def __repr__(self) -> str:
+        return f"[karp] {self.destination} (pending)"
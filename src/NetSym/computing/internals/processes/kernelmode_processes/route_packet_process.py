@@ -5,15 +5,34 @@ from typing import TYPE_CHECKING, Optional
 from NetSym.computing.internals.processes.abstracts.process import Process, \
     T_ProcessCode
 from NetSym.computing.internals.processes.abstracts.process_internal_errors import ProcessInternalError_RoutedPacketTTLExceeded, \
-    ProcessInternalError_NoResponseForARP, ProcessInternalError_PacketTooLongButDoesNotAllowFragmentation
+    ProcessInternalError_PacketTooLongButDoesNotAllowFragmentation
 from NetSym.consts import OPCODES, COMPUTER
-from NetSym.packets.usefuls.ip import needs_fragmentation, allows_fragmentation
+from NetSym.packets.usefuls.ip import needs_fragmentation, allows_fragmentation, flow_hash
 
 if TYPE_CHECKING:
     from NetSym.computing.computer import Computer
     from NetSym.packets.packet import Packet
 
 
+def is_packet_routable(packet: Packet) -> bool:
+    """
+    Checks the given packet and make sure that it is valid and can be routed.
+    """
+    if not packet.is_valid() or ("IP" not in packet):
+        return False
+
+    if packet["IP"].dst_ip is None or packet["IP"].src_ip is None:
+        return False
+
+    if "0.0.0.0" in [str(packet["IP"].dst_ip), str(packet["IP"].src_ip)]:
+        return False
+
+    if packet["IP"].src_ip.is_broadcast() or packet["Ether"].dst_mac.is_broadcast():
+        return False
+
+    return True
+
+
 class RoutePacket(Process):
     """
     This is a process which when run, takes in a packet and routes over the running router, using the
@@ -26,37 +45,28 @@ class RoutePacket(Process):
         """
         super(RoutePacket, self).__init__(pid, computer)
         self.packet: Packet = packet
+        self.flow_hash = flow_hash(packet) if "IP" in packet else None
+        # ^ picks the route of the packet when its destination has multiple equal-cost ones
 
     def _is_packet_routable(self) -> bool:
         """
         Checks the given packet and make sure that it is valid and can be routed.
         :return:
         """
-        if not self.packet.is_valid() or ("IP" not in self.packet):
-            return False
-
-        if self.packet["IP"].dst_ip is None or self.packet["IP"].src_ip is None:
-            return False
-
-        if "0.0.0.0" in [str(self.packet["IP"].dst_ip), str(self.packet["IP"].src_ip)]:
-            return False
-
-        if self.packet["IP"].src_ip.is_broadcast() or self.packet["Ether"].dst_mac.is_broadcast():
-            return False
-
-        return True
+        return is_packet_routable(self.packet)
 
     def _validate_ttl(self) -> T_ProcessCode:
         """
-        Decrease the TTL of the packet, if it is 0, sends an ICMP Time Exceeded
+        Decrease the TTL of the packet, if it is 0, sends an ICMP Time Exceeded (unless they are rate limited now)
         :return: a bool telling whether the time (TTL) of the packet was exceeded (reached 0).
         """
         if self.packet["IP"].ttl > 1:
             return
 
-        sender_ip = self.packet["IP"].src_ip
-        _, dst_mac = yield from self.computer.resolve_ip_address(sender_ip, self)
-        self.computer.send_time_exceeded(dst_mac, sender_ip)
+        if self.computer.icmp_rate_limiter.allow(OPCODES.ICMP.TYPES.TIME_EXCEEDED):
+            sender_ip = self.packet["IP"].src_ip
+            _, dst_mac = yield from self.computer.resolve_ip_address(sender_ip, self)
+            self.computer.send_time_exceeded(dst_mac, sender_ip)
         raise ProcessInternalError_RoutedPacketTTLExceeded
 
     def _destination_unreachable(self) -> bool:
@@ -68,13 +78,16 @@ class RoutePacket(Process):
         dst_ip = self.packet["IP"].dst_ip
 
         if (dst_ip not in self.computer.routing_table) or \
-           self.computer.get_sending_interface_by_routing_table(dst_ip).no_carrier:
+           self.computer.get_sending_interface_by_routing_table(dst_ip, self.flow_hash).no_carrier:
             self._send_icmp_unreachable(OPCODES.ICMP.CODES.NETWORK_UNREACHABLE)
             return True
         return False
 
     def _send_icmp_unreachable(self, code: Optional[int] = None) -> None:
-        """Sends to the sender of the routed packet, an ICMP unreachable"""
+        """Sends to the sender of the routed packet, an ICMP unreachable (unless ICMP unreachables are rate limited now)"""
+        if not self.computer.icmp_rate_limiter.allow(OPCODES.ICMP.TYPES.UNREACHABLE):
+            return
+
         sender_ip = self.packet["IP"].src_ip
         dst_ip = self.packet["IP"].dst_ip
 
@@ -89,7 +102,8 @@ class RoutePacket(Process):
     def code(self) -> T_ProcessCode:
         """
         Receives the packet in the constructor, routes it to the correct subnet (the correct interface of the router).
-        It has to send ARPs first sometimes. Does all of that.
+        If the MAC address of the next hop is unknown, the packet waits for it in the ARP pending table of the computer
+        (a single ARP process runs for each next hop, no matter how many packets wait for it)
 
         :return: a generator that yields `WaitingForPacket` namedtuple-s.
         """
@@ -101,21 +115,24 @@ class RoutePacket(Process):
 
         yield from self._validate_ttl()
 
-        self.packet["IP"].ttl -= 1
         dst_ip = self.packet["IP"].dst_ip
-        try:
-            ip_for_the_mac, dst_mac = yield from self.computer.resolve_ip_address(dst_ip, self)
-        except ProcessInternalError_NoResponseForARP:
-            self._send_icmp_unreachable()
-            raise
-
-        interface = self.computer.get_sending_interface_by_routing_table(dst_ip)
-        packet = interface.ethernet_wrap(dst_mac, self.packet["IP"])
-
-        if needs_fragmentation(packet, interface.mtu) and not allows_fragmentation(packet):
+        interface = self.computer.get_sending_interface_by_routing_table(dst_ip, self.flow_hash)
+        if needs_fragmentation(self.packet, interface.mtu) and not allows_fragmentation(self.packet):
             self._send_icmp_unreachable(OPCODES.ICMP.CODES.FRAGMENTATION_NEEDED)
             raise ProcessInternalError_PacketTooLongButDoesNotAllowFragmentation  # drop the packet
 
+        route = self.computer.routing_table.route(dst_ip, self.flow_hash)
+        self.computer.routing_table.count_forwarded(route)
+        next_hop = route.gateway_ip
+        if next_hop not in self.computer.arp_cache:
+            ip_layer = self.packet["IP"].copy()
+            ip_layer.ttl -= 1  # the received packet may be shared with the sender
+            self.computer.send_when_next_hop_is_resolved(next_hop, ip_layer)
+            return
+
+        packet = interface.ethernet_wrap(self.computer.arp_cache[next_hop].mac, self.packet["IP"])
+        packet["IP"].ttl -= 1  # the wrapped packet is a copy - the received one may be shared with the sender
+
         self.computer.send_packet_stream(
             COMPUTER.PROCESSES.INIT_PID,
             COMPUTER.PROCESSES.MODES.KERNELMODE,
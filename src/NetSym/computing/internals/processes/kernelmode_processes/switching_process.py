@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import NamedTuple, TYPE_CHECKING, List, Dict
+from typing import NamedTuple, TYPE_CHECKING, List, Dict, Optional
 
 from NetSym.address.mac_address import MACAddress
 from NetSym.computing.internals.processes.abstracts.process import Process, ReturnedPacket, T_ProcessCode, WaitingFor
@@ -9,6 +9,7 @@ from NetSym.exceptions import *
 from NetSym.gui.main_loop import MainLoop
 
 if TYPE_CHECKING:
+    from NetSym.computing.internals.network_data_structures.storm_control import StormControl
     from NetSym.packets.packet import Packet
     from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
     from NetSym.computing.switch import Switch
@@ -22,6 +23,8 @@ class SwitchTableItem(NamedTuple):
 class SwitchingProcess(Process):
     """
     This is the process that is in charge of switching packets on a computer.
+    The frames that are flooded (broadcast, multicast and unknown unicast) are limited for every port by the
+    `storm_control` of the switch.
     """
     computer: Switch
 
@@ -33,12 +36,18 @@ class SwitchingProcess(Process):
         self.mac_address_table: Dict[MACAddress, SwitchTableItem] = {}
         # ^ a dictionary mapping mac addresses to the corresponding leg (interface) they sit behind.
 
+    @property
+    def storm_control(self) -> StormControl:
+        return self.computer.storm_control
+
     def update_switch_table_from_packets(self, packets: ReturnedPacket) -> None:
         """
         Updates the switch table by looking at the packets that were received since
         the last time this function was called.|
         """
         for packet, packet_metadata in packets:
+            if self.storm_control.is_shut_down(packet_metadata.interface):
+                continue
             try:
                 src_mac = packet["Ether"].src_mac
             except KeyError:
@@ -67,11 +76,38 @@ class SwitchingProcess(Process):
                 continue  # do not switch packets that are for you!
             if self.computer.stp_enabled and "STP" in packet:
                 continue   # do not switch STP packets (unless you do not know what STP is (== Hub))
+            if not self._passes_storm_control(packet, packet_metadata.interface):
+                continue
             destination_legs = self.where_to_send(packet, source_leg=packet_metadata.interface)
             for leg in destination_legs:
                 packet.graphics = None
                 self.computer.send(packet.copy(), interface=leg)
 
+    def flooded_traffic_type(self, packet: Packet) -> Optional[str]:
+        """
+        The kind of flooded traffic the packet is (`COMPUTER.STORM_CONTROL.TRAFFIC_TYPES`) - None if it is not flooded
+        """
+        dst_mac = packet["Ether"].dst_mac
+        if dst_mac.is_broadcast():
+            return COMPUTER.STORM_CONTROL.TRAFFIC_TYPES.BROADCAST
+        if dst_mac.is_multicast():
+            return COMPUTER.STORM_CONTROL.TRAFFIC_TYPES.MULTICAST
+        if self.computer.is_hub or dst_mac not in self.mac_address_table:
+            return COMPUTER.STORM_CONTROL.TRAFFIC_TYPES.UNKNOWN_UNICAST
+        return None
+
+    def _passes_storm_control(self, packet: Packet, source_leg: CableNetworkInterface) -> bool:
+        """
+        Whether or not a packet that was received on the leg may be switched.
+        Nothing passes on a leg that was shut down, and flooded packets pass only while the leg is under its thresholds.
+        """
+        if self.storm_control.is_shut_down(source_leg):
+            self.storm_control[source_leg].shutdown_drop_count += 1
+            return False
+
+        traffic_type = self.flooded_traffic_type(packet)
+        return traffic_type is None or self.storm_control.allow(source_leg, traffic_type)
+
     def where_to_send(self, packet: Packet, source_leg: CableNetworkInterface) -> List[CableNetworkInterface]:
         """
         Returns a list of legs that the packet needs to be sent to.
@@ -83,9 +119,10 @@ class SwitchingProcess(Process):
         dst_mac = packet["Ether"].dst_mac
 
         if self.computer.is_hub or dst_mac.is_broadcast() or (dst_mac not in self.mac_address_table):
-            return [leg for leg in self.computer.cable_interfaces if leg is not source_leg and leg.is_connected()]  # flood!!!
+            return [leg for leg in self.computer.cable_interfaces
+                    if leg is not source_leg and leg.is_connected() and not self.storm_control.is_shut_down(leg)]  # flood!!!
         destination_leg = self.mac_address_table[dst_mac].leg
-        return [destination_leg] if destination_leg is not source_leg else []
+        return [destination_leg] if destination_leg is not source_leg and not self.storm_control.is_shut_down(destination_leg) else []
         # ^ making sure the packet does not return on the destination leg
 
     @staticmethod
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-from typing import Tuple, TYPE_CHECKING, Optional, List
+from collections import deque
+from dataclasses import dataclass
+from typing import Tuple, TYPE_CHECKING, Optional, List, Dict, Deque
 
 from NetSym.address.ip_address import IPAddress
-from NetSym.computing.internals.processes.abstracts.process import T_ProcessCode
+from NetSym.computing.internals.processes.abstracts.process import T_ProcessCode, Process, WaitingFor, Timeout
 from NetSym.computing.internals.processes.abstracts.tcp_process import TCPProcess
-from NetSym.consts import COMPUTER, T_Port
+from NetSym.consts import COMPUTER, T_Port, T_Time, OPCODES, PROTOCOLS
+from NetSym.gui.main_loop import MainLoop
 
 if TYPE_CHECKING:
     from NetSym.computing.internals.sockets.tcp_socket import TCPSocket
     from NetSym.computing.computer import Computer
+    from NetSym.packets.packet import Packet
 
 
 class TCPSocketProcess(TCPProcess):
@@ -28,16 +32,21 @@ class TCPSocketProcess(TCPProcess):
         Initiates the process with a src socket and the running computer
         :param socket:
         """
-        super(TCPSocketProcess, self).__init__(pid, computer, dst_ip, dst_port, src_port, is_client)
+        super(TCPSocketProcess, self).__init__(pid, computer, dst_ip, dst_port, src_port, is_client,
+                                               congestion_control=socket.congestion_control, no_delay=socket.no_delay)
         self.socket = socket
         self.received: List[bytes] = []
         self.close_socket_when_done_transmitting = False
 
+    def receive_buffer_free_space(self) -> int:
+        return self.socket.received.free_space
+
     def _unload_socket_sending_queue(self) -> None:
         """
         reads from the socket what it needs to send
         and sends it
         """
+        self.no_delay = self.socket.no_delay
         if not self.socket.to_send:
             return
 
@@ -91,14 +100,19 @@ class ListeningTCPSocketProcess(TCPSocketProcess):
                  pid: int,
                  computer: Computer,
                  socket: TCPSocket,
-                 bound_address: Tuple[IPAddress, T_Port]) -> None:
+                 bound_address: Tuple[IPAddress, T_Port],
+                 syn: Optional[Packet] = None) -> None:
         """
         Initiates the process with a src socket and the running computer
         :param computer:
         :param socket:
+        :param syn: the SYN of the connection, if it was already received (by a `TCPListenerProcess`)
         """
         super(ListeningTCPSocketProcess, self).__init__(pid, computer, socket,
                                                         src_port=bound_address[1], is_client=False)
+        if syn is not None:
+            self.received_syn = syn
+            self.dst_ip, self.dst_port = syn["IP"].src_ip, syn["TCP"].src_port
 
     def code(self) -> T_ProcessCode:
         yield from super(ListeningTCPSocketProcess, self).code()
@@ -128,3 +142,164 @@ class ConnectingTCPSocketProcess(TCPSocketProcess):
     def code(self) -> T_ProcessCode:
         self.socket.bind((self.computer.get_ip(), self.src_port))
         yield from super(ConnectingTCPSocketProcess, self).code()
+
+
+@dataclass
+class HalfOpenConnection:
+    socket:         TCPSocket
+    pid:            int
+    syn_time:       T_Time
+    is_overflowing: bool = False  # whether or not it finished the handshake while the accept queue was full
+
+
+@dataclass
+class ListenStats:
+    syns_received:          int = 0
+    syns_dropped:           int = 0  # because the queues were full
+    handshake_timeouts:     int = 0
+    failed_handshakes:      int = 0  # the connection was reset before it finished the handshake
+    accept_queue_overflows: int = 0
+    accepted:               int = 0
+
+    def __repr__(self) -> str:
+        return f"syns: {self.syns_received} dropped: {self.syns_dropped} timeouts: {self.handshake_timeouts} " \
+            f"failed: {self.failed_handshakes} accept queue overflows: {self.accept_queue_overflows} accepted: {self.accepted}"
+
+
+class TCPListenerProcess(Process):
+    """
+    The kernel side of a listening TCP socket.
+    Every SYN that arrives to the port gets a new socket, and its handshake runs in its own `ListeningTCPSocketProcess` -
+    so many clients can connect at the same time.
+    The connections that are in the middle of the handshake are in the SYN queue, the ones that finished it wait in the
+    accept queue until the listening socket accepts them.
+    When one of the queues is full, new SYNs are dropped (and counted) - and half-open connections are dropped after a
+    timeout - so a SYN flood cannot use up the server.
+    """
+    def __init__(self,
+                 pid: int,
+                 computer: Computer,
+                 socket: TCPSocket,
+                 backlog: int = PROTOCOLS.TCP.LISTEN.DEFAULT_BACKLOG,
+                 syn_backlog: int = PROTOCOLS.TCP.LISTEN.DEFAULT_SYN_BACKLOG) -> None:
+        """
+        Initiates the process with the listening socket and the running computer
+        :param socket: the listening `TCPSocket`
+        :param backlog: the maximum amount of connections in the accept queue
+        :param syn_backlog: the maximum amount of connections in the SYN queue
+        """
+        super(TCPListenerProcess, self).__init__(pid, computer)
+        self.socket = socket
+        self.backlog = backlog
+        self.syn_backlog = syn_backlog
+
+        self.syn_queue: Dict[Tuple[IPAddress, T_Port], HalfOpenConnection] = {}
+        self.accept_queue: Deque[TCPSocket] = deque()
+        self.stats = ListenStats()
+
+    @property
+    def bound_address(self) -> Tuple[IPAddress, T_Port]:
+        return self.socket.bound_address
+
+    def _is_new_syn(self, packet: Packet) -> bool:
+        """
+        Whether or not the packet is a SYN to the listening port, from a connection that is not in the SYN queue
+        """
+        _, port = self.bound_address
+        return bool(
+            "TCP" in packet and
+            packet.is_valid() and
+            packet["TCP"].flags == OPCODES.TCP.SYN and
+            packet["TCP"].dst_port == port and
+            self.computer.has_this_ip(packet["IP"].dst_ip) and
+            (packet["IP"].src_ip, packet["TCP"].src_port) not in self.syn_queue
+        )
+
+    def _handle_syn(self, syn: Packet) -> None:
+        """
+        Starts the handshake of a new connection in its own socket and process - if there is room for it in the queues
+        """
+        self.stats.syns_received += 1
+        if len(self.syn_queue) >= self.syn_backlog or len(self.accept_queue) >= self.backlog:
+            self.stats.syns_dropped += 1
+            return
+
+        src_ip, src_port = syn["IP"].src_ip, syn["TCP"].src_port
+        _, port = self.bound_address
+
+        socket = self.computer.get_tcp_socket(self.socket.acquiring_process_pid)
+        socket_data = self.computer.sockets[socket]
+        socket_data.local_ip_address, socket_data.local_port = syn["IP"].dst_ip, port
+        socket_data.remote_ip_address, socket_data.remote_port = src_ip, src_port
+        socket_data.state = COMPUTER.SOCKETS.STATES.SYN_RECEIVED
+        socket.is_bound = True  # the port is already bound by the listening socket
+
+        pid = self.computer.process_scheduler.start_kernelmode_process(ListeningTCPSocketProcess, socket, self.bound_address, syn)
+        socket.socket_handling_kernelmode_pid = pid
+        self.syn_queue[(src_ip, src_port)] = HalfOpenConnection(socket, pid, MainLoop.get_time())
+
+    def _drop(self, connection: HalfOpenConnection) -> None:
+        """
+        Silently drops a half-open connection - its process and its socket
+        """
+        connection.socket.close()
+        if self.computer.process_scheduler.is_process_running(connection.pid, COMPUTER.PROCESSES.MODES.KERNELMODE):
+            self.computer.process_scheduler.terminate_process_by_pid(connection.pid, COMPUTER.PROCESSES.MODES.KERNELMODE)
+        if connection.socket in self.computer.sockets:
+            self.computer.remove_socket(connection.socket)
+
+    def _update_syn_queue(self) -> None:
+        """
+        Moves the connections that finished their handshake to the accept queue (if there is room in it),
+        and drops the ones that failed or took too long.
+        """
+        for key, connection in list(self.syn_queue.items()):
+            if connection.socket.is_connected:
+                if len(self.accept_queue) < self.backlog:
+                    self.accept_queue.append(connection.socket)
+                    del self.syn_queue[key]
+                elif not connection.is_overflowing:
+                    connection.is_overflowing = True
+                    self.stats.accept_queue_overflows += 1
+                continue
+
+            if connection.socket.is_closed or \
+                    not self.computer.process_scheduler.is_process_running(connection.pid, COMPUTER.PROCESSES.MODES.KERNELMODE):
+                self.stats.failed_handshakes += 1
+            elif MainLoop.get_time_since(connection.syn_time) > PROTOCOLS.TCP.LISTEN.HANDSHAKE_TIMEOUT:
+                self.stats.handshake_timeouts += 1
+            else:
+                continue
+
+            self._drop(connection)
+            del self.syn_queue[key]
+
+    def accept(self) -> Optional[TCPSocket]:
+        """
+        Returns the next connection that finished its handshake - or None if there is none
+        """
+        if not self.accept_queue:
+            return None
+        self.stats.accepted += 1
+        return self.accept_queue.popleft()
+
+    def code(self) -> T_ProcessCode:
+        while not self.socket.is_closed:
+            received_packets = yield WaitingFor(self._is_new_syn, timeout=Timeout(PROTOCOLS.TCP.LISTEN.QUEUES_CHECK_INTERVAL))
+            for packet in received_packets.packets:
+                self._handle_syn(packet)
+            self._update_syn_queue()
+
+        for connection in self.syn_queue.values():
+            self._drop(connection)
+        self.syn_queue.clear()
+        for socket in self.accept_queue:
+            socket.close()
+        self.accept_queue.clear()
+
+    def __repr__(self) -> str:
+        """
+        The string representation of the process (also the process name in `ps`)
+        """
+        _, local_port = self.bound_address
+        return f"[ktcplisten] {local_port}"
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Generator
 
 from NetSym.address.ip_address import IPAddress
 from NetSym.address.mac_address import MACAddress
-from NetSym.computing.internals.processes.abstracts.process import Process, T_ProcessCode
-from NetSym.consts import OPCODES, PORTS, PROTOCOLS
+from NetSym.computing.internals.processes.abstracts.process import Process, T_ProcessCode, WaitingFor, Timeout
+from NetSym.consts import OPCODES, PORTS, PROTOCOLS, T_Time
 from NetSym.exceptions import *
+from NetSym.gui.main_loop import MainLoop
 from NetSym.packets.all import DHCP, BOOTP, IP, UDP
 from NetSym.usefuls.funcs import get_the_one_with_raise
 
@@ -17,6 +19,28 @@ if TYPE_CHECKING:
     from NetSym.computing.computer import Computer
 
 
+@dataclass
+class BoundLease:
+    """
+    The address that the client received from a DHCP server, and what it needs in order to renew or release it.
+    """
+    socket:     RawSocket
+    server_mac: MACAddress
+    server_ip:  IPAddress
+    ip:         IPAddress
+    lease_time: T_Time
+    bound_time: T_Time
+
+    @property
+    def expiration_time(self) -> T_Time:
+        return self.bound_time + self.lease_time
+
+    @property
+    def renewal_time(self) -> T_Time:
+        """T1 - the time the client starts renewing the lease (half of the lease time)"""
+        return self.bound_time + (self.lease_time / 2)
+
+
 class DHCPClientProcess(Process):
     """
     This is the process of discovering the DHCP server, receiving an IP address,
@@ -29,6 +53,9 @@ class DHCPClientProcess(Process):
         2) DHCP offer - the server offers the client an IP address
         3) DHCP request - the client accepts the IP address that was offered to it and requests it for itself.
         4) DHCP pack - the server sends the final IP address, default gateway and DNS server to the client.
+
+    If the pack contains a lease time, the process keeps running and renews the lease (by sending the server another request)
+    once half of it has passed. If the lease expires without being renewed, the address is dropped and the client starts over.
     """
 
     # __init__ is inherited from the parent class
@@ -36,6 +63,7 @@ class DHCPClientProcess(Process):
     def __init__(self, pid: int, computer: Computer) -> None:
         super(DHCPClientProcess, self).__init__(pid, computer)
         self.sockets: List[RawSocket] = []
+        self.lease: Optional[BoundLease] = None
 
     def update_routing_table(self, session_interface: NetworkInterface, dhcp_pack: Packet) -> None:
         """
@@ -81,6 +109,94 @@ class DHCPClientProcess(Process):
                                                              ('requested_addr', requested_ip),
                                                              ('server_id', server_ip)]))
 
+    @staticmethod
+    def build_dhcp_release(server_mac: MACAddress,
+                           session_interface: NetworkInterface,
+                           server_ip: IPAddress,
+                           released_ip: IPAddress) -> Packet:
+        """
+        Sends a `DHCP_RELEASE` that gives the address back to the server that leased it.
+        This is sent by the DHCP client.
+        :param server_mac: The `MACAddress` of the DHCP server.
+        :param session_interface: The `CableNetworkInterface` that holds the address.
+        :param server_ip: The `IPAddress` of the server
+        :param released_ip: The `IPAddress` that the client stops using
+        """
+        return session_interface.ethernet_wrap(server_mac,
+                                               IP(src_ip=str(released_ip), dst_ip=str(server_ip), ttl=PROTOCOLS.DHCP.DEFAULT_TTL) /
+                                               UDP(src_port=PORTS.DHCP_CLIENT, dst_port=PORTS.DHCP_SERVER) /
+                                               BOOTP(opcode=OPCODES.BOOTP.REQUEST,
+                                                     client_mac=session_interface.mac.as_bytes(),
+                                                     client_ip=str(released_ip)) /
+                                               DHCP(options=[('message-type', OPCODES.DHCP.RELEASE),
+                                                             ('server_id', server_ip)]))
+
+    def release(self) -> None:
+        """
+        Give the address back to the server that leased it and stop using it (like `dhclient -r`)
+        """
+        if self.lease is None:
+            return
+
+        interface = self.lease.socket.get_interface()
+        self.lease.socket.send(self.build_dhcp_release(self.lease.server_mac, interface, self.lease.server_ip, self.lease.ip))
+        self.computer.remove_ip(interface)
+        self.lease = None
+
+    @staticmethod
+    def _receive_pack(socket: RawSocket) -> Optional[Packet]:
+        """
+        Returns the `DHCP_PACK` among the packets the socket received, or None if there is none.
+        """
+        for returned_packet in socket.receive():
+            for packet in returned_packet.packets:
+                if packet["DHCP"].parsed_options.message_type == OPCODES.DHCP.PACK:
+                    return packet
+        return None
+
+    def _wait_for_pack(self, socket: RawSocket, timeout: T_Time) -> Generator[WaitingFor, None, Optional[Packet]]:
+        """
+        Waits until the socket receives a `DHCP_PACK` or until the timeout passes (then None is returned)
+        """
+        deadline = MainLoop.get_time() + timeout
+        while True:
+            ready_socket = yield from self.computer.select_with_timeout([socket], timeout=deadline - MainLoop.get_time())
+            if ready_socket is None:
+                return None
+
+            pack = self._receive_pack(socket)
+            if pack is not None:
+                return pack
+
+    def _renew_lease(self) -> T_ProcessCode:
+        """
+        Keeps renewing the lease with the server that gave it, starting at half of the lease time.
+        If the server does not answer, the request is sent again halfway through the time that is left until the lease expires.
+        Returns once the lease expired without being renewed.
+        """
+        lease = self.lease
+        if lease is None:
+            return
+
+        next_request_time = lease.renewal_time
+        while MainLoop.get_time() < lease.expiration_time:
+            yield WaitingFor(lambda: False, timeout=Timeout(next_request_time - MainLoop.get_time()))
+
+            interface = lease.socket.get_interface()
+            lease.socket.receive()  # whatever arrived while the lease was held is not an answer to this request
+            lease.socket.send(self.build_dhcp_request(lease.server_mac, interface, lease.server_ip, lease.ip))
+
+            time_left = lease.expiration_time - MainLoop.get_time()
+            retry_time = min(time_left, max(time_left / 2, PROTOCOLS.DHCP.MIN_RENEWAL_RETRY_TIME))
+            next_request_time = MainLoop.get_time() + retry_time
+            pack = yield from self._wait_for_pack(lease.socket, retry_time)
+            if pack is None:
+                continue
+
+            lease.bound_time = MainLoop.get_time()
+            lease.lease_time = pack["DHCP"].parsed_options.get('lease_time', lease.lease_time)
+            next_request_time = lease.renewal_time
+
     def code(self) -> T_ProcessCode:
         """
         This is main code of the DHCP client.
@@ -90,8 +206,25 @@ class DHCPClientProcess(Process):
             socket = self.computer.get_raw_socket(self.pid)
             socket.bind(lambda p: "DHCP" in p and p["Ether"].dst_mac in self.computer.macs, interface)
             self.sockets.append(socket)
+
+        while True:
+            yield from self._ask_for_lease()
+            if self.lease is None:
+                return  # the server did not limit the time of the lease
+
+            yield from self._renew_lease()
+            self.computer.print("DHCP lease expired!")
+            self.computer.remove_ip(self.lease.socket.get_interface())
+            self.lease = None
+
+    def _ask_for_lease(self) -> T_ProcessCode:
+        """
+        Discovers a DHCP server and receives an address from it (and a gateway and a DNS server).
+        If the server supplied a lease time, `self.lease` is set.
+        """
         self.computer.print("Asking For DHCP...")
         for socket in self.sockets:
+            socket.receive()
             socket.send(self.build_dhcp_discover(socket.get_interface()))
 
         ready_socket = yield from self.computer.select(self.sockets)
@@ -115,6 +248,17 @@ class DHCPClientProcess(Process):
         self.computer.arp_grat(session_interface)
         self.computer.print("Got Address from DHCP!")
 
+        lease_time = dhcp_pack.packet["DHCP"].parsed_options.get('lease_time', None)
+        if lease_time is not None:
+            self.lease = BoundLease(
+                socket=    session_socket,
+                server_mac=dhcp_offer["Ether"].src_mac,
+                server_ip= IPAddress(dhcp_offer["IP"].src_ip),
+                ip=        IPAddress.copy(session_interface.get_ip()),
+                lease_time=lease_time,
+                bound_time=MainLoop.get_time(),
+            )
+
     def __repr__(self) -> str:
         """The string representation of the the process"""
         return "dhcpcd"
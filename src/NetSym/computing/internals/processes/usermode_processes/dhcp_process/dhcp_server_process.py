@@ -4,9 +4,10 @@ from typing import TYPE_CHECKING, Optional, NamedTuple, Dict, List
 
 from NetSym.address.ip_address import IPAddress
 from NetSym.address.mac_address import MACAddress
+from NetSym.computing.internals.network_data_structures.dhcp_lease_database import DHCPLeaseDatabase
 from NetSym.computing.internals.processes.abstracts.process import Process, T_ProcessCode
 from NetSym.computing.internals.sockets.raw_socket import RawSocket
-from NetSym.consts import OPCODES, PORTS, PROTOCOLS
+from NetSym.consts import OPCODES, PORTS, PROTOCOLS, T_Time
 from NetSym.exceptions import *
 from NetSym.packets.all import DHCP, BOOTP, IP, UDP
 from NetSym.packets.usefuls.dns import T_Hostname
@@ -31,6 +32,9 @@ class DHCPServerProcess(Process):
     accordingly.
 
     The stages of DHCP are: discover, offer, request and pack
+
+    The addresses that are handed out are tracked in a `DHCPLeaseDatabase` - clients that return get their lease back,
+    and addresses of leases that were released or expired are offered again.
     """
 
     def __init__(self,
@@ -53,23 +57,38 @@ class DHCPServerProcess(Process):
 
         self.interface_to_dhcp_data: Dict[NetworkInterface, DHCPData] = {}
         # ^ a mapping for each interface of the server to a ip_layer that it packs for its clients.
+        self.lease_database = DHCPLeaseDatabase()
         self.update_server_data()
 
-        self.in_session_with: Dict[MACAddress, IPAddress] = {}  # {mac : offered_ip}
-
         self.sockets: List[RawSocket] = []
 
     def update_server_data(self) -> None:
         """
         It updates the `self.interface_to_dhcp_data` dictionary according to this computer's interfaces.
         This is called if for example one of the computer's interfaces is updated in the middle of the process.
+        The address pool of an interface whose IP address was changed is rebuilt (and its leases are forgotten).
         :return: None
         """
-        self.interface_to_dhcp_data = {
-            interface: DHCPData(IPAddress.copy(interface.get_ip()),
-                                self.default_gateway.same_subnet_interfaces(interface.get_ip())[0].get_ip(), None)
-            for interface in self.computer.interfaces if interface.has_ip()
-        }
+        self.interface_to_dhcp_data = {}
+        for interface in self.computer.interfaces:
+            if interface.has_ip():
+                self._add_interface(interface)
+
+        for interface in list(self.lease_database.pools):
+            if interface not in self.interface_to_dhcp_data:
+                self.lease_database.remove_pool(interface)
+
+    def _add_interface(self, interface: NetworkInterface) -> None:
+        """
+        Start serving DHCP on an interface that has an IP address.
+        The address pool of the interface is only rebuilt if it does not exist yet or if the interface changed its address.
+        """
+        given_gateway = self.default_gateway.same_subnet_interfaces(interface.get_ip())[0].get_ip()
+        self.interface_to_dhcp_data[interface] = DHCPData(IPAddress.copy(interface.get_ip()), given_gateway, None)
+
+        pool = self.lease_database.pools.get(interface)
+        if pool is None or repr(pool.server_ip) != repr(interface.get_ip()):
+            self.lease_database.add_pool(interface, reserved=[given_gateway])
 
     def raise_on_unknown_packet(self, packet: Packet, interface: NetworkInterface) -> None:
         """When a DHCP packet with an unknown opcode is received"""
@@ -98,9 +117,11 @@ class DHCPServerProcess(Process):
                         offered_gateway: IPAddress,
                         session_interface: NetworkInterface,
                         dns_server: Optional[IPAddress] = None,
-                        domain: Optional[T_Hostname] = None) -> Packet:
+                        domain: Optional[T_Hostname] = None,
+                        lease_time: Optional[T_Time] = None) -> Packet:
         """
         Sends a `DHCP_PACK` that tells the DHCP client all of the new ip_layer it needs to update (IP, gateway, DNS)
+        :param lease_time: the amount of seconds the client may use the address before it must renew it
         :param domain:
         :param dns_server: the domain name server to be supplied to clients
         :param client_mac: The `MACAddress` of the client.
@@ -114,6 +135,7 @@ class DHCPServerProcess(Process):
             ('router',         str(offered_gateway)),
             *([('name_server', str(dns_server))] if dns_server is not None else []),
             *([('domain',      str(domain))] if domain is not None else []),
+            *([('lease_time',  int(lease_time))] if lease_time is not None else []),
         ]
 
         return session_interface.ethernet_wrap(client_mac,
@@ -127,19 +149,39 @@ class DHCPServerProcess(Process):
     def send_pack(self, request_packet: Packet, interface: NetworkInterface) -> None:
         """
         Sends the `DHCP_PACK` packet to the destination with all of the details the client had requested.
+        This binds the lease of the client (or renews it, if the client already holds it).
+        A request that was meant for another server releases the address this server had offered.
         """
         client_mac = request_packet["Ether"].src_mac
+        options = request_packet["DHCP"].parsed_options
+
+        server_id = options.get('server_id', None)
+        if server_id is not None and IPAddress(server_id).string_ip != interface.get_ip().string_ip:
+            self.lease_database.release(client_mac)
+            return
+
+        requested_ip = options.get('requested_addr', None)
+        lease = self.lease_database.bind(client_mac, interface, IPAddress(requested_ip) if requested_ip is not None else None)
+        if lease is None:
+            self.computer.print(f"Could not give {requested_ip} to {client_mac}")
+            return
 
         socket = get_the_one_with_raise(self.sockets, lambda s: bool(s.interface == interface), ThisCodeShouldNotBeReached)
         socket.send(self.build_dhcp_pack(
             client_mac,
-            offered_ip=self.in_session_with[client_mac],
+            offered_ip=IPAddress.copy(lease.ip),
             offered_gateway=self.interface_to_dhcp_data[interface].given_gateway,
             session_interface=interface,
             dns_server=self.dns_server,
             domain=self.domain,
+            lease_time=self.lease_database.lease_time,
         ))
-        del self.in_session_with[client_mac]
+
+    def release(self, release_packet: Packet, interface: NetworkInterface) -> None:
+        """
+        This is called when a client gives up its address. The address returns to the pool of the interface.
+        """
+        self.lease_database.release(release_packet["Ether"].src_mac)
 
     def send_offer(self, discover_packet: Packet, interface: NetworkInterface) -> None:
         """
@@ -149,30 +191,31 @@ class DHCPServerProcess(Process):
         :param interface: the `CableNetworkInterface` that is currently serving the DHCP.
         """
         client_mac = discover_packet["Ether"].src_mac
-        offered = self.offer_ip(interface)
+        try:
+            offered = self.offer_ip(interface, client_mac)
+        except DHCPPoolExhaustedError:
+            self.computer.print(f"No addresses left to give {client_mac}!")
+            return
 
-        self.in_session_with[client_mac] = IPAddress.copy(offered)
         socket = get_the_one_with_raise(self.sockets, lambda s: bool(s.interface == interface), ThisCodeShouldNotBeReached)
         socket.send(self.build_dhcp_offer(client_mac, offered, interface))
 
-    def offer_ip(self, interface: NetworkInterface) -> IPAddress:
+    def offer_ip(self, interface: NetworkInterface, client_mac: MACAddress) -> IPAddress:
         """
-        Offers the next available IP address for a new client, based on the `CableNetworkInterface` that is serving the DHCP.
+        Offers an IP address for a client, based on the `CableNetworkInterface` that is serving the DHCP.
+        A client that already holds a lease is offered its address again, others get the lowest free address of the pool.
+        If the pool is full, `DHCPPoolExhaustedError` is raised.
         :param interface: the `CableNetworkInterface` that the request came from (to know the subnet)
+        :param client_mac: the `MACAddress` of the client
         :return: The offered `IPAddress` object.
         """
-        try:
-            offered = self.interface_to_dhcp_data[interface].given_ip
-            offered.increase()
-            return IPAddress.copy(offered)
-        except KeyError:  # if the interface was created after the start of this process.
+        if interface not in self.interface_to_dhcp_data:  # if the interface was created after the start of this process.
             if not interface.has_ip():
                 raise AddressError("The interface cannot serve DHCP because it has no IP address!")
 
-            self.interface_to_dhcp_data[interface] = DHCPData(IPAddress.copy(interface.get_ip()),
-                                                              self.default_gateway.same_subnet_interfaces(interface.get_ip())[0].get_ip(), None)
+            self._add_interface(interface)
             self._bind_interface_to_socket(interface)
-            return self.offer_ip(interface)
+        return self.lease_database.offer(client_mac, interface)
 
     def code(self) -> T_ProcessCode:
         """
@@ -186,6 +229,7 @@ class DHCPServerProcess(Process):
         while True:
             ready_socket = yield from self.computer.select_with_timeout(self.sockets, timeout=PROTOCOLS.DHCP.NEW_INTERFACE_DETECTION_TIMEOUT)
             self._detect_new_interfaces()
+            self.lease_database.expire_leases()
             if ready_socket is None:
                 continue  # This means `select` ended due to timeout!
 
@@ -198,7 +242,8 @@ class DHCPServerProcess(Process):
                         self.computer.print("Cannot server DHCP without an IP address!")
                         continue
                     {OPCODES.DHCP.DISCOVER: self.send_offer,
-                     OPCODES.DHCP.REQUEST: self.send_pack}.get(
+                     OPCODES.DHCP.REQUEST: self.send_pack,
+                     OPCODES.DHCP.RELEASE: self.release}.get(
                         packet["DHCP"].parsed_options.message_type,
                         self.raise_on_unknown_packet
                     )(packet, interface)
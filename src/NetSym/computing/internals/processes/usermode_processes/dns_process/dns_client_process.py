@@ -1,48 +1,58 @@
 from __future__ import annotations
 
 import json
-from typing import TYPE_CHECKING, Tuple, Optional, cast
+from typing import TYPE_CHECKING, Tuple, Optional, List, Union, Generator, Any
 
 import scapy
 from scapy.layers.dns import dnstypes
 
 from NetSym.address.ip_address import IPAddress
-from NetSym.computing.internals.processes.abstracts.process import Process, T_ProcessCode
+from NetSym.computing.internals.processes.abstracts.process import Process, T_ProcessCode, WaitingFor
 from NetSym.computing.internals.processes.abstracts.process_internal_errors import ProcessInternalError_DNSNameErrorFromServer, \
     ProcessInternalError_NoResponseForDNSQuery
 from NetSym.consts import OPCODES, PROTOCOLS, T_Time, T_Port, PORTS
+from NetSym.exceptions import SocketNotRegisteredError
+from NetSym.gui.main_loop import MainLoop
 from NetSym.packets.all import DNS
 from NetSym.packets.usefuls.dns import list_to_dns_query, DNSQueryRecord
 
 if TYPE_CHECKING:
-    from NetSym.computing.internals.sockets.udp_socket import UDPSocket
+    from NetSym.computing.internals.sockets.udp_socket import UDPSocket, ReturnedUDPPacket
     from NetSym.computing.computer import Computer
 
 
-SERVER_ADDRESS_IP_INDEX = 0
-
-
 class DNSClientProcess(Process):
     """
     A Domain Name Server process - will resolve a display name to an IPAddress if a client requests
+
+    If multiple servers are supplied, they are asked according to the policy (one of `PROTOCOLS.DNS.RESOLVER_POLICIES`):
+        sequential - one after the other, each until it times out, until one of them answers
+        parallel   - all of them at once, the first answer wins
+    Servers that timed out recently (according to `computer.nameserver_health`) are asked last.
     """
     def __init__(self,
                  pid: int,
                  computer: Computer,
-                 server_ip: Optional[IPAddress],
+                 server_ips: Union[Optional[IPAddress], List[IPAddress]],
                  name_to_resolve: str,
                  default_query_timeout: T_Time = PROTOCOLS.DNS.CLIENT_QUERY_TIMEOUT,
                  default_retry_count: int = PROTOCOLS.DNS.DEFAULT_RETRY_COUNT,
                  server_port: T_Port = PORTS.DNS,
-                 output_result_to_path: Optional[str] = None) -> None:
+                 output_result_to_path: Optional[str] = None,
+                 policy: str = PROTOCOLS.DNS.RESOLVER_POLICIES.SEQUENTIAL) -> None:
         """
         Creates the new process
         :param pid: The process ID of this process
         :param computer: The computer that runs this process
-        :param server_ip: the IPAddress of the server
+        :param server_ips: the IPAddress of the server, or a list of addresses of servers
+        :param policy: how multiple servers are asked
         """
         super(DNSClientProcess, self).__init__(pid, computer)
-        self._server_address = (server_ip, server_port)
+        if not isinstance(server_ips, list):
+            server_ips = [server_ips] if server_ips else []
+        self._server_ips: List[IPAddress] = server_ips
+        self._server_port = server_port
+        self._policy = policy
         self._name_to_resolve = name_to_resolve
 
         self.socket: Optional[UDPSocket] = None
@@ -51,6 +61,14 @@ class DNSClientProcess(Process):
 
         self._output_file = output_result_to_path
 
+    @property
+    def longest_resolution_time(self) -> T_Time:
+        """
+        The time it takes to give up on the name - when none of the servers answer.
+        """
+        attempts_per_retry = 1 if self._policy == PROTOCOLS.DNS.RESOLVER_POLICIES.PARALLEL else len(self._server_ips)
+        return self._query_timeout * self._retry_count * attempts_per_retry
+
     def _dns_format_print(self, message: str) -> None:
         """
         Print to computer console with a DNS prefix
@@ -69,10 +87,14 @@ class DNSClientProcess(Process):
             self._dns_format_print(f"Name invalid! '{self._name_to_resolve}'")
             return False
 
-        if self._server_address[SERVER_ADDRESS_IP_INDEX]:
+        if not self._server_ips:
             self._dns_format_print(f"No DNS server configured!")
             return False
 
+        if self._policy not in [PROTOCOLS.DNS.RESOLVER_POLICIES.SEQUENTIAL, PROTOCOLS.DNS.RESOLVER_POLICIES.PARALLEL]:
+            self._dns_format_print(f"Unknown resolver policy '{self._policy}'")
+            return False
+
         return True
 
     def _build_dns_query(self, name_to_resolve: str, is_recursion_desired: bool = True) -> scapy.packet.Packet:
@@ -151,6 +173,35 @@ class DNSClientProcess(Process):
         if dnstypes.get(record_type, record_type) == OPCODES.DNS.TYPES.HOST_ADDRESS:
             self._dns_format_print(f"\nAnswer:\n{ip_address}")
 
+    def _query_servers(self, server_ips: List[IPAddress]) -> Generator[WaitingFor, Any, Optional[bytes]]:
+        """
+        Send the query to all of the supplied servers and wait for the first answer.
+        Answers from other servers (late answers to previous attempts for example) are ignored.
+        The health of the servers is updated according to whether or not they answered in time.
+        :return: the answer, or None if no server answered in time
+        """
+        if self.socket is None:
+            raise SocketNotRegisteredError("Do not call this method without initiating the socket first!")
+
+        for server_ip in server_ips:
+            self.socket.sendto(self._build_dns_query(self._name_to_resolve), (server_ip, self._server_port))
+        sending_time = MainLoop.get_time()
+
+        received: List[ReturnedUDPPacket] = []
+        while not received:
+            time_left = self._query_timeout - MainLoop.get_time_since(sending_time)
+            if time_left <= 0:
+                for server_ip in server_ips:
+                    self.computer.nameserver_health.record_timeout(server_ip)
+                return None
+
+            yield from self.socket.block_until_received(timeout=time_left)
+            received = [returned for returned in self.socket.receivefrom() if returned.src_ip in server_ips]
+
+        answer = received[0]
+        self.computer.nameserver_health.record_answer(answer.src_ip, MainLoop.get_time_since(sending_time))
+        return answer.data
+
     def code(self) -> T_ProcessCode:
         """
         The main code of the process
@@ -161,7 +212,6 @@ class DNSClientProcess(Process):
 
         self.socket = self.computer.get_udp_socket(self.pid)
         self.socket.bind()
-        self.socket.connect(cast(Tuple[IPAddress, int], self._server_address))
 
         self._name_to_resolve = self.computer.add_default_domain_prefix_if_necessary(self._name_to_resolve)
         if self._name_to_resolve in self.computer.dns_cache:
@@ -169,15 +219,15 @@ class DNSClientProcess(Process):
         self._dns_format_print(f"Resolving name '{self._name_to_resolve}'")
 
         for _ in range(self._retry_count):
-            self.socket.send(self._build_dns_query(self._name_to_resolve))
-            yield from self.socket.block_until_received(timeout=self._query_timeout)
-
-            received = self.socket.receive()
-            if received:  # if `received` is empty - that means the socket `block_until_received` was timed out
-                dns_answer = received[0]
-                self._validate_no_error_in_dns_answer(dns_answer)
-                self._store_dns_answer(*self._extract_dns_answer(dns_answer))
-                return
+            server_ips = self.computer.nameserver_health.ordered(self._server_ips)
+            attempts = [server_ips] if self._policy == PROTOCOLS.DNS.RESOLVER_POLICIES.PARALLEL else [[ip] for ip in server_ips]
+
+            for attempt_server_ips in attempts:
+                dns_answer = yield from self._query_servers(attempt_server_ips)
+                if dns_answer is not None:
+                    self._validate_no_error_in_dns_answer(dns_answer)
+                    self._store_dns_answer(*self._extract_dns_answer(dns_answer))
+                    return
 
         self.die(
             f"ERROR: DNS server did not respond. name not resolved :(",
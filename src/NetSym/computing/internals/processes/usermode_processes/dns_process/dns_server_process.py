@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import struct
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from NetSym.address.ip_address import IPAddress
 from NetSym.computing.internals.filesystem.file import File
@@ -24,14 +24,29 @@ if TYPE_CHECKING:
 
 @dataclass
 class ActiveQueryData:
-    client_ip: IPAddress
-    client_port: T_Port
+    """
+    A name that the server is resolving, and all of the clients that are waiting for it.
+    Clients that ask for a name that is already being resolved are added here instead of starting another query.
+    """
+    clients:                 List[Tuple[IPAddress, T_Port]]
     active_query_process_id: Optional[int] = None
 
 
 T_QueryDict = Dict[T_Hostname, ActiveQueryData]
 
 
+@dataclass
+class CachedZone:
+    """
+    A parsed zone file and the version of the file that it was parsed from
+    """
+    zone_file:         File
+    file_version:      int
+    zone:              Zone
+    ends_with_newline: bool
+    # ^ so records can be appended to the file without reading it
+
+
 class DNSServerProcess(Process):
     """
     A Domain Name Server process - will resolve a display name to an IPAddress if a client requests
@@ -45,6 +60,8 @@ class DNSServerProcess(Process):
         super(DNSServerProcess, self).__init__(pid, computer)
         self.socket: Optional[UDPSocket] = None
         self._active_queries: T_QueryDict = {}
+        self.coalesced_query_count = 0
+        self._zone_cache: Dict[T_Hostname, CachedZone] = {}
 
         self.__initial_domain_names = list(map(canonize_domain_hostname, (domain_names or [])))
 
@@ -72,8 +89,19 @@ class DNSServerProcess(Process):
         return self.computer.filesystem.file_at_absolute_path(self._zone_file_path_by_domain_name(domain_name))
 
     def _zone_by_domain_name(self, domain_name: T_Hostname) -> Zone:
-        with self._zone_file_by_domain_name(domain_name) as zone_file:
-            return Zone.from_file_format(zone_file.read())
+        """
+        The parsed zone of the domain.
+        The zone file is only parsed again if it was changed (or replaced) since the last time it was parsed.
+        """
+        domain_name = canonize_domain_hostname(domain_name)
+        zone_file = self._zone_file_by_domain_name(domain_name)
+
+        cached = self._zone_cache.get(domain_name)
+        if cached is None or cached.zone_file is not zone_file or cached.file_version != zone_file.version:
+            with zone_file as f:
+                content = f.read()
+            cached = self._zone_cache[domain_name] = CachedZone(zone_file, zone_file.version, Zone.from_file_format(content), content.endswith('\n'))
+        return cached.zone
 
     def _is_query_valid(self, query_bytes: bytes) -> bool:
         """
@@ -122,7 +150,7 @@ class DNSServerProcess(Process):
 
     def _is_active_client(self, client_ip: IPAddress, client_port: T_Port) -> bool:
         """Returns whether or not a client with this IP and port currently has an active query """
-        return any(client.client_ip == client_ip and client.client_port == client_port for client in self._active_queries.values())
+        return any((client_ip, client_port) in query.clients for query in self._active_queries.values())
 
     def _get_resolved_names(self) -> T_QueryDict:
         """
@@ -139,9 +167,10 @@ class DNSServerProcess(Process):
         if self.socket is None:
             raise SocketNotRegisteredError("Do not call this method without initiating the socket first!")
 
-        for item_name, client in query_dict.items():
+        for item_name, query in query_dict.items():
             del self._active_queries[item_name]
-            self.socket.sendto(self._build_dns_answer(item_name, self.computer.dns_cache[item_name].ttl), (client.client_ip, client.client_port))
+            for client_address in query.clients:
+                self.socket.sendto(self._build_dns_answer(item_name, self.computer.dns_cache[item_name].ttl), client_address)
 
     def _send_error_messages_to_timed_out_clients(self) -> None:
         """
@@ -150,14 +179,15 @@ class DNSServerProcess(Process):
         if self.socket is None:
             raise SocketNotRegisteredError("Do not call this method without initiating the socket first!")
 
-        timed_out_clients = {hostname: client for hostname, client in self._active_queries.items()
-                             if client.active_query_process_id is not None and
-                                not self.computer.process_scheduler.is_usermode_process_running(client.active_query_process_id) and
+        timed_out_queries = {hostname: query for hostname, query in self._active_queries.items()
+                             if query.active_query_process_id is not None and
+                                not self.computer.process_scheduler.is_usermode_process_running(query.active_query_process_id) and
                                 not self.computer.filesystem.exists(default_tmp_query_output_file_path(hostname))}
 
-        for hostname, client in timed_out_clients.items():
+        for hostname, query in timed_out_queries.items():
             del self._active_queries[hostname]
-            self.socket.sendto(self._build_dns_error(), (client.client_ip, client.client_port))
+            for client_address in query.clients:
+                self.socket.sendto(self._build_dns_error(), client_address)
 
     def _start_single_dns_query(self, name: T_Hostname, dns_server: IPAddress) -> None:
         """
@@ -206,47 +236,32 @@ class DNSServerProcess(Process):
     @staticmethod
     def _find_longest_matching_ns_record(name: T_Hostname, zone: Zone) -> Optional[ZoneRecord]:
         """
-        Goes over all of the zone records which are A-s or CNAME-s
-        Finds the one that is most fitting for the name supplied
-
-        Returns (longest_record, longest_record_data) - the data is returned separately because if record is an alias -
-            the data will be different than in the original record!
+        Finds the NS or CNAME record that is most fitting for the name supplied (the one with the longest matching name)
+        If none is longer than the first record that matches the name - that record is returned.
 
-        If no sufficient records are found - returns (None, None)
+        If no sufficient records are found - returns None
         """
-        longest_record: Optional[ZoneRecord] = None
-
-        for record in zone:
-            if does_domain_hostname_end_with(name, record.record_name, zone_origin=zone.origin):
-                if longest_record is None:
-                    longest_record = record
-                    continue
-
-                if (len(canonize_domain_hostname(record.record_name,        zone.origin)) >
-                   len(canonize_domain_hostname(longest_record.record_name, zone.origin))):
-                    if record.record_type in [OPCODES.DNS.TYPES.CANONICAL_NAME_FOR_AN_ALIAS,
-                                              OPCODES.DNS.TYPES.AUTHORITATIVE_NAME_SERVER]:
-                        longest_record = record
-        return longest_record
+        return zone.longest_matching_name_server_record(name)
 
     @staticmethod
     def _get_exact_host_record(name: T_Hostname, zone: Zone) -> Optional[ZoneRecord]:
         """
-        Goes over the Zone file and returns the record that fits the supplied name exactly
+        Returns the A or CNAME record of the zone that fits the supplied name exactly
         If one does not exist - return None
         """
-        for record in zone:
-            if (canonize_domain_hostname(record.record_name, zone.origin) == canonize_domain_hostname(name)) and \
-                    (record.record_type in [OPCODES.DNS.TYPES.CANONICAL_NAME_FOR_AN_ALIAS,
-                                            OPCODES.DNS.TYPES.HOST_ADDRESS]):
-                return record
-        return None
+        return zone.exact_host_record(name)
 
     def _resolve_name(self, name: T_Hostname, client_ip: IPAddress, client_port: T_Port) -> None:
         """
         Start doing everything that is required in order to resolve the supplied domain name
+        If the name is already being resolved - the client just waits for the same answer
         """
-        self._active_queries[name] = ActiveQueryData(client_ip, client_port)
+        if name in self._active_queries:
+            self._active_queries[name].clients.append((client_ip, client_port))
+            self.coalesced_query_count += 1
+            return
+
+        self._active_queries[name] = ActiveQueryData([(client_ip, client_port)])
 
         if name in self.computer.dns_cache:
             return  # name is known - no need to resolve :)
@@ -335,23 +350,27 @@ class DNSServerProcess(Process):
     def add_dns_record(self, name: T_Hostname, ip_address: IPAddress, domain_name: Optional[T_Hostname] = None) -> None:
         """
         Add a mapping between an ip and a name in the supplied domain's zone file
+        The record is added to the cached zone and appended to the file, so the zone is not parsed again.
         """
         if domain_name is None:
             if len(self.domain_names) > 1:
                 raise WrongUsageError(f"Must supply domain_name if server hosts multiple zones")
             domain_name, = self.domain_names
+        domain_name = canonize_domain_hostname(domain_name)
 
-        with self._zone_file_by_domain_name(domain_name) as zone_file:
-            parsed_zone_file = Zone.from_file_format(zone_file.read())
-            parsed_zone_file.records.append(
-                ZoneRecord(
-                    name,
-                    OPCODES.DNS.CLASSES.INTERNET,
-                    OPCODES.DNS.TYPES.HOST_ADDRESS,
-                    ip_address.string_ip
-                )
-            )
-            zone_file.write(parsed_zone_file.to_file_format())
+        record = ZoneRecord(
+            name,
+            OPCODES.DNS.CLASSES.INTERNET,
+            OPCODES.DNS.TYPES.HOST_ADDRESS,
+            ip_address.string_ip
+        )
+        zone = self._zone_by_domain_name(domain_name)
+        zone.add_record(record)
+
+        cached = self._zone_cache[domain_name]
+        with cached.zone_file as zone_file:
+            zone_file.append(('' if cached.ends_with_newline else '\n') + Zone.record_to_file_format(record) + '\n')
+        self._zone_cache[domain_name] = CachedZone(zone_file, zone_file.version, zone, ends_with_newline=True)
 
     def add_or_remove_zone(self, domain_name: T_Hostname) -> None:
         """
@@ -363,6 +382,7 @@ class DNSServerProcess(Process):
         if domain_name in self.domain_names:
             # remove
             self.domain_names.remove(domain_name)
+            self._zone_cache.pop(domain_name, None)
             self.computer.filesystem.delete_file(self._zone_file_path_by_domain_name(domain_name))
 
         else:
@@ -374,8 +394,7 @@ class DNSServerProcess(Process):
         """
 
         """
-        hostname = [hostname for hostname, client in self._active_queries.items()
-                    if client.client_ip == client_ip and client.client_port == client_port][0]
+        hostname = [hostname for hostname, query in self._active_queries.items() if (client_ip, client_port) in query.clients][0]
 
         self._active_queries[hostname].active_query_process_id = 0
         # ^ This PID does not exist - This is considered a timed out process - so they will be sent an error message
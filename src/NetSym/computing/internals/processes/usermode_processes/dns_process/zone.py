@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional, Tuple, TYPE_CHECKING, Iterator
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, TYPE_CHECKING, Iterator, Dict
 
 from NetSym.consts import OPCODES
 from NetSym.exceptions import FilesystemError
-from NetSym.packets.usefuls.dns import T_Hostname, canonize_domain_hostname, is_domain_hostname_valid
-from NetSym.usefuls.funcs import get_the_one_with_raise
+from NetSym.packets.usefuls.dns import T_Hostname, canonize_domain_hostname, is_domain_hostname_valid, domain_hostname_split
 
 if TYPE_CHECKING:
     from NetSym.computing.computer import Computer
@@ -51,6 +50,106 @@ class ZoneRecord:
     ttl:          Optional[int] = None
 
 
+HOST_OR_ALIAS_TYPES = [OPCODES.DNS.TYPES.HOST_ADDRESS, OPCODES.DNS.TYPES.CANONICAL_NAME_FOR_AN_ALIAS]
+NAME_SERVER_OR_ALIAS_TYPES = [OPCODES.DNS.TYPES.CANONICAL_NAME_FOR_AN_ALIAS, OPCODES.DNS.TYPES.AUTHORITATIVE_NAME_SERVER]
+
+
+@dataclass
+class ZoneTrieNode:
+    children: Dict[str, ZoneTrieNode]                  = field(default_factory=dict)
+    records:  List[Tuple[int, T_Hostname, ZoneRecord]] = field(default_factory=list)
+    # ^ (index of the record in the zone, canonized record name, record)
+
+
+class ZoneTrie:
+    """
+    The records of a zone, arranged in a tree by the labels of their names - from the last label to the first.
+        ('mail.example.com.' is found under 'com' -> 'example' -> 'mail')
+
+    Finding the records that a name ends with only walks the labels of the name,
+        so lookups do not depend on the amount of records in the zone.
+    """
+    def __init__(self, origin: Optional[T_Hostname] = None) -> None:
+        self.origin = origin
+        self.root = ZoneTrieNode()
+        self._first_record_by_name: Dict[T_Hostname, ZoneRecord] = {}
+        # ^ the record names as they appear in the zone file (not canonized) - for resolving aliases
+        self._record_count = 0
+
+    def add(self, record: ZoneRecord) -> None:
+        """
+        Insert a record into the trie. Records keep the order they were inserted in.
+        """
+        canonized_name = canonize_domain_hostname(record.record_name, self.origin)
+        node = self.root
+        for label in reversed(domain_hostname_split(canonized_name)):
+            node = node.children.setdefault(label, ZoneTrieNode())
+
+        node.records.append((self._record_count, canonized_name, record))
+        self._first_record_by_name.setdefault(record.record_name, record)
+        self._record_count += 1
+
+    def _path(self, name: T_Hostname) -> Iterator[ZoneTrieNode]:
+        """
+        The nodes of all of the names that the supplied name ends with - from the shortest to the longest
+        """
+        node = self.root
+        yield node
+        for label in reversed(domain_hostname_split(name)):
+            if label not in node.children:
+                return
+            node = node.children[label]
+            yield node
+
+    def exact_host_record(self, name: T_Hostname) -> Optional[ZoneRecord]:
+        """
+        The first A or CNAME record whose name is exactly the supplied name (or None if there is none)
+        """
+        canonized_name = canonize_domain_hostname(name)
+        node = self.root
+        for label in reversed(domain_hostname_split(canonized_name)):
+            if label not in node.children:
+                return None
+            node = node.children[label]
+
+        for _, record_name, record in node.records:
+            if record_name == canonized_name and record.record_type in HOST_OR_ALIAS_TYPES:
+                return record
+        return None
+
+    def longest_matching_name_server_record(self, name: T_Hostname) -> Optional[ZoneRecord]:
+        """
+        The NS or CNAME record with the longest name that the supplied name ends with.
+        If no such record is longer than the first record (of any type) in the zone that the name ends with - that record is returned.
+        """
+        first_matching: Optional[Tuple[int, int, ZoneRecord]] = None  # (index in zone, depth, record)
+        longest_matching: Optional[Tuple[int, ZoneRecord]] = None     # (depth, record)
+
+        for depth, node in enumerate(self._path(name)):
+            for index, _, record in node.records:
+                if first_matching is None or index < first_matching[0]:
+                    first_matching = index, depth, record
+
+            for _, _, record in node.records:
+                if record.record_type in NAME_SERVER_OR_ALIAS_TYPES:
+                    longest_matching = depth, record
+                    break
+
+        if first_matching is None:
+            return None
+
+        _, first_matching_depth, first_matching_record = first_matching
+        if longest_matching is not None and longest_matching[0] > first_matching_depth:
+            return longest_matching[1]
+        return first_matching_record
+
+    def first_record_by_name(self, record_name: T_Hostname) -> Optional[ZoneRecord]:
+        """
+        The first record that has the supplied name, as it is written in the zone
+        """
+        return self._first_record_by_name.get(record_name)
+
+
 @dataclass
 class Zone:
     records:                          List[ZoneRecord]
@@ -67,6 +166,9 @@ class Zone:
     authoritative_master_name_server: Optional[T_Hostname] = None
     admin_mail_address:               Optional[T_Hostname] = None
 
+    _trie:                            Optional[ZoneTrie] = field(default=None, init=False, repr=False, compare=False)
+    # ^ built on the first lookup. Records that are added with `add_record` afterwards are inserted into it as well.
+
     @property
     def host_or_alias_records(self) -> List[ZoneRecord]:
         return [r for r in self.records if r.record_type in [OPCODES.DNS.TYPES.HOST_ADDRESS,
@@ -79,6 +181,37 @@ class Zone:
     def __iter__(self) -> Iterator[ZoneRecord]:
         return iter(self.records)
 
+    @property
+    def trie(self) -> ZoneTrie:
+        """
+        The records of the zone arranged by their labels.
+        """
+        if self._trie is None or self._trie.origin != self.origin:
+            self._trie = ZoneTrie(self.origin)
+            for record in self.records:
+                self._trie.add(record)
+        return self._trie
+
+    def add_record(self, record: ZoneRecord) -> None:
+        """
+        Add a single record to the zone
+        """
+        self.records.append(record)
+        if self._trie is not None:
+            self._trie.add(record)
+
+    def exact_host_record(self, name: T_Hostname) -> Optional[ZoneRecord]:
+        """
+        Returns the A or CNAME record whose name is exactly the supplied name, or None if one does not exist
+        """
+        return self.trie.exact_host_record(name)
+
+    def longest_matching_name_server_record(self, name: T_Hostname) -> Optional[ZoneRecord]:
+        """
+        Returns the NS or CNAME record with the longest name that the supplied name ends with (see `ZoneTrie`)
+        """
+        return self.trie.longest_matching_name_server_record(name)
+
     @classmethod
     def with_default_values(cls, domain_name: T_Hostname, computer: Computer) -> Zone:
         domain_name = canonize_domain_hostname(domain_name)
@@ -148,15 +281,21 @@ class Zone:
         return f"""$ORIGIN {self.origin}
 $TTL {self.default_ttl}\n
 {self.origin} IN SOA {self.authoritative_master_name_server} {self.admin_mail_address} ( {integer_parameters} )\n
-{linesep.join(f"{record.record_name: <30} {record.record_class: <3} {record.record_type: <5} {record.record_data}" for record in self.records)}
+{linesep.join(self.record_to_file_format(record) for record in self.records)}
 """
 
+    @staticmethod
+    def record_to_file_format(record: ZoneRecord) -> str:
+        """
+        The line that represents a single record in a zone file
+        """
+        return f"{record.record_name: <30} {record.record_class: <3} {record.record_type: <5} {record.record_data}"
+
     def __getitem__(self, item: T_Hostname) -> ZoneRecord:
-        return get_the_one_with_raise(
-            self.records,
-            lambda record: record.record_name == item,
-            raises=KeyError
-        )
+        record = self.trie.first_record_by_name(item)
+        if record is None:
+            raise KeyError(item)
+        return record
 
     @classmethod
     def _parse_record_line(cls, parsed: Zone, record_type: str, splitted_line: List[str]) -> Tuple[Optional[str], Optional[int]]:
@@ -214,7 +353,9 @@ $TTL {self.default_ttl}\n
         if not is_domain_hostname_valid(alias_record.record_data):  # record is not an alias
             return alias_record.record_data
 
-        resolved_record = get_the_one_with_raise(self.records, lambda r: r.record_name == alias_record.record_data, InvalidZoneFileError)
+        resolved_record = self.trie.first_record_by_name(alias_record.record_data)
+        if resolved_record is None:
+            raise InvalidZoneFileError(f"The alias {alias_record.record_data} is not defined in the zone!")
         if is_domain_hostname_valid(resolved_record.record_data):  # That means `resolved_record` is still an 'alias' record! (alias of an alias)
             return self.resolve_aliasing(resolved_record)
         return resolved_record.record_data
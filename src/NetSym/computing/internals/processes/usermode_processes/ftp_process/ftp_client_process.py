@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import codecs
 from typing import TYPE_CHECKING, Optional
 
 from NetSym.computing.internals.processes.abstracts.process import Process, T_ProcessCode
+from NetSym.computing.internals.processes.usermode_processes.ftp_process.ftp_transfer_progress import FTPTransferProgress
 from NetSym.consts import PORTS, T_Port
 from NetSym.exceptions import TCPSocketConnectionRefused
 from NetSym.packets.usefuls.dns import T_Hostname
@@ -15,6 +17,7 @@ if TYPE_CHECKING:
 class ClientFTPProcess(Process):
     """
     The client side process
+    The received data is appended to the destination file as it arrives, so it is never gathered in memory.
     """
     def __init__(self,
                  pid: int,
@@ -27,6 +30,7 @@ class ClientFTPProcess(Process):
         self.server_host = server_hostname
         self.server_port = server_port
         self.filename = filename
+        self.progress: Optional[FTPTransferProgress] = None
 
     def code(self) -> T_ProcessCode:
         server_ip = yield from self.computer.resolve_domain_name(self, self.server_host)
@@ -43,11 +47,23 @@ class ClientFTPProcess(Process):
 
         self.socket.send(f"FTP: {self.filename}")
 
-        data = b''
-        while self.socket.is_connected and not self.socket.is_closed:
-            data += self.socket.receive()
+        destination = self.filename.split("/")[-1]
+        self.computer.filesystem.output_to_file('', destination, self.cwd)
+        decoder = codecs.getincrementaldecoder("utf-8")()  # a character may be split between two chunks
+        self.progress = FTPTransferProgress(self.filename)
+
+        while True:
+            is_done = not self.socket.is_connected or self.socket.is_closed
+            chunk = self.socket.receive()  # when done - this is the data that arrived together with the closing of the connection
+            if chunk or is_done:
+                self.computer.filesystem.output_to_file(decoder.decode(chunk, final=is_done), destination, self.cwd, append=True)
+                if self.progress.add(len(chunk)) and not is_done:
+                    self.computer.print(str(self.progress))
+            if is_done:
+                break
             yield from self.socket.block_until_received_or_closed()
-        self.computer.filesystem.output_to_file(data.decode("ascii"), self.filename.split("/")[-1], self.cwd)
+
+        self.computer.print(str(self.progress))
 
         yield from self.socket.close_when_done_transmitting()
 
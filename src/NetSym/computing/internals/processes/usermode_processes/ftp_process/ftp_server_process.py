@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from NetSym.computing.internals.processes.abstracts.process import Process, T_ProcessCode
 from NetSym.computing.internals.processes.abstracts.tcp_server_process import TCPServerProcess
-from NetSym.consts import PORTS
+from NetSym.computing.internals.processes.usermode_processes.ftp_process.ftp_transfer_progress import FTPTransferProgress
+from NetSym.consts import PORTS, PROTOCOLS
 
 if TYPE_CHECKING:
     from NetSym.computing.internals.sockets.tcp_socket import TCPSocket
@@ -27,10 +28,33 @@ class ServerFTPSessionProcess(Process):
     """
     This process represents a single session of the server with a client.
     This allows the server to continue listening for new connections
+
+    The file is sent in chunks of `PROTOCOLS.FTP.CHUNK_SIZE` bytes, and a chunk is only handed to the socket once the
+        data that was sent before it was divided into segments, so a large file is never copied into the socket at once.
     """
     def __init__(self, pid: int, computer: Computer, socket: TCPSocket) -> None:
         super(ServerFTPSessionProcess, self).__init__(pid, computer)
         self.socket = socket
+        self.progress: Optional[FTPTransferProgress] = None
+
+    def _send_file(self, filename: str) -> T_ProcessCode:
+        """
+        Send the content of the file through the socket chunk by chunk
+        """
+        with self.computer.filesystem.file_at_path(self.cwd, filename) as file:
+            content = file.read().encode()
+            # ^ chunks are cut from the bytes, so a character may be split between two chunks (the client decodes incrementally)
+
+        self.progress = FTPTransferProgress(filename, total_size=len(content))
+        for offset in range(0, len(content), PROTOCOLS.FTP.CHUNK_SIZE):
+            yield from self.socket.block_until_unsent_data_below(PROTOCOLS.FTP.MAX_UNSENT_DATA)
+            if self.socket.is_closed:
+                return
+
+            chunk = content[offset:offset + PROTOCOLS.FTP.CHUNK_SIZE]
+            self.socket.send(chunk)
+            if self.progress.add(len(chunk)):
+                self.computer.print(str(self.progress))
 
     def code(self) -> T_ProcessCode:
         """
@@ -43,10 +67,10 @@ class ServerFTPSessionProcess(Process):
             # TODO: FEATURE: actually implement the FTP protocol with a layer - as it should behave
             filename = received.split()[received.split().index("FTP:") + 1]
 
-            with self.computer.filesystem.file_at_path(self.cwd, filename) as file:
-                self.socket.send(file.read())
+            yield from self._send_file(filename)
 
-        yield from self.socket.close_when_done_transmitting()
+        if not self.socket.is_closed:
+            yield from self.socket.close_when_done_transmitting()
 
     def __repr__(self) -> str:
         return "ftpsession"
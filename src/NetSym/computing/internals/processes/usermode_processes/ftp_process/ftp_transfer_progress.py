@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from NetSym.consts import PROTOCOLS, T_Time
+from NetSym.gui.main_loop import MainLoop
+
+
+@dataclass
+class FTPTransferProgress:
+    """
+    How much of a file was transferred so far, and how fast.
+    Both sides of the transfer update it with every chunk and print it every `report_interval` seconds.
+    """
+    filename:         str
+    total_size:       Optional[int] = None  # None if the size of the file is not known (on the receiving side)
+    transferred:      int           = 0
+    report_interval:  T_Time        = PROTOCOLS.FTP.PROGRESS_REPORT_INTERVAL
+    start_time:       T_Time        = field(default_factory=MainLoop.get_time)
+    last_report_time: T_Time        = field(default_factory=MainLoop.get_time)
+
+    @property
+    def elapsed_time(self) -> T_Time:
+        return MainLoop.get_time_since(self.start_time)
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second since the transfer started"""
+        elapsed_time = self.elapsed_time
+        return (self.transferred / elapsed_time) if elapsed_time > 0 else 0.0
+
+    def add(self, count: int) -> bool:
+        """
+        Count bytes that were just transferred
+        :return: whether or not the progress should be reported now
+        """
+        self.transferred += count
+        if MainLoop.get_time_since(self.last_report_time) < self.report_interval:
+            return False
+
+        self.last_report_time = MainLoop.get_time()
+        return True
+
+    def __str__(self) -> str:
+        size = f"{self.transferred}/{self.total_size}" if self.total_size is not None else f"{self.transferred}"
+        return f"ftp {self.filename}: {size} bytes in {self.elapsed_time:.2f}s ({self.throughput:.1f} bytes/s)"
@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from os import linesep
+from typing import Optional, TYPE_CHECKING, Dict, List, NamedTuple, Tuple, Set
+
+from NetSym.computing.internals.processes.abstracts.process import T_ProcessCode, WaitingFor, Timeout
+from NetSym.computing.internals.processes.usermode_processes.stp_process import STPProcess, STPPortData, BID
+from NetSym.consts import PROTOCOLS, T_Time
+from NetSym.exceptions import *
+from NetSym.gui.main_loop import MainLoop
+
+if TYPE_CHECKING:
+    from NetSym.packets.packet import Packet
+    from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
+    from NetSym.computing.switch import Switch
+
+
+class PriorityVector(NamedTuple):
+    """
+    The information that rapid STP compares in order to decide the roles of the ports - the lower the vector, the better.
+    """
+    root_bid:        BID
+    root_path_cost:  int
+    designated_bid:  BID
+    designated_port: int
+
+    @property
+    def key(self) -> Tuple[int, int, int, int]:
+        """The value that the vectors are compared by"""
+        return self.root_bid.value, self.root_path_cost, self.designated_bid.value, self.designated_port
+
+
+@dataclass
+class RSTPPortData(STPPortData):
+    """
+    The information the rapid STP process keeps for every connected port of the switch.
+    The `state` is the role of the port (ROOT, DESIGNATED, ALTERNATE or BACKUP), the `port_state` tells whether it forwards packets.
+    """
+    port_id:               int                      = 0
+    port_state:            str                      = PROTOCOLS.STP.RSTP.DISCARDING
+    port_state_time:       T_Time                   = field(default_factory=MainLoop.get_time)
+    received_vector:       Optional[PriorityVector] = None
+    received_age:          int                      = 0
+    has_received_bpdu:     bool                     = False
+    is_edge:               bool                     = False
+    is_proposed:           bool                     = False  # the designated port on the other side asked this one to agree
+    is_agreed:             bool                     = False  # the port on the other side agreed to the proposal of this one
+    should_agree:          bool                     = False  # an agreement to the proposal of the other side should be sent
+    topology_change_until: T_Time                   = 0
+
+    @property
+    def is_forwarding(self) -> bool:
+        return self.port_state == PROTOCOLS.STP.RSTP.FORWARDING
+
+
+class RSTPProcess(STPProcess):
+    """
+    The rapid spanning tree (802.1w) mode of the STP process.
+
+    Instead of waiting for the tree to be stable, every port decides its role from the best information (`PriorityVector`) it has:
+        ROOT        - the best way to the root. Forwards right away.
+        DESIGNATED  - this switch is the best way to the root for the other side. Forwards once the other side agrees.
+        ALTERNATE   - another way to the root (it becomes the root port right away if the root port fails).
+        BACKUP      - another port of this same switch is the designated one of that segment.
+    A designated port that does not forward yet sends proposals, the switch on the other side answers with an agreement after
+    it blocks its own designated ports (sync) - so the tree converges as fast as the BPDUs travel.
+    Ports that never receive a BPDU are edge ports (there is no switch behind them) and they forward right away.
+    """
+    computer: Switch
+    stp_ports: Dict[CableNetworkInterface, RSTPPortData]  # type: ignore
+
+    def __init__(self, pid: int, computer: Switch) -> None:
+        """
+        Initiates the process.
+        :param computer: The `Switch` that runs this process.
+        """
+        super(RSTPProcess, self).__init__(pid, computer)
+        self.sending_interval = PROTOCOLS.STP.RSTP.HELLO_TIME
+        self.root_max_age = PROTOCOLS.STP.RSTP.MAX_AGE
+
+        self.root_path_cost = 0
+        self._root_port: Optional[CableNetworkInterface] = None
+        self._synced_root: Optional[Tuple[int, int, Optional[CableNetworkInterface]]] = None
+        self._ports_to_send_on: Set[CableNetworkInterface] = set()
+
+        self.topology_change_count = 0
+        self.convergence_start_time: Optional[T_Time] = MainLoop.get_time()
+        self.convergence_times: List[T_Time] = []
+
+    @property
+    def root_port(self) -> CableNetworkInterface:
+        """
+        Returns the current port of the switch that points to the best way to the root switch.
+        If this switch is the root raises `NoSuchInterfaceError`
+        """
+        if self._root_port is None:
+            raise NoSuchInterfaceError("This switch is the root - it has no root port!")
+        return self._root_port
+
+    @property
+    def distance_to_root(self) -> float:
+        """
+        Returns the cost of the path from this switch to the current root switch.
+        """
+        return self.root_path_cost
+
+    @property
+    def last_convergence_time(self) -> Optional[T_Time]:
+        """The time it took the tree to converge after the last change (None if it did not converge yet)"""
+        return self.convergence_times[-1] if self.convergence_times else None
+
+    @property
+    def is_converged(self) -> bool:
+        """
+        Whether or not the ports of the switch are in their final states - ROOT and DESIGNATED ports forward, the rest discard.
+        """
+        return all(port_data.is_forwarding == (port_data.state in [PROTOCOLS.STP.ROOT_PORT, PROTOCOLS.STP.DESIGNATED_PORT])
+                   for port_data in self.stp_ports.values())
+
+    def _port_id(self, port: CableNetworkInterface) -> int:
+        """The ID of a port of the switch that is sent in the BPDUs (the port priority and its number)"""
+        return (PROTOCOLS.STP.RSTP.PORT_PRIORITY << 8) + self.computer.interfaces.index(port) + 1
+
+    def _path_cost(self, port: CableNetworkInterface) -> int:
+        """The cost of the path through the connection of the given port"""
+        return self.connection_length_to_path_cost(port.connection_length)
+
+    def _designated_vector(self, port: CableNetworkInterface) -> PriorityVector:
+        """The information this switch sends on the given port"""
+        return PriorityVector(self.root_bid, self.root_path_cost, self.my_bid, self.stp_ports[port].port_id)
+
+    def _start_convergence(self) -> None:
+        """Called when the tree changes - the time until it is converged again is measured"""
+        if self.convergence_start_time is None:
+            self.convergence_start_time = MainLoop.get_time()
+
+    def _update_convergence(self) -> None:
+        """Records the convergence time if the tree converged since it last changed"""
+        if self.convergence_start_time is not None and self.is_converged:
+            self.convergence_times.append(MainLoop.get_time_since(self.convergence_start_time))
+            self.convergence_start_time = None
+
+    def _add_port(self, interface: CableNetworkInterface) -> None:
+        """
+        Adds a newly connected port - it is a designated port that discards until it is agreed with or found to be an edge port.
+        """
+        self.stp_ports[interface] = RSTPPortData(interface, PROTOCOLS.STP.DESIGNATED_PORT, 0, MainLoop.get_time(), port_id=self._port_id(interface))
+        self._ports_to_send_on.add(interface)
+        self._start_convergence()
+
+    def _update_ports(self) -> None:
+        """
+        Adds new ports, removes disconnected ones, forgets information that was not refreshed and detects edge ports.
+        """
+        for interface in self.computer.cable_interfaces:
+            if interface.is_connected() and interface not in self.stp_ports:
+                self._add_port(interface)
+
+        for port, port_data in list(self.stp_ports.items()):
+            if not port.is_connected():
+                self.computer.print(f"port '{port.name}' disconnected!")
+                if port.is_blocked:
+                    port.unblock()
+                del self.stp_ports[port]
+                self._start_convergence()
+                continue
+
+            time_since_bpdu = MainLoop.get_time_since(port_data.last_time_got_packet)
+            if port_data.received_vector is not None and time_since_bpdu > PROTOCOLS.STP.RSTP.INFO_MAX_AGE:
+                port_data.received_vector = None
+
+            if not port_data.has_received_bpdu and not port_data.is_edge and time_since_bpdu > PROTOCOLS.STP.RSTP.EDGE_DETECTION_TIME:
+                port_data.is_edge = True
+
+    def _receive_bpdu(self, packet: Packet, port: CableNetworkInterface) -> None:
+        """
+        Learns from a received BPDU.
+        Information from a designated port replaces whatever was known on the port (even if it is worse - the other side knows best)
+        Agreements, proposals and topology changes are marked on the port and handled once the roles are updated.
+        """
+        if port not in self.stp_ports:
+            self._add_port(port)
+
+        port_data = self.stp_ports[port]
+        stp_layer = packet["STP"]
+        port_data.last_time_got_packet = MainLoop.get_time()
+
+        if not port_data.has_received_bpdu or port_data.is_edge:
+            port_data.has_received_bpdu, port_data.is_edge = True, False
+            self._set_port_state(port, PROTOCOLS.STP.RSTP.DISCARDING)  # a switch is behind the port - it is not an edge port after all
+
+        if stp_layer.age >= stp_layer.max_age:
+            return
+
+        flags = stp_layer.bpdu_flags
+        role = (flags & PROTOCOLS.STP.RSTP.FLAGS.ROLE_MASK) >> PROTOCOLS.STP.RSTP.FLAGS.ROLE_SHIFT
+        if role in [PROTOCOLS.STP.RSTP.ROLES.DESIGNATED, PROTOCOLS.STP.RSTP.ROLES.UNKNOWN]:
+            port_data.received_vector = PriorityVector(
+                BID.root_from_stp(stp_layer),
+                stp_layer.path_cost,
+                BID(stp_layer.bridge_id, stp_layer.bridge_mac),
+                stp_layer.port_id,
+            )
+            port_data.received_age = stp_layer.age
+            port_data.is_proposed = bool(flags & PROTOCOLS.STP.RSTP.FLAGS.PROPOSAL)
+
+        elif flags & PROTOCOLS.STP.RSTP.FLAGS.AGREEMENT:
+            port_data.is_agreed = True
+
+        if flags & PROTOCOLS.STP.RSTP.FLAGS.TOPOLOGY_CHANGE:
+            self.computer.flush_mac_address_table(except_for=port)
+            self._propagate_topology_change(except_for=port)
+
+    def _best_root(self) -> Tuple[Optional[CableNetworkInterface], Optional[PriorityVector], int]:
+        """
+        Returns the port with the best path to the root, the vector through it (None if this switch is the root) and the age of the root information
+        Information that this switch sent itself (through another port on the same segment) does not count.
+        """
+        best: Optional[Tuple[Tuple[int, ...], CableNetworkInterface, PriorityVector, int]] = None
+        for port, port_data in self.stp_ports.items():
+            received = port_data.received_vector
+            if received is None or received.designated_bid == self.my_bid:
+                continue
+
+            candidate = received._replace(root_path_cost=received.root_path_cost + self._path_cost(port))
+            key = candidate.key + (port_data.port_id,)
+            if best is None or key < best[0]:
+                best = key, port, candidate, port_data.received_age
+
+        if best is None or best[2].root_bid.value >= self.my_bid.value:
+            return None, None, -1
+        return best[1], best[2], best[3]
+
+    def _update_roles(self) -> None:
+        """
+        Decides the root, the root port and the roles of all of the other ports.
+        If the root port changes, all designated ports are blocked (synced) before the new root port starts forwarding.
+        """
+        root_port, root_vector, root_age = self._best_root()
+        root_bid = root_vector.root_bid if root_vector is not None else self.my_bid
+        if root_bid != self.root_bid:
+            self.root_bid = root_bid
+            self.last_root_changing_time = MainLoop.get_time()
+            self.root_declaration_time = MainLoop.get_time()
+        self.root_path_cost = root_vector.root_path_cost if root_vector is not None else 0
+        self.root_age = root_age
+
+        for port, port_data in self.stp_ports.items():
+            if port_data.received_vector is not None:
+                port_data.distance_to_root = port_data.received_vector.root_path_cost + self._path_cost(port)
+
+            if port is root_port:
+                role = PROTOCOLS.STP.ROOT_PORT
+            elif port_data.received_vector is not None and port_data.received_vector.key < self._designated_vector(port).key:
+                is_mine = port_data.received_vector.designated_bid == self.my_bid
+                role = PROTOCOLS.STP.RSTP.BACKUP_PORT if is_mine else PROTOCOLS.STP.RSTP.ALTERNATE_PORT
+            else:
+                role = PROTOCOLS.STP.DESIGNATED_PORT
+
+            if role != port_data.state:
+                port_data.state = role
+                port_data.is_agreed = False
+                self._ports_to_send_on.add(port)
+                self._start_convergence()
+
+        if root_port is not self._root_port:
+            self._root_port = root_port
+            self._sync()
+
+    def _sync(self) -> None:
+        """
+        Blocks all of the designated ports (except for edge ports) - they will forward again once the other side agrees.
+        This makes sure there is no loop while the new information spreads through the tree.
+        """
+        for port, port_data in self.stp_ports.items():
+            if port_data.state == PROTOCOLS.STP.DESIGNATED_PORT and not port_data.is_edge:
+                port_data.is_agreed = False
+                self._set_port_state(port, PROTOCOLS.STP.RSTP.DISCARDING)
+                self._ports_to_send_on.add(port)
+        self._synced_root = self.root_bid.value, self.root_path_cost, self._root_port
+
+    def _answer_proposals(self) -> None:
+        """
+        Agree to the proposals that were received on the root port and on the alternate and backup ports.
+        Before the root port agrees, the designated ports are synced (unless they were already synced with the same information)
+        """
+        for port, port_data in self.stp_ports.items():
+            if not port_data.is_proposed:
+                continue
+
+            port_data.is_proposed = False
+            if port_data.state == PROTOCOLS.STP.DESIGNATED_PORT:
+                continue  # the information of this switch is better - the other side will find out from the next BPDU
+
+            if port_data.state == PROTOCOLS.STP.ROOT_PORT and self._synced_root != (self.root_bid.value, self.root_path_cost, self._root_port):
+                self._sync()
+
+            port_data.should_agree = True
+            self._ports_to_send_on.add(port)
+
+    def _set_port_state(self, port: CableNetworkInterface, port_state: str) -> None:
+        """
+        Sets whether the port discards, learns or forwards.
+        A port that starts forwarding (that is not an edge port) is a topology change.
+        """
+        port_data = self.stp_ports[port]
+        if port_data.port_state == port_state:
+            return
+
+        port_data.port_state = port_state
+        port_data.port_state_time = MainLoop.get_time()
+        self._start_convergence()
+
+        if port_state == PROTOCOLS.STP.RSTP.FORWARDING and not port_data.is_edge:
+            self.topology_change_count += 1
+            self.computer.flush_mac_address_table(except_for=port)
+            self._propagate_topology_change()
+
+    def _propagate_topology_change(self, except_for: Optional[CableNetworkInterface] = None) -> None:
+        """
+        Marks that the BPDUs of the root port and designated ports (except for edge ports and `except_for`) should carry
+        the topology change flag for a while, so the other switches forget their MAC addresses as well
+        """
+        for port, port_data in self.stp_ports.items():
+            if port is not except_for and not port_data.is_edge and \
+                    port_data.state in [PROTOCOLS.STP.ROOT_PORT, PROTOCOLS.STP.DESIGNATED_PORT]:
+                port_data.topology_change_until = MainLoop.get_time() + (2 * PROTOCOLS.STP.RSTP.HELLO_TIME)
+                self._ports_to_send_on.add(port)
+
+    def _update_port_states(self) -> None:
+        """
+        ROOT ports forward, ALTERNATE and BACKUP ports discard.
+        DESIGNATED ports forward if they are edge ports or if the other side agreed.
+        If it never does (it does not speak rapid STP), they move to forwarding slowly - by the forward delay timer.
+        """
+        for port, port_data in self.stp_ports.items():
+            if port_data.state == PROTOCOLS.STP.ROOT_PORT:
+                self._set_port_state(port, PROTOCOLS.STP.RSTP.FORWARDING)
+
+            elif port_data.state != PROTOCOLS.STP.DESIGNATED_PORT:
+                self._set_port_state(port, PROTOCOLS.STP.RSTP.DISCARDING)
+
+            elif port_data.is_edge or port_data.is_agreed:
+                self._set_port_state(port, PROTOCOLS.STP.RSTP.FORWARDING)
+
+            elif MainLoop.get_time_since(port_data.port_state_time) > PROTOCOLS.STP.RSTP.FORWARD_DELAY:
+                self._set_port_state(
+                    port,
+                    PROTOCOLS.STP.RSTP.LEARNING if port_data.port_state == PROTOCOLS.STP.RSTP.DISCARDING else PROTOCOLS.STP.RSTP.FORWARDING,
+                )
+
+    def _block_blocked_ports(self) -> None:
+        """Blocks the ports that do not forward and unblocks the other ones."""
+        for port, port_data in self.stp_ports.items():
+            if not port_data.is_forwarding and not port.is_blocked:
+                port.block(accept="STP")
+            if port_data.is_forwarding and port.is_blocked:
+                port.unblock()
+
+    def _flags(self, port: CableNetworkInterface) -> int:
+        """The flags of the BPDU that is sent on the port (its role, its state, proposal, agreement and topology change)"""
+        port_data = self.stp_ports[port]
+        role = {
+            PROTOCOLS.STP.ROOT_PORT:             PROTOCOLS.STP.RSTP.ROLES.ROOT,
+            PROTOCOLS.STP.DESIGNATED_PORT:       PROTOCOLS.STP.RSTP.ROLES.DESIGNATED,
+            PROTOCOLS.STP.RSTP.ALTERNATE_PORT:   PROTOCOLS.STP.RSTP.ROLES.ALTERNATE_OR_BACKUP,
+            PROTOCOLS.STP.RSTP.BACKUP_PORT:      PROTOCOLS.STP.RSTP.ROLES.ALTERNATE_OR_BACKUP,
+        }[port_data.state]
+
+        flags = role << PROTOCOLS.STP.RSTP.FLAGS.ROLE_SHIFT
+        if port_data.port_state != PROTOCOLS.STP.RSTP.DISCARDING:
+            flags |= PROTOCOLS.STP.RSTP.FLAGS.LEARNING
+        if port_data.is_forwarding:
+            flags |= PROTOCOLS.STP.RSTP.FLAGS.FORWARDING
+        if port_data.topology_change_until > MainLoop.get_time():
+            flags |= PROTOCOLS.STP.RSTP.FLAGS.TOPOLOGY_CHANGE
+
+        if role == PROTOCOLS.STP.RSTP.ROLES.DESIGNATED:
+            if not port_data.is_forwarding and not port_data.is_edge:
+                flags |= PROTOCOLS.STP.RSTP.FLAGS.PROPOSAL
+        elif port_data.should_agree:
+            flags |= PROTOCOLS.STP.RSTP.FLAGS.AGREEMENT
+        return flags
+
+    def _send_bpdus(self) -> None:
+        """
+        Designated ports send their information every hello time, and every port sends right away when something changes.
+        Other ports only send agreements and topology changes.
+        """
+        ports = set(self._ports_to_send_on)
+        if MainLoop.get_time_since(self.last_sending_time) > self.sending_interval:
+            ports.update(port for port, port_data in self.stp_ports.items() if port_data.state == PROTOCOLS.STP.DESIGNATED_PORT)
+            self.last_sending_time = MainLoop.get_time()
+        self._ports_to_send_on.clear()
+
+        for port in ports:
+            if port not in self.stp_ports:
+                continue
+
+            flags = self._flags(port)
+            if self.stp_ports[port].state != PROTOCOLS.STP.DESIGNATED_PORT and \
+                    not (flags & (PROTOCOLS.STP.RSTP.FLAGS.AGREEMENT | PROTOCOLS.STP.RSTP.FLAGS.TOPOLOGY_CHANGE)):
+                continue
+
+            self.computer.send_rstp(
+                port,
+                self.my_bid,
+                self.root_bid,
+                self.root_path_cost,
+                self.stp_ports[port].port_id,
+                flags,
+                0 if self._am_i_root() else (self.root_age + 1),
+            )
+            self.stp_ports[port].should_agree = False
+
+    def get_info(self) -> str:
+        """For debugging, returns some information about the state of the rapid STP process on the switch."""
+        last_convergence_time = f"{self.last_convergence_time:.3f}" if self.last_convergence_time is not None else "converging..."
+        return f"""
+    RSTP info:
+----------------------------------------------
+    my BID: {self.my_bid}                   {"(ROOT!)" if self._am_i_root() else ""}
+    root BID: {self.root_bid!r}
+    distance to root: {self.distance_to_root}
+    topology changes: {self.topology_change_count}
+    last convergence time: {last_convergence_time}
+    port roles:
+
+{linesep.join(f"{port.name}: {port_data.state} {port_data.port_state}{' (edge)' if port_data.is_edge else ''}" for port, port_data in self.stp_ports.items())}
+-----------------------------------------------
+    """
+
+    def code(self) -> T_ProcessCode:
+        """
+        The actual code of the rapid STP process.
+        Learns from received BPDUs, decides the roles of the ports and answers proposals right away.
+        """
+        self.computer.print("Start RSTP...")
+
+        while True:
+            stp_packets = yield WaitingFor(lambda p: ("STP" in p), timeout=Timeout(0))
+            self._update_ports()
+
+            for packet, packet_metadata in stp_packets.packets.items():
+                self._receive_bpdu(packet, port=packet_metadata.interface)  # type: ignore
+
+            self._update_roles()
+            self._answer_proposals()
+            self._update_port_states()
+            self._block_blocked_ports()
+            self._send_bpdus()
+            self._update_convergence()
+
+    def __repr__(self) -> str:
+        """The string representation of the rapid STP process"""
+        return "rstpd"
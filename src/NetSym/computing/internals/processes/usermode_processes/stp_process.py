@@ -8,7 +8,7 @@ import scapy
 
 from NetSym.address.mac_address import MACAddress
 from NetSym.computing.internals.processes.abstracts.process import Process, Timeout, T_ProcessCode, WaitingFor
-from NetSym.consts import PROTOCOLS, T_Time
+from NetSym.consts import PROTOCOLS, ADDRESSES, T_Time
 from NetSym.exceptions import *
 from NetSym.gui.main_loop import MainLoop
 from NetSym.packets.all import STP
@@ -43,10 +43,10 @@ class BID:
     @property
     def value(self) -> int:
         """
-        The numerical value of the BID.
+        The numerical value of the BID. (the priority is more significant than the MAC address)
         :return: an integer value of the BID..
         """
-        return int(str(self.priority) + str(self.mac.as_number()))
+        return (self.priority << ADDRESSES.MAC.BIT_LENGTH) + self.mac.as_number()
 
     @classmethod
     def root_from_stp(cls, stp: scapy.packet.Packet) -> BID:
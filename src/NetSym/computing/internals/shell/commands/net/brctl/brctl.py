@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import argparse
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Callable
 
 from NetSym.computing.internals.shell.commands.command import Command, CommandOutput
+from NetSym.computing.internals.shell.commands.net.brctl.brctl_setstpmode import BrctlSetstpmodeCommand
 from NetSym.computing.internals.shell.commands.net.brctl.brctl_showbr import BrctlShowbrCommand
+from NetSym.computing.internals.shell.commands.net.brctl.brctl_showstorm import BrctlShowstormCommand
 from NetSym.exceptions import *
 
 if TYPE_CHECKING:
@@ -23,10 +25,12 @@ class Brctl(Command):
         """
         super(Brctl, self).__init__('brctl', 'manage and display bridge settings', computer, shell)
         self.parser.add_argument('object', metavar='object', type=str, nargs='?', help='type of brctl command to run')
-        self.parser.add_argument('args', metavar='args', nargs='*', type=str, help='rest of the arguments')
+        self.parser.add_argument('args', metavar='args', nargs=argparse.REMAINDER, help='rest of the arguments')
 
-        self.object_to_command = {
+        self.object_to_command: Dict[str, Callable[[Computer, Shell], Command]] = {
             'showbr': BrctlShowbrCommand,
+            'showstorm': BrctlShowstormCommand,
+            'setstpmode': BrctlSetstpmodeCommand,
         }
 
     @staticmethod
@@ -36,8 +40,8 @@ class Brctl(Command):
         :return:
         """
         return """Usage: brctl [OPTIONS] OBJECT { COMMAND }
-where OBJECT := { showbr }
-For now only showbr is implemented - NetSym does not use unix bridges to implement switches  
+where OBJECT := { showbr | showstorm | setstpmode }
+For now only showbr, showstorm and setstpmode are implemented - NetSym does not use unix bridges to implement switches  
 """
     # TODO: FEATURE: implement switches using the linux bridges!!!
 
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import argparse
+from typing import TYPE_CHECKING, cast
+
+from NetSym.computing.internals.processes.kernelmode_processes.switching_process import SwitchingProcess
+from NetSym.computing.internals.shell.commands.command import Command, CommandOutput
+from NetSym.consts import COMPUTER, PROTOCOLS
+
+if TYPE_CHECKING:
+    from NetSym.computing.computer import Computer
+    from NetSym.computing.switch import Switch
+    from NetSym.computing.internals.shell.shell import Shell
+
+
+class BrctlSetstpmodeCommand(Command):
+    """
+    The Command switches a switch between the classic and the rapid spanning tree
+    """
+    def __init__(self, computer: Computer, shell: Shell) -> None:
+        """
+        initiates the command.
+        """
+        super(BrctlSetstpmodeCommand, self).__init__('brctl_setstpmode', 'set the spanning tree mode of the bridge', computer, shell)
+
+        self.parser.add_argument('mode', metavar='mode', type=str, choices=PROTOCOLS.STP.MODES.ALL_MODES,
+                                 help='stp for the classic spanning tree, rstp for the rapid one')
+
+    def action(self, parsed_args: argparse.Namespace) -> CommandOutput:
+        """
+        Set the spanning tree mode of the switch (restarts the spanning tree if it is running)
+        """
+        if not self.computer.process_scheduler.is_process_running_by_type(SwitchingProcess, COMPUTER.PROCESSES.MODES.KERNELMODE):
+            return CommandOutput('', 'Computer is not a switch!!! No spanning tree')
+
+        cast("Switch", self.computer).set_stp_mode(parsed_args.mode)
+        return CommandOutput(f"spanning tree mode: {parsed_args.mode}", '')
@@ -4,6 +4,7 @@ import argparse
 from typing import TYPE_CHECKING
 
 from NetSym.computing.internals.processes.kernelmode_processes.switching_process import SwitchingProcess
+from NetSym.computing.internals.processes.usermode_processes.rstp_process import RSTPProcess
 from NetSym.computing.internals.processes.usermode_processes.stp_process import STPProcess
 from NetSym.computing.internals.shell.commands.command import Command, CommandOutput
 from NetSym.consts import COMPUTER
@@ -39,9 +40,20 @@ bridge:
     {'time since seen root': <23}{int(MainLoop.get_time_since(stp_process.root_declaration_time)): >23}
     {'max root timeout': <23}{stp_process.root_timeout: >23.2}
     {'root age': <23}{stp_process.root_age: >23}
+"""
+        if isinstance(stp_process, RSTPProcess):
+            general_bridge_info += f"""\
+    {'mode': <23}{'rapid': >23}
+    {'topology changes': <23}{stp_process.topology_change_count: >23}
+    {'last convergence time': <23}{str(stp_process.last_convergence_time)[:5]: >23}
 """
         interfaces_info = []
         for id_, (port, stp_port) in enumerate(stp_process.stp_ports.items()):
+            port_state_info = ""
+            if isinstance(stp_process, RSTPProcess):
+                rstp_port = stp_process.stp_ports[port]
+                port_state_info = f"    {'port state': <23}{rstp_port.port_state + (' (edge)' if rstp_port.is_edge else ''): >23}\n"
+
             interfaces_info.append(
                 f"""
 {port.name} ({id_ + 1})
@@ -49,7 +61,7 @@ bridge:
     {'state': <23}{stp_port.state: >23}
     {'path cost': <23}{float(stp_port.distance_to_root): >23.2}
     {'time since last packet': <23}{MainLoop.get_time_since(stp_port.last_time_got_packet): >23.2}
-""")
+""" + port_state_info)
 
         return general_bridge_info + '\n' + '\n'.join(interfaces_info)
 
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+from typing import TYPE_CHECKING, cast
+
+from NetSym.computing.internals.network_data_structures.storm_control import TRAFFIC_TYPES
+from NetSym.computing.internals.processes.kernelmode_processes.switching_process import SwitchingProcess
+from NetSym.computing.internals.shell.commands.command import Command, CommandOutput
+from NetSym.consts import COMPUTER
+
+if TYPE_CHECKING:
+    from NetSym.computing.computer import Computer
+    from NetSym.computing.switch import Switch
+    from NetSym.computing.internals.shell.shell import Shell
+
+
+class BrctlShowstormCommand(Command):
+    """
+    The Command displays (and configures) the storm control of a switch
+    """
+    def __init__(self, computer: Computer, shell: Shell) -> None:
+        """
+        initiates the command.
+        """
+        super(BrctlShowstormCommand, self).__init__('brctl_showstorm', 'display and configure the storm control of the bridge', computer, shell)
+
+        self.parser.add_argument('traffic_type', metavar='traffic_type', type=str, nargs='?', default=None,
+                                 choices=TRAFFIC_TYPES,
+                                 help='the kind of flooded traffic to configure')
+        self.parser.add_argument('-r', '--rate', dest='rate', type=float, default=None,
+                                 help='the amount of frames per second a port may receive (0 means no limit)')
+        self.parser.add_argument('-b', '--burst', dest='burst', type=int, default=COMPUTER.STORM_CONTROL.BURST,
+                                 help='the amount of frames a port may receive at once')
+        self.parser.add_argument('-a', '--action', dest='action', type=str, default=None,
+                                 choices=[COMPUTER.STORM_CONTROL.ACTIONS.DROP, COMPUTER.STORM_CONTROL.ACTIONS.SHUTDOWN],
+                                 help='what to do with a port that crosses a threshold')
+
+    def action(self, parsed_args: argparse.Namespace) -> CommandOutput:
+        """
+        Print the thresholds and the drop counters of the storm control, after applying the configuration that was given
+        """
+        if not self.computer.process_scheduler.is_process_running_by_type(SwitchingProcess, COMPUTER.PROCESSES.MODES.KERNELMODE):
+            return CommandOutput('', 'Computer is not a switch!!! No storm control')
+
+        storm_control = cast("Switch", self.computer).storm_control
+        if parsed_args.action is not None:
+            storm_control.action = parsed_args.action
+        if parsed_args.rate is not None:
+            if parsed_args.traffic_type is None:
+                return CommandOutput('', 'Supply the kind of traffic to set the rate of!')
+            storm_control.configure(parsed_args.traffic_type, parsed_args.rate or None, parsed_args.burst)
+
+        return CommandOutput(repr(storm_control), '')
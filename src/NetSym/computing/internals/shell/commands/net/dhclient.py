@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import argparse
+from typing import TYPE_CHECKING
+
+from NetSym.computing.internals.processes.usermode_processes.dhcp_process.dhcp_client_process import DHCPClientProcess
+from NetSym.computing.internals.shell.commands.command import Command, CommandOutput
+
+if TYPE_CHECKING:
+    from NetSym.computing.internals.shell.shell import Shell
+    from NetSym.computing.computer import Computer
+
+
+class Dhclient(Command):
+    """
+    Command that asks for an IP address using DHCP, or gives the address back to the server
+    """
+    def __init__(self, computer: Computer, shell: Shell) -> None:
+        """
+        initiates the command.
+        :param computer:
+        """
+        super(Dhclient, self).__init__('dhclient', 'ask for an IP address using DHCP', computer, shell)
+
+        self.parser.add_argument('-r', dest='release', action='store_true', help='release the current lease')
+
+    def action(self, parsed_args: argparse.Namespace) -> CommandOutput:
+        """
+        performs the action of the command
+        """
+        if not parsed_args.release:
+            self.computer.ask_dhcp()
+            return CommandOutput('Asking for DHCP...', '')
+
+        if not self.computer.process_scheduler.is_usermode_process_running_by_type(DHCPClientProcess):
+            return CommandOutput('', 'No DHCP lease to release!')
+
+        self.computer.process_scheduler.get_usermode_process_by_type(DHCPClientProcess).release()
+        self.computer.process_scheduler.kill_all_usermode_processes_by_type(DHCPClientProcess)
+        return CommandOutput('Released the DHCP lease', '')
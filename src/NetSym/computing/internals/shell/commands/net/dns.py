@@ -30,8 +30,9 @@ class Dns(Command):
         """
         if parsed_args.is_all:
             return CommandOutput(
-                (f"DNS server: {self.computer.dns_server}:\n"
-                 if self.computer.dns_server is not None else 'No DNS server\n') +
+                (f"DNS servers ({self.computer.dns_resolver_policy}): {', '.join(map(str, self.computer.dns_servers))}\n"
+                 f"{self.computer.nameserver_health!r}\n"
+                 if self.computer.dns_servers else 'No DNS server\n') +
                 repr(self.computer.dns_cache),
                 ''
             )
@@ -44,7 +44,8 @@ class IpLinkCommand(Command):
         :return:
         """
 
-        if not interface.is_connected():
+        side = interface.connection_side
+        if not interface.is_connected() or side is None:
             return f"""{index}: NIC: {interface.name}(DISCONNECTED)\n"""
 
         length = f"\n    length: {interface.connection.length}" if isinstance(interface, CableNetworkInterface) else ''
@@ -54,7 +55,10 @@ class IpLinkCommand(Command):
         return f"""{index}: NIC: {interface.name}
 link:
     speed: {interface.connection.speed}
+    bandwidth: {interface.connection.bandwidth} bps
     PL percent: {interface.connection.packet_loss}{length}{is_blocked}{is_loopback}
+    transmit queue: {side.transmit_queue_occupancy}/{side.transmit_queue_length} packets
+    transmitted: {side.transmitted_packets_count} dropped: {side.dropped_packets_count}
 """
 
     def _list_links(self, args: List[str]) -> CommandOutput:
@@ -152,8 +156,14 @@ link:
             interface.connection.set_speed(int(value))
         elif command == 'pl':
             interface.connection.set_pl(float(value))
+        elif command == 'bandwidth':
+            interface.connection.set_bandwidth(float(value))
+        elif command == 'txqueuelen':
+            if interface.connection_side is None:
+                return CommandOutput('', f"{interface.name} is not connected!")
+            interface.connection_side.set_transmit_queue_length(int(value))
         else:
-            return CommandOutput('', "Connection commands are `pl` or `speed` only!")
+            return CommandOutput('', "Connection commands are `pl`, `speed`, `bandwidth` or `txqueuelen` only!")
         return CommandOutput("OK!", '')
 
     def action(self, parsed_args: argparse.Namespace) -> CommandOutput:
@@ -181,6 +191,8 @@ ip link set NAME [ { up | down } ]
                  [ macaddr MAC ]
                  [ name NAME ]
                  [ connection [ speed SPEED ]
-                              [ pl PL ] ]
+                              [ pl PL ]
+                              [ bandwidth BITS_PER_SECOND ]
+                              [ txqueuelen PACKETS ] ]
 """
         )
@@ -30,18 +30,20 @@ class IpRouteCommand(Command):
         self.commands = {
             'list':  self._list_routes,
             'print': self._list_routes,
-            'add':   self._add_route,
-            'del':   self._del_route,
+            'add':    self._add_route,
+            'append': self._append_route,
+            'del':    self._del_route,
         }
 
-    def _add_route(self, args: List[str]) -> CommandOutput:
+    def _add_route(self, args: List[str], append: bool = False) -> CommandOutput:
         """
         Receives arguments, adds a route and returns a CommandOutput
         :param args:
+        :param append: whether to add the route as another equal-cost next hop of the destination
         :return:
         """
         try:
-            net = IPAddress(args[args.index('add') + 1])
+            net = IPAddress(args[1])
             gateway: Union[IPAddress, str] = IPAddress(args[args.index('via') + 1]) if 'via' in args else ADDRESSES.IP.ON_LINK
             interface_name = args[args.index('dev') + 1]
         except IndexError:
@@ -54,9 +56,15 @@ class IpRouteCommand(Command):
         if interface.ip is None:
             return CommandOutput('', "The interface does not have an IP address!!!")
 
-        self.computer.routing_table.route_add(net, gateway, IPAddress.copy(interface.ip))
+        self.computer.routing_table.route_add(net, gateway, IPAddress.copy(interface.ip), append=append)
         return CommandOutput('OK!', '')
 
+    def _append_route(self, args: List[str]) -> CommandOutput:
+        """
+        Receives arguments, adds an equal-cost next hop to a route (or a new route) and returns a CommandOutput
+        """
+        return self._add_route(args, append=True)
+
     def _del_route(self, args: List[str]) -> CommandOutput:
         """
         Receives arguments, deletes a route and returns CommandOutput
@@ -65,11 +73,12 @@ class IpRouteCommand(Command):
         """
         try:
             net = args[args.index('del') + 1]
+            gateway = IPAddress(args[args.index('via') + 1]) if 'via' in args else None
         except IndexError:
             raise WrongIPRouteUsageError()
 
         try:
-            self.computer.routing_table.route_delete(IPAddress(net))
+            self.computer.routing_table.route_delete(IPAddress(net), gateway)
         except RoutingTableError:
             return CommandOutput("", "Route does not exist! did not delete :(")
         else:
@@ -101,7 +110,8 @@ class IpRouteCommand(Command):
 Wrong Usage! 
 The syntax is `ip route add <net> via <gateway_ip> dev <interface_name>
 You can drop the `via` to create `On-Link` routes :)
-Or if you want to remove a route, `ip route del <net>`
+Use `append` instead of `add` to add another equal-cost next hop to a route
+Or if you want to remove a route, `ip route del <net>` (`ip route del <net> via <gateway_ip>` removes a single next hop)
 List routes by typing `ip route list` or just `ip route`"""
         )
 
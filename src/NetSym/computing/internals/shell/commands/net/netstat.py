@@ -8,6 +8,7 @@ from NetSym.consts import COMPUTER
 if TYPE_CHECKING:
     import argparse
     from NetSym.computing.computer import Computer
+    from NetSym.computing.internals.sockets.socket import Socket
     from NetSym.computing.internals.shell.shell import Shell
 
 
@@ -26,6 +27,10 @@ class Netstat(Command):
         self.parser.add_argument('-o', action='store_true', dest='timers', help='display timers')
         self.parser.add_argument('-a', '--all', action='store_true', dest='all_sockets',
                                  help='display all socket (even disconnected)')
+        self.parser.add_argument('-i', '--tcp-info', action='store_true', dest='tcp_info',
+                                 help='display the congestion control state of TCP sockets')
+        self.parser.add_argument('-s', '--statistics', action='store_true', dest='statistics',
+                                 help='display the ICMP messages that were sent and suppressed by the rate limit')
 
     def _to_print(self, parsed_args: argparse.Namespace) -> str:
         """
@@ -33,12 +38,25 @@ class Netstat(Command):
         :param parsed_args:
         :return:
         """
+        if parsed_args.statistics:
+            return f"Icmp: (rate limited messages)\n{self.computer.icmp_rate_limiter!r}"
+
         headers = f"{'Proto': <{   COMPUTER.SOCKETS.REPR.PROTO_SPACE_COUNT}} " \
             f"{'Local Address': <{ COMPUTER.SOCKETS.REPR.LOCAL_ADDRESS_SPACE_COUNT}} " \
             f"{'Remote Address': <{COMPUTER.SOCKETS.REPR.REMOTE_ADDRESS_SPACE_COUNT}} " \
             f"{'State': <{         COMPUTER.SOCKETS.REPR.STATE_SPACE_COUNT}} " \
             f"PID\n"
-        return headers + '\n'.join(getattr(socket, 'get_str_representation', socket.__repr__)() for socket in self.computer.sockets)
+        return headers + '\n'.join(self._socket_to_print(socket, parsed_args) for socket in self.computer.sockets)
+
+    @staticmethod
+    def _socket_to_print(socket: Socket, parsed_args: argparse.Namespace) -> str:
+        """
+        The line of a single socket in the output
+        """
+        line = getattr(socket, 'get_str_representation', socket.__repr__)()
+        if parsed_args.tcp_info and hasattr(socket, 'get_tcp_info'):
+            line += f"\n    {getattr(socket, 'get_tcp_info')()}"
+        return line
 
     def action(self, parsed_args: argparse.Namespace) -> CommandOutput:
         """
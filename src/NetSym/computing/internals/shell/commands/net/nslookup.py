@@ -46,9 +46,10 @@ class Nslookup(Command):
 
         self.computer.process_scheduler.start_usermode_process(
             DNSClientProcess,
-            self.computer.dns_server,
+            self.computer.dns_servers,
             hostname,
             default_query_timeout=parsed_args.query_timeout,
             default_retry_count=  parsed_args.retry_count,
+            policy=               self.computer.dns_resolver_policy,
         )
         return CommandOutput('Searching...', '')
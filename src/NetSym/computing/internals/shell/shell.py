@@ -29,6 +29,7 @@ from NetSym.computing.internals.shell.commands.misc.grep import Grep
 from NetSym.computing.internals.shell.commands.net.arp import Arp
 from NetSym.computing.internals.shell.commands.net.arping import Arping
 from NetSym.computing.internals.shell.commands.net.brctl.brctl import Brctl
+from NetSym.computing.internals.shell.commands.net.dhclient import Dhclient
 from NetSym.computing.internals.shell.commands.net.dns import Dns
 from NetSym.computing.internals.shell.commands.net.echoc import Echoc
 from NetSym.computing.internals.shell.commands.net.echos import Echos
@@ -70,7 +71,7 @@ class Shell:
             Hostname, Uname, Uptime,
             Alias, Help, Man, Unalias, Watch,
             Echo, Grep,
-            Brctl, Ip, Arp, Arping, Dns, Echoc, Echos, Netstat, Nslookup, Ping, Tcpdump, Traceroute,
+            Brctl, Ip, Arp, Arping, Dhclient, Dns, Echoc, Echos, Netstat, Nslookup, Ping, Tcpdump, Traceroute,
             Kill, Ps,
         ]
         self.commands: List[Command] = [command(computer, self) for command in self.command_classes]
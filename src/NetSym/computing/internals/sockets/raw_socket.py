@@ -18,7 +18,7 @@ class RawSocket(Socket):
     A socket is an operation-system object that allows for an abstraction of network access
     and sessions
     """
-    received: List[ReturnedPacket]  # type: ignore
+    received: List[ReturnedPacket]
 
     def __init__(self, computer: Computer, kind: int) -> None:
         """
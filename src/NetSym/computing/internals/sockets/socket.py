@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import abstractmethod, ABC
-from typing import TYPE_CHECKING, Optional, List
+from typing import TYPE_CHECKING, Optional, Sized
 
 from NetSym.computing.internals.processes.abstracts.process import WaitingFor, T_ProcessCode, Timeout
 from NetSym.consts import COMPUTER, T_Time
@@ -30,7 +30,8 @@ class Socket(ABC):
         self.address_family = address_family
         self.kind = kind
 
-        self.received: List[bytes] = []
+        self.received: Sized = []
+        # ^ the data that was received and not yet read - each kind of socket keeps it in its own way
 
         self.is_closed = False
         self.is_bound = False
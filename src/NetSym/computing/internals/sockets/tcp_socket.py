@@ -3,15 +3,18 @@ from __future__ import annotations
 from typing import Tuple, TYPE_CHECKING, Union, Optional, List, Generator
 
 from NetSym.address.ip_address import IPAddress
+from NetSym.computing.internals.network_data_structures.tcp_receive_buffer import TCPReceiveBuffer
 from NetSym.computing.internals.processes.abstracts.process import WaitingFor, T_ProcessCode, Process
-from NetSym.computing.internals.processes.kernelmode_processes.tcp_socket_process import ListeningTCPSocketProcess, \
-    ConnectingTCPSocketProcess
+from NetSym.computing.internals.processes.kernelmode_processes.tcp_socket_process import ConnectingTCPSocketProcess, \
+    TCPListenerProcess
 from NetSym.computing.internals.sockets.l4_socket import L4Socket
-from NetSym.consts import COMPUTER, T_Port
-from NetSym.exceptions import TCPSocketConnectionRefused, NoSuchProcessError
+from NetSym.consts import COMPUTER, T_Port, PROTOCOLS
+from NetSym.exceptions import TCPSocketConnectionRefused, NoSuchProcessError, SocketNotListeningError, SocketIsClosedError
+from NetSym.usefuls.funcs import raise_on_none
 
 if TYPE_CHECKING:
     from NetSym.computing.computer import Computer
+    from NetSym.computing.internals.processes.abstracts.tcp_rtt_estimator import RTTEstimator
 
 
 class TCPSocket(L4Socket):
@@ -30,6 +33,10 @@ class TCPSocket(L4Socket):
         """
         super(TCPSocket, self).__init__(computer, address_family, COMPUTER.SOCKETS.TYPES.SOCK_STREAM)
         self.to_send: List[Union[str, bytes]] = []
+        self.received: TCPReceiveBuffer = TCPReceiveBuffer()
+        # ^ its free space is advertised to the other side as the receive window - resize it with `receive_buffer_size`
+        self.congestion_control = PROTOCOLS.TCP.CONGESTION_CONTROL.DEFAULT
+        self.no_delay = False  # like TCP_NODELAY - send small writes right away instead of coalescing them
 
         self.socket_handling_kernelmode_pid: Optional[int] = None
 
@@ -43,6 +50,55 @@ class TCPSocket(L4Socket):
         except NoSuchProcessError:
             return None
 
+    @property
+    def listener(self) -> Optional[TCPListenerProcess]:
+        """
+        The kernel process that handles the incoming connections of the socket (None if the socket is not listening)
+        """
+        process = self.socket_handling_kernelmode_process
+        return process if isinstance(process, TCPListenerProcess) else None
+
+    def get_tcp_info(self) -> str:
+        """
+        Returns a description of the state of the TCP connection of the socket (its congestion control, RTT etc...)
+        For a listening socket - the state of its queues.
+        """
+        listener = self.listener
+        if listener is not None:
+            return f"syn queue: {len(listener.syn_queue)}/{listener.syn_backlog} " \
+                f"accept queue: {len(listener.accept_queue)}/{listener.backlog} {listener.stats}"
+
+        process = self.socket_handling_kernelmode_process
+        sending_window = getattr(process, 'sending_window', None)
+        if sending_window is None:
+            return self.congestion_control
+        return f"{sending_window.congestion_control} {sending_window.rtt_estimator} " \
+            f"rwnd: {getattr(process, 'receive_window')} recv-q: {len(self.received)}/{self.receive_buffer_size}"
+
+    @property
+    def rtt_stats(self) -> Optional[RTTEstimator]:
+        """
+        The RTT measurements of the connection of the socket (None if the socket is not handled by a TCP process)
+        """
+        sending_window = getattr(self.socket_handling_kernelmode_process, 'sending_window', None)
+        return None if sending_window is None else sending_window.rtt_estimator
+
+    @property
+    def unsent_data_length(self) -> int:
+        """
+        The amount of bytes that were sent through the socket and were not divided into segments yet.
+        Processes that send a lot of data can wait for this to drop before sending more, so the data is not all held in memory.
+        """
+        queued = sum(len(data) for data in self.to_send)
+        return queued + getattr(self.socket_handling_kernelmode_process, 'buffered_data_length', 0)
+
+    def block_until_unsent_data_below(self, length: int) -> T_ProcessCode:
+        """
+        A generator to `yield from` inside processes.
+        Waits until the socket holds less than `length` unsent bytes (or until it is closed)
+        """
+        yield WaitingFor(lambda: self.unsent_data_length < length or self.is_closed)
+
     def send(self, data: Union[str, bytes]) -> None:
         """
         Sends down the socket some data
@@ -73,54 +129,75 @@ class TCPSocket(L4Socket):
         if self.is_closed:
             raise TCPSocketConnectionRefused
 
-    def listen(self) -> None:
+    def listen(self,
+               backlog: int = PROTOCOLS.TCP.LISTEN.DEFAULT_BACKLOG,
+               syn_backlog: int = PROTOCOLS.TCP.LISTEN.DEFAULT_SYN_BACKLOG) -> None:
         """
         Listen for connections to this socket.
+        The handshakes of the connections are handled in the kernel, and the connected sockets wait to be accepted.
+        :param backlog: the maximum amount of connections that finished the handshake and were not accepted yet
+        :param syn_backlog: the maximum amount of connections in the middle of the handshake
         :return:
         """
         self.assert_is_bound()
         self.assert_is_not_closed()
         self.computer.sockets[self].state = COMPUTER.SOCKETS.STATES.LISTENING
+        self.socket_handling_kernelmode_pid = self.computer.process_scheduler.start_kernelmode_process(
+            TCPListenerProcess, self, backlog, syn_backlog,
+        )
 
-    def accept(self) -> None:
-        """
-        Accept connections to this socket.
-        :return:
-        """
+    def _get_listener(self) -> TCPListenerProcess:
         self.assert_is_bound()
         self.assert_is_not_closed()
-        self.socket_handling_kernelmode_pid = self.computer.process_scheduler.start_kernelmode_process(ListeningTCPSocketProcess, self,
-                                                                                                       self.bound_address)
+        listener = self.listener
+        if listener is None:
+            raise SocketNotListeningError("Call `listen` before accepting connections on the socket!")
+        return listener
 
-    def blocking_accept(self, requesting_process_pid: int) -> Generator[WaitingFor, None, TCPSocket]:
+    def accept(self) -> Optional[TCPSocket]:
         """
-        Just like `self.accept` - only processes can use `yield from` to block until the socket is connected :)
-        :return:
+        Accept a connection to this socket.
+        :return: the connected socket of the next connection that finished its handshake (None if there is none yet)
         """
-        self.accept()
-        yield WaitingFor(lambda: self.is_connected)
+        return self._get_listener().accept()
 
-        listening_socket = self.computer.get_tcp_socket(requesting_process_pid)
-        listening_socket.bind(self.bound_address)
-        listening_socket.listen()
-        return listening_socket
+    def blocking_accept(self) -> Generator[WaitingFor, None, TCPSocket]:
+        """
+        Just like `self.accept` - only processes can use `yield from` to block until there is a connection to accept :)
+        :return: the connected socket
+        """
+        listener = self._get_listener()
+        yield WaitingFor(lambda: bool(listener.accept_queue) or self.is_closed)
+        if self.is_closed:
+            raise SocketIsClosedError("The socket was closed while waiting for connections")
+        return raise_on_none(listener.accept())
+
+    @property
+    def receive_buffer_size(self) -> int:
+        return self.received.capacity
+
+    @receive_buffer_size.setter
+    def receive_buffer_size(self, size: int) -> None:
+        """
+        Like setting SO_RCVBUF - the amount of received data the socket holds until the process reads it
+        """
+        self.received.capacity = size
 
     def receive(self, count: Optional[int] = None) -> bytes:
         """
         receive the information from the other side of the socket
-        :param count: how many bytes to receive
+        :param count: the maximum amount of bytes to receive (None means all of the data that was received)
         :return:
         """
-        data = b''.join(self.received) if self.received else b''
-        self.received.clear()
-        # TODO use the `count` parameter
-        return data
+        return self.received.read(count)
 
     def close(self) -> None:
         if self.is_closed:
             return
         super(TCPSocket, self).close()
-        setattr(self.socket_handling_kernelmode_process, 'close_socket_when_done_transmitting', True)
+        process = self.socket_handling_kernelmode_process
+        if process is not None:
+            setattr(process, 'close_socket_when_done_transmitting', True)
 
     def close_when_done_transmitting(self) -> T_ProcessCode:
         """
@@ -6,13 +6,16 @@ from NetSym.computing.computer import Computer
 from NetSym.computing.internals.filesystem.filesystem import Filesystem
 from NetSym.computing.internals.network_data_structures.routing_table import RoutingTable
 from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
-from NetSym.computing.internals.processes.kernelmode_processes.route_packet_process import RoutePacket
+from NetSym.computing.internals.processes.kernelmode_processes.route_packet_process import RoutePacket, is_packet_routable
 from NetSym.computing.internals.processes.usermode_processes.dhcp_process.dhcp_server_process import DHCPServerProcess
-from NetSym.consts import OS
+from NetSym.consts import OS, COMPUTER
+from NetSym.exceptions import RoutingTableCouldNotRouteToIPAddress
 from NetSym.gui.main_loop import MainLoop
+from NetSym.packets.usefuls.ip import needs_fragmentation, flow_hash
 
 if TYPE_CHECKING:
     from NetSym.computing.internals.network_interfaces.network_interface import NetworkInterface
+    from NetSym.packets.packet import Packet
 
 
 class Router(Computer):
@@ -52,9 +55,46 @@ class Router(Computer):
             if "IP" in packet and \
                     not self.has_this_ip(packet["IP"].dst_ip) and \
                     "DHCP" not in packet and \
-                    packet["Ether"].dst_mac == interface.mac:
+                    packet["Ether"].dst_mac == interface.mac and \
+                    not self._forward_in_kernel(packet):
                 self.process_scheduler.start_kernelmode_process(RoutePacket, packet)
 
+    def _forward_in_kernel(self, packet: Packet) -> bool:
+        """
+        Forwards the packet right away without starting a `RoutePacket` process for it.
+        This only handles the common case - the route is known, the MAC of the next hop is in the ARP cache, the TTL is not exceeded
+        and the packet does not need fragmentation.
+        Anything else (sending ARPs or ICMP errors) is left for a `RoutePacket` process.
+        :return: whether or not the packet was forwarded
+        """
+        if not is_packet_routable(packet) or packet["IP"].ttl <= 1:
+            return False
+
+        dst_ip, packet_flow_hash = packet["IP"].dst_ip, flow_hash(packet)
+        try:
+            route = self.routing_table.route(dst_ip, packet_flow_hash)
+        except RoutingTableCouldNotRouteToIPAddress:
+            return False
+
+        next_hop = route.gateway_ip
+        if next_hop not in self.arp_cache:
+            return False
+
+        interface = self.get_sending_interface_by_routing_table(dst_ip, packet_flow_hash)
+        if interface.no_carrier or needs_fragmentation(packet, interface.mtu):
+            return False
+
+        forwarded = interface.ethernet_wrap(self.arp_cache[next_hop].mac, packet["IP"])
+        forwarded["IP"].ttl -= 1  # the wrapped packet is a copy - the received one may be shared with the sender
+        self.send_packet_stream(
+            COMPUTER.PROCESSES.INIT_PID,
+            COMPUTER.PROCESSES.MODES.KERNELMODE,
+            [forwarded],
+            COMPUTER.ROUTING.SENDING_INTERVAL,
+        )
+        self.routing_table.count_forwarded(route)
+        return True
+
     def logic(self) -> None:
         """Adds to the original logic of the Computer the ability to route packets."""
         super(Router, self).logic()
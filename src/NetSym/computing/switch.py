@@ -7,15 +7,19 @@ from NetSym.address.mac_address import MACAddress
 from NetSym.computing.computer import Computer, COMPUTER
 from NetSym.computing.internals.filesystem.filesystem import Filesystem
 from NetSym.computing.internals.network_data_structures.routing_table import RoutingTable
+from NetSym.computing.internals.network_data_structures.storm_control import StormControl
 from NetSym.computing.internals.network_interfaces.wireless_network_interface import WirelessNetworkInterface
 from NetSym.computing.internals.processes.kernelmode_processes.switching_process import SwitchingProcess, SwitchTableItem
+from NetSym.computing.internals.processes.usermode_processes.rstp_process import RSTPProcess
 from NetSym.computing.internals.processes.usermode_processes.stp_process import STPProcess, BID
 from NetSym.consts import OS, PROTOCOLS, ADDRESSES
+from NetSym.exceptions import WrongUsageError
 from NetSym.packets.all import LLC, STP
 
 if TYPE_CHECKING:
     from NetSym.packets.packet import Packet
     from NetSym.computing.internals.network_interfaces.network_interface import NetworkInterface
+    from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
 
 
 class Switch(Computer):
@@ -26,22 +30,30 @@ class Switch(Computer):
 
     The switch has a table that helps it learn which MAC address sits behind which leg and so it knows where to send
     the packet (frame) it receives, this table is called the `mac_address_table`.
+
+    The `storm_control` limits the frames that the switch floods from each of its legs. It is part of the configuration
+    of the switch, so it survives a reboot - only the legs it shut down are enabled again.
     """
     def __init__(self,
                  name: Optional[str] = None,
-                 priority: int = PROTOCOLS.STP.DEFAULT_SWITCH_PRIORITY) -> None:
+                 priority: int = PROTOCOLS.STP.DEFAULT_SWITCH_PRIORITY,
+                 stp_mode: str = PROTOCOLS.STP.MODES.STP) -> None:
         """
         Initiates the Switch with a given name.
         A switch has a variable `self.is_hub` that allows any switch to become a hub.
 
         :param name: a string that will be the name of the switch. If `None`, it is randomized.
+        :param priority: the STP priority of the switch
+        :param stp_mode: `PROTOCOLS.STP.MODES.STP` for the classic spanning tree or `PROTOCOLS.STP.MODES.RSTP` for the rapid one
         """
         super(Switch, self).__init__(name, OS.LINUX, None)
 
         self.is_hub = False
 
         self.stp_enabled = True
+        self.stp_mode = stp_mode
         self.priority = priority
+        self.storm_control = StormControl()
         self.process_scheduler.add_startup_process(COMPUTER.PROCESSES.MODES.KERNELMODE, SwitchingProcess)
 
     def is_for_me(self, packet: Packet) -> bool:
@@ -54,13 +66,38 @@ class Switch(Computer):
             return (super(Switch, self).is_for_me(packet)) or (packet["Ether"].dst_mac == MACAddress.stp_multicast())
         return super(Switch, self).is_for_me(packet)
 
+    def on_shutdown(self) -> None:
+        """
+        Overrides the original `on_shutdown` of `Computer` and forgets the state of the storm control of the legs.
+        """
+        super(Switch, self).on_shutdown()
+        self.storm_control.ports.clear()
+
     def start_stp(self) -> None:
         """
         Starts the process of STP sending and receiving.
         :return: None
         """
         if not self.process_scheduler.is_usermode_process_running_by_type(STPProcess) and self.interfaces:
-            self.process_scheduler.start_usermode_process(STPProcess)
+            self.process_scheduler.start_usermode_process(RSTPProcess if self.stp_mode == PROTOCOLS.STP.MODES.RSTP else STPProcess)
+
+    def set_stp_mode(self, stp_mode: str) -> None:
+        """
+        Switches between the classic and the rapid spanning tree.
+        If the STP process is already running, it is restarted in the new mode (and the spanning tree is built again)
+        :param stp_mode: `PROTOCOLS.STP.MODES.STP` or `PROTOCOLS.STP.MODES.RSTP`
+        """
+        if stp_mode not in PROTOCOLS.STP.MODES.ALL_MODES:
+            raise WrongUsageError(f"No such STP mode {stp_mode!r}! Only {PROTOCOLS.STP.MODES.ALL_MODES}")
+
+        if stp_mode == self.stp_mode:
+            return
+
+        self.stp_mode = stp_mode
+        if self.process_scheduler.is_usermode_process_running_by_type(STPProcess):
+            self.process_scheduler.kill_all_usermode_processes_by_type(STPProcess)
+            self.flush_mac_address_table()
+            self.start_stp()
 
     def send_stp(self, sender_bid: BID, root_bid: BID, distance_to_root: float, age: int, sending_interval: float, root_max_age: float) -> None:
         """
@@ -82,6 +119,51 @@ class Switch(Computer):
                                             hello_time=sending_interval,
                                          ))
 
+    def send_rstp(self,
+                  interface: CableNetworkInterface,
+                  sender_bid: BID,
+                  root_bid: BID,
+                  distance_to_root: int,
+                  port_id: int,
+                  flags: int,
+                  age: int) -> None:
+        """
+        Sends a rapid STP packet (an RST BPDU) with the given information on a single interface.
+        Unlike the classic STP, every port sends its own information (its role and state are in the `flags`)
+        """
+        interface.send_with_ethernet(MACAddress.stp_multicast(),
+                                     LLC(src_service_access_point=ADDRESSES.LLC.STP_SAP,
+                                         dst_service_access_point=ADDRESSES.LLC.STP_SAP,
+                                         control_field=ADDRESSES.LLC.STP_CONTROL_FIELD) /
+                                     STP(
+                                        version=PROTOCOLS.STP.RSTP.VERSION,
+                                        bpdu_type=PROTOCOLS.STP.RSTP.BPDU_TYPE,
+                                        bpdu_flags=flags,
+                                        root_id=root_bid.priority,
+                                        root_mac=str(root_bid.mac),
+                                        path_cost=distance_to_root,
+                                        bridge_id=sender_bid.priority,
+                                        bridge_mac=str(sender_bid.mac),
+                                        port_id=port_id,
+                                        age=age,
+                                        max_age=PROTOCOLS.STP.RSTP.MAX_AGE,
+                                        hello_time=PROTOCOLS.STP.RSTP.HELLO_TIME,
+                                        forward_delay=PROTOCOLS.STP.RSTP.FORWARD_DELAY,
+                                     ))
+
+    def flush_mac_address_table(self, except_for: Optional[CableNetworkInterface] = None) -> None:
+        """
+        Forget the MAC addresses that were learned on the legs of the switch (after a change in the spanning tree they may have moved)
+        :param except_for: a leg whose addresses are not forgotten (the one that the change was learned from)
+        """
+        if not self.process_scheduler.is_process_running_by_type(SwitchingProcess, COMPUTER.PROCESSES.MODES.KERNELMODE):
+            return
+
+        mac_address_table = self._get_mac_address_table()
+        for mac, item in list(mac_address_table.items()):
+            if item.leg is not except_for:
+                del mac_address_table[mac]
+
     def _get_mac_address_table(self) -> Dict[MACAddress, SwitchTableItem]:
         """
         Returns the dictionary which represents the MAC address table of the switch.
@@ -96,6 +178,12 @@ class Switch(Computer):
         return f"""{'MACAddress'} {'Port': >10}
 {linesep.join(f"{mac} {leg_name_to_id[item.leg]: >10}" for mac, item in self._get_mac_address_table().items())}"""
 
+    def get_storm_control_string(self) -> str:
+        """
+        Returns the thresholds of the storm control and the frames it dropped on each leg of the switch.
+        """
+        return repr(self.storm_control)
+
     @classmethod
     def from_dict_load(cls, dict_: Dict) -> Switch:
         """
@@ -104,6 +192,7 @@ class Switch(Computer):
         :return: Computer
         """
         returned = cls(dict_["name"])
+        returned.stp_mode = dict_.get("stp_mode", PROTOCOLS.STP.MODES.STP)
         returned.interfaces = cls._interfaces_from_dict(dict_)
         returned.routing_table = RoutingTable.from_dict_load(dict_["routing_table"])
         returned.filesystem = Filesystem.from_dict_load(dict_["filesystem"])
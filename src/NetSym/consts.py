@@ -36,6 +36,7 @@ class ADDRESSES:
         STP_MULTICAST = "01:80:C2:00:00:00"
 
         SEPARATOR = ':'
+        BIT_LENGTH = 48
 
     class IP:
         DEFAULT = "192.168.1.2/24"
@@ -125,6 +126,7 @@ class OPCODES:
         class CODES:
             # unreachable
             NETWORK_UNREACHABLE = 0
+            HOST_UNREACHABLE = 1
             PORT_UNREACHABLE = 3
             FRAGMENTATION_NEEDED = 4
 
@@ -137,6 +139,7 @@ class OPCODES:
         OFFER = "offer"
         REQUEST = "request"
         PACK = "ack"
+        RELEASE = "release"
 
     class FTP:
         REQUEST_PACKET = "FTP Request"
@@ -211,6 +214,7 @@ class PROTOCOLS:
     class ARP:
         RESEND_TIME = 6  # seconds
         RESEND_COUNT = 3  # times
+        PENDING_QUEUE_LENGTH = 64  # packets that may wait for the resolution of a single address
 
     class ICMP:
         HEADER_LEN = 8  # bytes
@@ -219,9 +223,21 @@ class PROTOCOLS:
         MAX_MESSAGE_LENGTH = (((2 ** 13) - 1) - HEADER_LEN) * 8  # bytes
         RESEND_TIMEOUT = 25  # seconds
 
+        class RATE_LIMIT:  # for the ICMP messages the computer generates (replies and errors) - for every ICMP type
+            RATE = 10  # messages per second
+            BURST = 50  # messages
+
     class DHCP:
         DEFAULT_TTL = 0
         NEW_INTERFACE_DETECTION_TIMEOUT = 0.5  # seconds
+        LEASE_TIME = 3600  # seconds
+        OFFER_TIME = 10  # seconds
+        MIN_RENEWAL_RETRY_TIME = 60  # seconds - an unanswered renewal is not sent again sooner than that
+
+    class FTP:
+        CHUNK_SIZE = 4096  # bytes - the file is read and sent in pieces of this size
+        MAX_UNSENT_DATA = 4 * CHUNK_SIZE  # bytes - the next chunk is only sent once the socket holds less data than that
+        PROGRESS_REPORT_INTERVAL = 5  # seconds
 
     class TCP:
         MAX_SEQUENCE_NUMBER = 2**32 - 1
@@ -231,6 +247,40 @@ class PROTOCOLS:
         DONE_RECEIVING = TCPDoneReceiving
         MAX_UNUSED_CONNECTION_TIME = 15  # seconds
         MAX_MSS = 100
+        RECEIVE_BUFFER_SIZE = 16384  # bytes - the data a socket holds before the process reads it
+        MAX_RECEIVE_WINDOW = 2**16 - 1  # bytes - the largest window that fits in the window field of the TCP header
+
+        class CONGESTION_CONTROL:
+            RENO = "reno"
+            CUBIC = "cubic"
+            DEFAULT = RENO
+
+            INITIAL_WINDOW = 2  # packets
+            MIN_SSTHRESH = 2  # packets
+            RENO_BETA = 0.5  # the window is multiplied by this on a loss
+            CUBIC_BETA = 0.7
+            CUBIC_C = 0.4  # the scaling factor of the cubic window growth function
+
+        DUPLICATE_ACK_THRESHOLD = 3  # duplicate ACKs that trigger a fast retransmission
+
+        class LISTEN:
+            DEFAULT_BACKLOG = 128  # connections that finished the handshake and were not accepted yet
+            DEFAULT_SYN_BACKLOG = 256  # connections in the middle of the handshake (half-open)
+            HANDSHAKE_TIMEOUT = 60  # seconds - a half-open connection is dropped after that time
+            QUEUES_CHECK_INTERVAL = 0.1  # seconds
+
+        class DELAYED_ACK:
+            SEGMENTS = 2  # an ACK is sent for at least every second in-order segment
+            TIMEOUT = 0.2  # seconds - the longest time an in-order segment waits for its ACK
+
+        class RTO:  # retransmission timeout
+            INITIAL = 15  # seconds - used until the first RTT measurement
+            MIN = 1  # seconds
+            MAX = 60  # seconds
+            ALPHA = 1 / 8  # the weight of a new RTT measurement in the smoothed RTT
+            BETA = 1 / 4  # the weight of a new RTT measurement in the RTT variation
+            K = 4  # how many RTT variations are added to the smoothed RTT
+            BACKOFF_FACTOR = 2  # the RTO is multiplied by this on every timeout
 
         class OPTIONS:
             MSS = "MSS"  # maximum segment size
@@ -257,6 +307,47 @@ class PROTOCOLS:
         BLOCKED_PORT = "BLOCKED"
         NO_STATE = "no state!"
 
+        class MODES:
+            STP = "stp"    # classic, timer based (802.1D)
+            RSTP = "rstp"  # rapid, proposal/agreement based (802.1w)
+
+            ALL_MODES = [STP, RSTP]
+
+        class RSTP:
+            VERSION = 2
+            BPDU_TYPE = 2
+
+            HELLO_TIME =          2   # seconds
+            FORWARD_DELAY =       15  # seconds - the fallback for designated ports that are never agreed with
+            EDGE_DETECTION_TIME = 3   # seconds - ports that do not receive a BPDU for that long are edge ports
+            INFO_MAX_AGE =        3 * HELLO_TIME  # received information that is not refreshed for that long is forgotten
+            MAX_AGE = 20  # hops
+
+            PORT_PRIORITY = 128
+
+            ALTERNATE_PORT = "ALTERNATE"
+            BACKUP_PORT = "BACKUP"
+
+            DISCARDING = "discarding"
+            LEARNING = "learning"
+            FORWARDING = "forwarding"
+
+            class FLAGS:
+                TOPOLOGY_CHANGE = 0x01
+                PROPOSAL = 0x02
+                ROLE_MASK = 0x0c
+                ROLE_SHIFT = 2
+                LEARNING = 0x10
+                FORWARDING = 0x20
+                AGREEMENT = 0x40
+                TOPOLOGY_CHANGE_ACK = 0x80
+
+            class ROLES:
+                UNKNOWN = 0
+                ALTERNATE_OR_BACKUP = 1
+                ROOT = 2
+                DESIGNATED = 3
+
     class ECHO_SERVER:
         DEFAULT_REQUEST_COUNT = 1
 
@@ -266,6 +357,11 @@ class PROTOCOLS:
         DEFAULT_TIME_TO_LIVE = 5 * 60  # seconds
         CLIENT_QUERY_TIMEOUT = 12      # seconds
         DEFAULT_RETRY_COUNT = 3
+        NAMESERVER_PENALTY_TIME = 60   # seconds
+
+        class RESOLVER_POLICIES:
+            SEQUENTIAL = "sequential"  # ask the nameservers one after the other until one answers
+            PARALLEL = "parallel"      # ask all of the nameservers at once, the first answer is used
 
 
 class PORTS:
@@ -330,6 +426,7 @@ class MESSAGES:
         LATENCY =                    "insert your desired latency (0 <= latency <= 1)!!!"
         PL =                         "insert your desired pl (0 <= pl <= 1)!!!"
         SPEED =                      "insert your desired connection speed:"
+        BANDWIDTH =                  "insert your desired connection bandwidth (bits per second):"
         IP =                         "Enter your desired IP for this interface:"
         GATEWAY =                    "Enter your desired IP for the gateway:"
         INTERFACE_INFO =             "Insert the name of the interface:"
@@ -617,12 +714,14 @@ class PACKET:
             OPCODES.DHCP.OFFER: IMAGES.PACKETS.DHCP.OFFER,
             OPCODES.DHCP.REQUEST: IMAGES.PACKETS.DHCP.REQUEST,
             OPCODES.DHCP.PACK: IMAGES.PACKETS.DHCP.PACK,
+            OPCODES.DHCP.RELEASE: IMAGES.PACKETS.DHCP.REQUEST,
         },
         "ICMP": {
             OPCODES.ICMP.TYPES.REQUEST: IMAGES.PACKETS.ICMP.REQUEST,
             OPCODES.ICMP.TYPES.REPLY: IMAGES.PACKETS.ICMP.REPLY,
             OPCODES.ICMP.TYPES.TIME_EXCEEDED: IMAGES.PACKETS.ICMP.TIME_EXCEEDED,
             (OPCODES.ICMP.TYPES.UNREACHABLE, OPCODES.ICMP.CODES.NETWORK_UNREACHABLE): IMAGES.PACKETS.ICMP.UNREACHABLE,
+            (OPCODES.ICMP.TYPES.UNREACHABLE, OPCODES.ICMP.CODES.HOST_UNREACHABLE): IMAGES.PACKETS.ICMP.UNREACHABLE,
             (OPCODES.ICMP.TYPES.UNREACHABLE, OPCODES.ICMP.CODES.PORT_UNREACHABLE): IMAGES.PACKETS.ICMP.PORT_UNREACHABLE,
             (OPCODES.ICMP.TYPES.UNREACHABLE, OPCODES.ICMP.CODES.FRAGMENTATION_NEEDED): IMAGES.PACKETS.ICMP.FRAGMENTATION_NEEDED,
         },
@@ -701,6 +800,8 @@ class CONNECTIONS:
     DEFAULT_SPEED = 150  # pixels / second
     DEFAULT_LENGTH = 100  # pixels
     DEFAULT_PL = 0.5  # the point in the connection where packets are dropped
+    DEFAULT_BANDWIDTH = float("inf")  # bits / second - by default packets take no time to be put on the connection
+    DEFAULT_TRANSMIT_QUEUE_LENGTH = 1000  # packets
     MOUSE_TOUCH_SENSITIVITY = 5  # pixels
 
     DEFAULT_WIDTH = 2
@@ -716,11 +817,13 @@ class CONNECTIONS:
     class PACKETS:
         DEFAULT_SPEED = 1.0  # This a scaling factor for the connection speed - per packet
         DECREASE_SPEED_BY = 0.8
+        EVENT_PROGRESS_RANGE = 0.3, 1.0  # the part of the connection where packets are dropped (by PL) or delayed (by latency)
 
     class WIRELESS:
         COLOR = COLORS.BLACK
         DEFAULT_SPEED = 400
         DEFAULT_FREQUENCY = 13.37
+        RECEIVING_DISTANCE = 20  # pixels - how close the edge of the packet should be to an antenna for it to receive the packet
 
     class LOOPBACK:
         RADIUS = 15
@@ -842,6 +945,9 @@ class COMPUTER:
     class ROUTING:
         SENDING_INTERVAL = 0.1
 
+    class PACKET_SENDING_QUEUES:
+        IS_BURST_MODE = False  # send all packets of a stream at once - without the visual time gaps (for high-throughput runs)
+
     class OUTPUT_METHOD:
         CONSOLE = 'console'
         SHELL = 'shell'
@@ -913,6 +1019,21 @@ class COMPUTER:
     class SWITCH_TABLE:
         ITEM_LIFETIME = 300  # seconds
 
+    class STORM_CONTROL:  # limits the frames that a switch floods - for every port and every kind of flooded traffic
+        class TRAFFIC_TYPES:
+            BROADCAST = "broadcast"
+            MULTICAST = "multicast"
+            UNKNOWN_UNICAST = "unknown-unicast"
+
+        class ACTIONS:
+            DROP = "drop"  # frames above the threshold are dropped
+            SHUTDOWN = "shutdown"  # the port is disabled once a threshold is crossed
+
+        RATE = 100  # frames per second
+        BURST = 200  # frames
+        ACTION = ACTIONS.DROP
+        SHUTDOWN_RECOVERY_TIME = 30  # seconds - a port that was shut down is enabled again after that time
+
     class SOCKETS:
         class TYPES:
             SOCK_STREAM = 1
@@ -932,6 +1053,7 @@ class COMPUTER:
             UNBOUND = "UNBOUND"
             BOUND = "BOUND"
             LISTENING = "LISTENING"
+            SYN_RECEIVED = "SYN_RECEIVED"
             ESTABLISHED = "ESTABLISHED"
             CLOSED = "CLOSED"
 
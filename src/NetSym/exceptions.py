@@ -44,6 +44,12 @@ class AddressTooLargeError(AddressError):
     """
 
 
+class DHCPPoolExhaustedError(AddressError):
+    """
+    Occurs when a DHCP server has no free addresses left to hand out in a subnet.
+    """
+
+
 class InvalidDomainHostnameError(InvalidAddressError):
     """
     The supplied domain hostname is invalid
@@ -180,6 +186,12 @@ class TCPDataLargerThanMaxSegmentSize(TCPError):
     """
 
 
+class UnknownCongestionControlError(TCPError):
+    """
+    This is raised when a TCP congestion control algorithm that does not exist is requested
+    """
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 
 
@@ -635,6 +647,12 @@ class TCPSocketConnectionRefused(TCPSocketError):
     """
 
 
+class SocketNotListeningError(WrongUsageSocketError):
+    """
+    Trying to accept connections on a socket that is not listening
+    """
+
+
 class DNSError(PacketError):
     """
     Exception related to the DNS protocol
@@ -248,6 +248,7 @@ class CableConnectionGraphics(ViewableGraphicsObject, DifferentColorWhenHovered)
             "Set PL amount (alt+p)": with_args(user_interface.ask_user_for, float, MESSAGES.INSERT.PL,      self.connection.set_pl),
             "Set speed (alt+s)":     with_args(user_interface.ask_user_for, float, MESSAGES.INSERT.SPEED,   self.connection.set_speed),
             "Set latency (alt+l)":   with_args(user_interface.ask_user_for, float, MESSAGES.INSERT.LATENCY, self.connection.set_latency),
+            "Set bandwidth":         with_args(user_interface.ask_user_for, float, MESSAGES.INSERT.BANDWIDTH, self.connection.set_bandwidth),
         }
 
         buttons.update(additional_buttons or {})
@@ -264,7 +265,10 @@ class CableConnectionGraphics(ViewableGraphicsObject, DifferentColorWhenHovered)
         return f"\nCableConnection:\n\nfrom: {self.start_computer.computer.name}\nto: " \
             f"{self.end_computer.computer.name}\nlength: {str(self.connection.length)[:6]} pixels\nspeed: " \
             f"{self.connection.speed} pixels/second\ndeliver time: {str(self.connection.deliver_time)[:4]} seconds" \
-            f"\nPL percent: {self.connection.packet_loss}"
+            f"\nPL percent: {self.connection.packet_loss}\nbandwidth: {self.connection.bandwidth} bits/second" \
+            f"\ntransmit queues: {self.connection.left_side.transmit_queue_occupancy}, " \
+            f"{self.connection.right_side.transmit_queue_occupancy} packets" \
+            f"\ndropped: {self.connection.left_side.dropped_packets_count + self.connection.right_side.dropped_packets_count}"
 
     def dict_save(self) -> Dict:
         """
@@ -275,6 +279,7 @@ class CableConnectionGraphics(ViewableGraphicsObject, DifferentColorWhenHovered)
             "class": "Connection",
             "packet_loss": self.connection.packet_loss,
             "speed": self.connection.speed,
+            "bandwidth": self.connection.bandwidth,
             "start": {
                 "computer": self.start_computer.computer.name,
                 "interface": get_the_one_with_raise(
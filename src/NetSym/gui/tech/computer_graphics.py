@@ -28,6 +28,7 @@ if TYPE_CHECKING:
     from NetSym.computing.internals.processes.abstracts.process import Process
     from NetSym.gui.tech.network_interfaces.network_interface_graphics import NetworkInterfaceGraphics
     from NetSym.computing.computer import Computer
+    from NetSym.computing.switch import Switch
     from NetSym.gui.user_interface.user_interface import UserInterface
 
 
@@ -200,7 +201,12 @@ class ComputerGraphics(ImageGraphics):
                     user_interface.popup_message,
                     ResultOf(self.computer.get_mac_address_table_string),
                     title="MAC Address Table",
-                )
+                ),
+                "show storm control": with_args(
+                    user_interface.popup_message,
+                    ResultOf(self.computer.get_storm_control_string),
+                    title="Storm Control",
+                ),
             },
         }
         all_buttons = {}
@@ -380,6 +386,9 @@ class ComputerGraphics(ImageGraphics):
         if self.class_name == "Router":
             dict_["is_dhcp_server"] = self.computer.process_scheduler.is_usermode_process_running_by_type(DHCPServerProcess)
 
+        if self.class_name in ["Switch", "Hub"]:
+            dict_["stp_mode"] = cast("Switch", self.computer).stp_mode
+
         return dict_
 
     def delete(self, user_interface: Optional[UserInterface]) -> None:
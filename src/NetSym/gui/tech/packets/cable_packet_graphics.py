@@ -12,6 +12,7 @@ from NetSym.packets.usefuls.usefuls import get_original_layer_name_by_instance
 from NetSym.usefuls.funcs import with_args
 
 if TYPE_CHECKING:
+    from NetSym.computing.connections.cable_connection import CableSentPacket
     from NetSym.gui.tech.cable_connection_graphics import CableConnectionGraphics
     from NetSym.gui.user_interface.user_interface import UserInterface
 
@@ -36,8 +37,8 @@ class CablePacketGraphics(PacketGraphics, ImageGraphics):
         :param connection_graphics: The `CableConnectionGraphics` object which is the graphics of the `CableConnection` this packet
             is sent through. It is used for the start and end coordinates.
 
-        The self.progress variable is how much of the connection the packet has passed already. That information comes
-        from the `CableConnection` class that sent the packet. It updates it in the `CableConnection.move_packets` method.
+        The self.progress property is how much of the connection the packet has passed already. That information comes
+        from the `CableSentPacket` of the packet, which the `CableConnection` sets once the packet starts going through it.
         """
         super(CablePacketGraphics, self).__init__(
             image_from_packet(deepest_layer),
@@ -50,13 +51,31 @@ class CablePacketGraphics(PacketGraphics, ImageGraphics):
 
         self.connection_graphics = connection_graphics
         self.direction = direction
-        self.progress = 0.
+        self.sent_packet: Optional[CableSentPacket] = None
         self.str = get_original_layer_name_by_instance(deepest_layer)
         self.deepest_layer = deepest_layer
         self.speed = speed
 
         self.drop_animation = None
 
+    @property
+    def progress(self) -> float:
+        """
+        How much of the connection the packet has passed already (a number from 0 to 1)
+        It is computed from the time the packet was sent - the connection does not update it on every tick
+        """
+        if self.sent_packet is None:
+            return 0.
+        return self.sent_packet.progress
+
+    def decrease_speed(self) -> None:
+        """
+        Decreases the speed of the packet - and lets the connection know the packet will arrive later
+        """
+        super(CablePacketGraphics, self).decrease_speed()
+        if self.sent_packet is not None:
+            self.sent_packet.set_speed(self.speed)
+
     @property
     def should_be_transparent(self) -> bool:
         """
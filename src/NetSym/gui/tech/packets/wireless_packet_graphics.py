@@ -16,7 +16,7 @@ from NetSym.usefuls.funcs import distance
 
 if TYPE_CHECKING:
     from NetSym.gui.user_interface.user_interface import UserInterface
-    from NetSym.computing.connections.wireless_connection import WirelessConnection
+    from NetSym.computing.connections.wireless_connection import WirelessConnection, WirelessSentPacket
 
 
 class WirelessPacketGraphics(PacketGraphics, ViewableGraphicsObject, DifferentColorWhenHovered):
@@ -36,11 +36,30 @@ class WirelessPacketGraphics(PacketGraphics, ViewableGraphicsObject, DifferentCo
 
         self.connection = connection
         self.direction = PACKET.DIRECTION.WIRELESS
-        self.distance = 0.
+        self.sent_packet: Optional[WirelessSentPacket] = None
         self.str = str(deepest_layer)
         self.deepest_layer = deepest_layer
         self.color: T_Color = COLORS.WHITE
 
+    @property
+    def distance(self) -> float:
+        """The radius of the packet - its distance from the antenna that sent it. That information comes from the sent packet"""
+        if self.sent_packet is None:
+            return 0.
+        return self.sent_packet.distance
+
+    @property
+    def speed(self) -> float:
+        """The speed of the packet. That information comes from the sent packet - so changing it changes the time the packet arrives"""
+        if self.sent_packet is None:
+            return self.connection.speed
+        return self.sent_packet.speed
+
+    @speed.setter
+    def speed(self, speed: float) -> None:
+        if self.sent_packet is not None:
+            self.sent_packet.set_speed(speed)
+
     @property
     def center_x(self) -> float:
         return self.x
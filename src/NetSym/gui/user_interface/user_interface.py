@@ -1132,8 +1132,7 @@ class UserInterface:
                 if sent_packet.packet.graphics is packet_graphics:
                     self.selected_object = None
                     self.set_mode(MODES.NORMAL)
-                    connection.sent_packets.remove(sent_packet)
-                    packet_graphics.unregister()
+                    connection.stop_packet(sent_packet)
                     self.main_loop.register_graphics_object(packet_graphics.get_drop_animation())
                     return
         raise NoSuchPacketError("That packet cannot be found!")
@@ -1575,7 +1574,8 @@ class UserInterface:
                                     start_interface_name: str,
                                     end_interface_name: str,
                                     connection_packet_loss: float = 0.0,
-                                    connection_speed: int = CONNECTIONS.DEFAULT_SPEED) -> None:
+                                    connection_speed: int = CONNECTIONS.DEFAULT_SPEED,
+                                    connection_bandwidth: float = CONNECTIONS.DEFAULT_BANDWIDTH) -> None:
         """
         Connects two computers' interfaces by names of the computers and the interfaces
         """
@@ -1599,6 +1599,7 @@ class UserInterface:
 
         connection.set_pl(connection_packet_loss)
         connection.set_speed(connection_speed)
+        connection.set_bandwidth(connection_bandwidth)
 
     def _save_or_ask_user_for_filename_and_then_save(self) -> None:
         """
@@ -1676,6 +1677,7 @@ class UserInterface:
                 connection_dict["end"]["interface"],
                 connection_dict["packet_loss"],
                 connection_dict["speed"],
+                connection_dict.get("bandwidth", CONNECTIONS.DEFAULT_BANDWIDTH),
             )
 
     def _ask_user_for_load_file(self) -> None:
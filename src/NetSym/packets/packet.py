@@ -54,6 +54,13 @@ class Packet(ABC):
         """
         return self.__class__(self.data.copy())
 
+    def shallow_copy(self: Packet) -> Packet:
+        """
+        Return a separate packet object (with its own graphics) that shares the same layers with this one.
+        This is much cheaper than `copy` - but the layers should not be modified while the other packet is in use.
+        """
+        return self.__class__(self.data)
+
     def is_valid(self) -> bool:
         """
         Returns whether or not the packet is valid.
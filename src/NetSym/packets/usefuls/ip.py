@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import List, TYPE_CHECKING
+from zlib import crc32
 
 from NetSym.consts import PROTOCOLS
 from NetSym.exceptions import PacketAlreadyFragmentedError, InvalidFragmentsError, PacketTooLongToFragment
@@ -137,3 +138,20 @@ def allows_fragmentation(packet: Packet) -> bool:
     Whether or not the packet can be fragmented if needed
     """
     return not (packet["IP"].flags & PROTOCOLS.IP.FLAGS.DONT_FRAGMENT)
+
+
+def flow_hash(packet: Packet) -> int:
+    """
+    Hash the flow of the packet - its source and destination IP addresses, its protocol and (for TCP and UDP) its ports.
+    All of the packets of a flow have the same hash, which is stable between runs (unlike the builtin `hash`).
+    Fragments are hashed without the ports, since only the first fragment holds them.
+    """
+    ip_layer = packet["IP"]
+    src_port = dst_port = 0
+    if not needs_reassembly(packet):
+        for protocol in ("TCP", "UDP"):
+            if protocol in packet:
+                src_port, dst_port = packet[protocol].src_port, packet[protocol].dst_port
+                break
+
+    return crc32(f"{ip_layer.src_ip} {ip_layer.dst_ip} {ip_layer.proto} {src_port} {dst_port}".encode())
@@ -29,6 +29,20 @@ def test_is_broadcast(mac, expected):
     assert MACAddress(mac).is_broadcast() is expected
 
 
+@pytest.mark.parametrize(
+    "mac, expected",
+    [
+        ("ff:ff:ff:ff:ff:ff", True),
+        ("01:80:c2:00:00:00", True),
+        ("33:33:00:00:00:01", True),
+        ("00:22:33:55:ff:ee", False),
+        ("02:00:00:00:00:01", False),
+    ]
+)
+def test_is_multicast(mac, expected):
+    assert MACAddress(mac).is_multicast() is expected
+
+
 @pytest.mark.parametrize(
     "expected",
     [
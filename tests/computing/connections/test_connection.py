@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+
+from pytest import MonkeyPatch
+
+from NetSym.computing.connections.cable_connection import CableConnection
+from NetSym.computing.connections.wireless_connection import WirelessConnection
+from NetSym.gui.tech.packets.wireless_packet_graphics import WirelessPacketGraphics
+from NetSym.packets.cable_packet import CablePacket
+from tests.usefuls import mock_mainloop_time, example_ethernet, example_ip
+
+
+def _example_packet():
+    return CablePacket(example_ethernet() / example_ip())
+
+
+def test_transmit_without_bandwidth_limit():
+    with MonkeyPatch.context() as m:
+        mock_mainloop_time(m)
+        side = CableConnection().left_side
+
+        for _ in range(3):
+            side.send(_example_packet())
+
+        assert side.is_sending()
+        assert len(side.pop_packets_to_send()) == 3
+        assert side.transmit_queue_occupancy == 0
+        assert side.transmitted_packets_count == 3
+
+
+def test_transmit_serialization_delay():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_mainloop_time(m)
+        connection = CableConnection()
+        side = connection.left_side
+        packet = _example_packet()
+        connection.set_bandwidth(len(packet.data) * 8)  # exactly one packet per second
+
+        for _ in range(3):
+            side.send(packet.copy())
+
+        assert connection.serialization_delay(packet) == 1
+        assert not side.is_sending()
+
+        for expected_transmitted_count in [1, 2, 3, 3]:
+            main_loop.increase_time_by(1)
+            side.pop_packets_to_send()
+            assert side.transmitted_packets_count == expected_transmitted_count
+            assert side.transmit_queue_occupancy == 3 - expected_transmitted_count
+
+
+def test_transmit_queue_tail_drop():
+    with MonkeyPatch.context() as m:
+        mock_mainloop_time(m)
+        connection = CableConnection()
+        side = connection.left_side
+        connection.set_bandwidth(1)
+        side.set_transmit_queue_length(2)
+
+        packets = [_example_packet() for _ in range(5)]
+        for packet in packets:
+            side.send(packet)
+
+        assert side.transmit_queue_occupancy == 2
+        assert side.dropped_packets_count == 3
+        assert list(side._packets_to_send) == packets[:2]
+
+
+def test_wireless_delivery_by_distance():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_mainloop_time(m)
+        connection = WirelessConnection(1, longest_line_on_the_screen=1000, speed=100)
+        sides = [
+            connection.get_side(SimpleNamespace(get_graphics=lambda x=x: SimpleNamespace(location=(x, 0))))
+            for x in [0, 120, 520, 2000]
+        ]
+        connection._add_packet(_example_packet(), sides[0])
+        assert len(connection._deliveries) == 2  # not to the sender and not to the antenna outside of the screen
+
+        for time_passed, expected_received in [(0.5, [0, 0, 0, 0]), (1, [0, 1, 0, 0]), (5, [0, 1, 1, 0]), (10, [0, 1, 1, 0])]:
+            main_loop.set_time(1 + time_passed)
+            connection._receive_on_sides_if_reached_destination()
+            assert [len(side._packets_to_receive) for side in sides] == expected_received
+
+
+def test_wireless_packet_events():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_mainloop_time(m)
+        m.setattr(WirelessPacketGraphics, 'get_drop_animation', lambda self: "drop animation")
+        connection = WirelessConnection(1, longest_line_on_the_screen=1000, speed=100)
+        side = connection.get_side(SimpleNamespace(get_graphics=lambda: SimpleNamespace(location=(0, 0), x=0, y=0)))
+        side.send(_example_packet())
+        side.send(_example_packet())
+        connection._send_packets_from_side(side)
+        dropped, remaining = connection.sent_packets
+        dropped.will_be_dropped = True
+        connection._packet_events.clear()
+        connection._schedule_packet_event(dropped)
+        connection._schedule_packet_event(remaining)
+
+        main_loop.set_time(dropped.time_of_distance(dropped.event_distance))
+        assert len(connection._handle_due_packet_events()) == 1
+        assert connection.sent_packets == [remaining]
+        assert remaining.packet.get_graphics().distance == remaining.distance
+
+        main_loop.increase_time_by(10)
+        connection._handle_due_packet_events()
+        assert not connection.sent_packets
+
+
+def test_wireless_delayed_packet_arrives_later():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_mainloop_time(m)
+        m.setattr(WirelessPacketGraphics, 'get_decrease_speed_animation', lambda self: "latency animation")
+        connection = WirelessConnection(1, longest_line_on_the_screen=1000, speed=100)
+        sender, receiver = [
+            connection.get_side(SimpleNamespace(get_graphics=lambda x=x: SimpleNamespace(location=(x, 0), x=x, y=0)))
+            for x in [0, 520]
+        ]
+        sender.send(_example_packet())
+        connection._send_packets_from_side(sender)
+        sent_packet, = connection.sent_packets
+        sent_packet.will_be_delayed, sent_packet.event_distance = True, 100
+        connection._packet_events.clear()
+        connection._schedule_packet_event(sent_packet)
+        on_time_arrival = connection._deliveries[0][0]
+
+        main_loop.set_time(sent_packet.time_of_distance(100))
+        assert connection._handle_due_packet_events() == ["latency animation"]
+        assert sent_packet.speed < 100
+        assert sent_packet.distance == 100  # the packet does not jump when it slows down
+        assert connection._deliveries[0][0] == sent_packet.time_of_distance(500) > on_time_arrival
+
+        main_loop.set_time(on_time_arrival)
+        connection._receive_on_sides_if_reached_destination()
+        assert not receiver._packets_to_receive
+
+        main_loop.set_time(sent_packet.time_of_distance(500))
+        connection._receive_on_sides_if_reached_destination()
+        assert len(receiver._packets_to_receive) == 1
@@ -0,0 +1,32 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.address.ip_address import IPAddress
+from NetSym.computing.internals.network_data_structures.arp_pending_table import ARPPendingTable
+from NetSym.packets.all import IP
+from tests.usefuls import mock_mainloop_time
+
+
+def test_packets_wait_per_address_in_order():
+    with MonkeyPatch.context() as m:
+        mock_mainloop_time(m)
+        table = ARPPendingTable()
+
+        table.enqueue("1.1.1.1", IP(dst_ip="1.1.1.1", id=1))
+        table.enqueue(IPAddress("1.1.1.1"), IP(dst_ip="1.1.1.1", id=2))
+        table.enqueue("2.2.2.2", IP(dst_ip="2.2.2.2", id=3))
+
+        assert len(table) == 2
+        assert "1.1.1.1" in table
+        assert [ip_layer.id for ip_layer in table.pop("1.1.1.1")] == [1, 2]
+        assert "1.1.1.1" not in table
+        assert table.pop("1.1.1.1") == []
+
+
+def test_queue_is_bounded():
+    with MonkeyPatch.context() as m:
+        mock_mainloop_time(m)
+        table = ARPPendingTable(max_queue_length=2)
+
+        assert [table.enqueue("1.1.1.1", IP(dst_ip="1.1.1.1")) for _ in range(3)] == [True, True, False]
+        assert table.dropped_count == 1
+        assert len(table["1.1.1.1"].packets) == 2
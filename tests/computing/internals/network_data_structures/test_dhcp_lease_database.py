@@ -0,0 +1,95 @@
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.address.ip_address import IPAddress
+from NetSym.computing.internals.network_data_structures.dhcp_lease_database import AddressPool, DHCPLeaseDatabase
+from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
+from NetSym.exceptions import DHCPPoolExhaustedError
+from tests.usefuls import MACS, mock_mainloop_time
+
+LEASE_TIME, OFFER_TIME = 100, 10
+
+
+def example_database(patcher, server_ip="10.0.0.1/29"):
+    main_loop = mock_mainloop_time(patcher)
+    interface = CableNetworkInterface("00:00:00:00:00:01", server_ip, name="eth0")
+    database = DHCPLeaseDatabase(lease_time=LEASE_TIME, offer_time=OFFER_TIME)
+    database.add_pool(interface, reserved=[IPAddress("10.0.0.6/29")])
+    return database, interface, main_loop
+
+
+def test_pool_allocates_lowest_free_address_after_server():
+    pool = AddressPool(IPAddress("10.0.0.3/29"))
+    assert pool.size == 6
+    assert [str(pool.allocate()) for _ in range(5)] == ["10.0.0.4", "10.0.0.5", "10.0.0.6", "10.0.0.1", "10.0.0.2"]
+    assert pool.allocate() is None
+    assert pool.utilization == 1
+
+    pool.free(IPAddress("10.0.0.5/29"))
+    pool.free(IPAddress("10.0.0.5/29"))
+    assert len(pool) == 5
+    assert str(pool.allocate()) == "10.0.0.5"
+    assert pool.allocate(IPAddress("10.0.0.7/29")) is None
+
+
+def test_returning_client_gets_its_lease_back():
+    with MonkeyPatch.context() as m:
+        database, interface, _ = example_database(m)
+        offered = database.offer(MACS[0], interface)
+        assert str(offered) == "10.0.0.2"
+        assert database.offer(MACS[0], interface) == offered
+        assert str(database.offer(MACS[1], interface)) == "10.0.0.3"
+
+        lease = database.bind(MACS[0], interface, offered)
+        assert lease.is_bound
+        assert database.offer(MACS[0], interface) == offered
+        assert len(database.pools[interface]) == 4
+
+
+def test_leases_expire_unless_renewed():
+    with MonkeyPatch.context() as m:
+        database, interface, main_loop = example_database(m)
+        database.bind(MACS[0], interface, database.offer(MACS[0], interface))
+        database.offer(MACS[1], interface)
+
+        main_loop.increase_time_by(OFFER_TIME + 1)
+        assert database.expire_leases() == 1
+        assert MACS[1] not in database
+
+        main_loop.increase_time_by(LEASE_TIME - OFFER_TIME - 5)
+        database.renew(MACS[0])
+        main_loop.increase_time_by(10)
+        assert database.expire_leases() == 0
+        assert database[MACS[0]].time_left == LEASE_TIME - 10
+
+        main_loop.increase_time_by(LEASE_TIME)
+        assert database.expire_leases() == 1
+        assert len(database) == 0
+        assert len(database.pools[interface]) == 2
+
+
+def test_release_and_exhaustion():
+    with MonkeyPatch.context() as m:
+        database, interface, main_loop = example_database(m)
+        macs = [f"00:00:00:00:01:0{i}" for i in range(5)]
+        for mac in macs[:4]:
+            database.offer(mac, interface)
+
+        with pytest.raises(DHCPPoolExhaustedError):
+            database.offer(macs[4], interface)
+
+        assert database.release(macs[1])
+        assert not database.release(macs[1])
+        assert str(database.offer(macs[4], interface)) == "10.0.0.3"
+
+        main_loop.increase_time_by(OFFER_TIME + 1)
+        assert str(database.offer(macs[1], interface)) == "10.0.0.2"
+
+
+def test_request_for_a_specific_address():
+    with MonkeyPatch.context() as m:
+        database, interface, _ = example_database(m)
+        assert database.bind(MACS[0], interface) is None
+        assert str(database.bind(MACS[0], interface, IPAddress("10.0.0.4/29")).ip) == "10.0.0.4"
+        assert database.bind(MACS[1], interface, IPAddress("10.0.0.4/29")) is None
+        assert database.bind(MACS[1], interface, IPAddress("10.0.0.6/29")) is None
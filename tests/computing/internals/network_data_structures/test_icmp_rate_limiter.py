@@ -0,0 +1,30 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.computing.internals.network_data_structures.icmp_rate_limiter import ICMPRateLimiter
+from NetSym.consts import OPCODES
+from tests.usefuls import mock_mainloop_time
+
+REPLY, UNREACHABLE = OPCODES.ICMP.TYPES.REPLY, OPCODES.ICMP.TYPES.UNREACHABLE
+
+
+def test_every_icmp_type_has_its_own_bucket():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_mainloop_time(m)
+        limiter = ICMPRateLimiter(rate=1, burst=2)
+        limiter.configure(UNREACHABLE, rate=10, burst=5)
+
+        assert [limiter.allow(REPLY) for _ in range(3)] == [True, True, False]
+        assert all(limiter.allow(UNREACHABLE) for _ in range(5))
+        assert not limiter.allow(UNREACHABLE)
+
+        assert limiter.statistics[REPLY].sent_count == 2
+        assert limiter.statistics[REPLY].suppressed_count == 1
+        assert limiter.suppressed_count == 2
+
+        main_loop.increase_time_by(1)
+        assert limiter.allow(REPLY)
+        assert not limiter.allow(REPLY)
+
+        limiter.wipe()
+        assert limiter.suppressed_count == 0
+        assert all(limiter.allow(UNREACHABLE) for _ in range(5))
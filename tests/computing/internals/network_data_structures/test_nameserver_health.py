@@ -0,0 +1,39 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.address.ip_address import IPAddress
+from NetSym.computing.internals.network_data_structures.nameserver_health import NameserverHealth
+from tests.usefuls import IPS, mock_mainloop_time
+
+PENALTY_TIME = 10
+SERVERS = [IPAddress(IPS[0]), IPAddress(IPS[1])]
+
+
+def test_servers_that_time_out_are_asked_last():
+    with MonkeyPatch.context() as m:
+        mock_mainloop_time(m)
+        health = NameserverHealth(penalty_time=PENALTY_TIME)
+        assert health.ordered(SERVERS) == SERVERS
+
+        health.record_timeout(IPS[0])
+        assert health.ordered(SERVERS) == SERVERS[::-1]
+        assert health[SERVERS[0]].timeout_count == 1
+
+        health.record_answer(IPS[0], 0.5)
+        assert health.ordered(SERVERS) == SERVERS
+        assert health[IPS[0]].last_response_time == 0.5
+
+
+def test_penalty_ends_after_a_while():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_mainloop_time(m)
+        health = NameserverHealth(penalty_time=PENALTY_TIME)
+        health.record_timeout(IPS[0])
+        health.record_timeout(IPS[0])
+        health.record_timeout(IPS[1])
+
+        assert health.penalty(IPS[0]) == 2
+        assert health.ordered(SERVERS) == SERVERS[::-1]
+
+        main_loop.increase_time_by(PENALTY_TIME + 1)
+        assert health.penalty(IPS[0]) == 0
+        assert health.ordered(SERVERS) == SERVERS
@@ -213,3 +213,32 @@ def test_from_dict_load(example_table):
     }
 
     assert RoutingTable.from_dict_load(dict_).dictionary == example_table.dictionary
+
+
+def test_equal_cost_routes(example_table):
+    destination = IPAddress("10.0.0.0/8")
+    example_table.route_add(destination, "1.2.3.1", "1.2.3.200")
+    example_table.route_add(destination, "2.2.2.1", "2.2.2.200", append=True)
+    example_table.route_add(destination, "2.2.2.1", "2.2.2.200", append=True)
+
+    assert [item.gateway_ip for item in example_table.next_hops(destination)] == ["1.2.3.1", "2.2.2.1"]
+    assert example_table["10.1.1.1"].gateway_ip == "1.2.3.1"
+    assert example_table.route("10.1.1.1", flow_hash=7).gateway_ip == "2.2.2.1"
+    assert {str(example_table.route("10.1.1.1", flow_hash).gateway_ip) for flow_hash in range(10)} == {"1.2.3.1", "2.2.2.1"}
+    assert example_table.route("1.200.200.70", flow_hash=7).gateway_ip == "1.4.4.1"
+
+    example_table.count_forwarded(example_table.route("10.1.1.1", flow_hash=7))
+    assert example_table.next_hop_counters == {("2.2.2.1", "2.2.2.200"): 1}
+    assert "2.2.2.1" in repr(example_table)
+
+    assert RoutingTable.from_dict_load(example_table.dict_save()).multipath == example_table.multipath
+
+    with pytest.raises(RoutingTableError):
+        example_table.route_delete(destination, IPAddress("9.9.9.9"))
+    example_table.route_delete(destination, IPAddress("1.2.3.1"))
+    assert example_table.next_hops(destination) == [RoutingTableItem(IPAddress("2.2.2.1"), IPAddress("2.2.2.200"))]
+    assert destination not in example_table.multipath
+
+    example_table.route_add(destination, "1.2.3.1", "1.2.3.200", append=True)
+    example_table.route_add(destination, "1.4.4.1", "1.4.4.200")
+    assert example_table.next_hops(destination) == [RoutingTableItem(IPAddress("1.4.4.1"), IPAddress("1.4.4.200"))]
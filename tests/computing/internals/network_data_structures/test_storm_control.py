@@ -0,0 +1,46 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.computing.internals.network_data_structures.storm_control import StormControl
+from NetSym.consts import COMPUTER
+from tests.usefuls import mock_mainloop_time
+
+TRAFFIC_TYPES, ACTIONS = COMPUTER.STORM_CONTROL.TRAFFIC_TYPES, COMPUTER.STORM_CONTROL.ACTIONS
+PORT1, PORT2 = object(), object()
+
+
+def test_every_port_and_traffic_type_has_its_own_threshold():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_mainloop_time(m)
+        storm_control = StormControl(rate=1, burst=2)
+        storm_control.configure(TRAFFIC_TYPES.MULTICAST, rate=None)
+
+        assert [storm_control.allow(PORT1, TRAFFIC_TYPES.BROADCAST) for _ in range(3)] == [True, True, False]
+        assert storm_control.allow(PORT2, TRAFFIC_TYPES.BROADCAST)
+        assert storm_control.allow(PORT1, TRAFFIC_TYPES.UNKNOWN_UNICAST)
+        assert all(storm_control.allow(PORT1, TRAFFIC_TYPES.MULTICAST) for _ in range(10))
+
+        assert storm_control[PORT1].drop_counts[TRAFFIC_TYPES.BROADCAST] == 1
+        assert storm_control[PORT2].drop_counts[TRAFFIC_TYPES.BROADCAST] == 0
+        assert not storm_control.is_shut_down(PORT1)
+
+        main_loop.increase_time_by(1)
+        assert storm_control.allow(PORT1, TRAFFIC_TYPES.BROADCAST)
+
+
+def test_shutdown_action_disables_the_port_until_it_recovers():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_mainloop_time(m)
+        storm_control = StormControl(rate=1, burst=1, action=ACTIONS.SHUTDOWN, recovery_time=10)
+
+        assert storm_control.allow(PORT1, TRAFFIC_TYPES.BROADCAST)
+        assert not storm_control.allow(PORT1, TRAFFIC_TYPES.BROADCAST)
+        assert storm_control.is_shut_down(PORT1)
+        assert not storm_control.is_shut_down(PORT2)
+        assert storm_control.shutdown_count == 1
+
+        main_loop.increase_time_by(5)
+        assert storm_control.is_shut_down(PORT1)
+
+        main_loop.increase_time_by(5)
+        assert not storm_control.is_shut_down(PORT1)
+        assert storm_control.allow(PORT1, TRAFFIC_TYPES.BROADCAST)
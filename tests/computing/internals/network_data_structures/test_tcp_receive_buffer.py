@@ -0,0 +1,28 @@
+from NetSym.computing.internals.network_data_structures.tcp_receive_buffer import TCPReceiveBuffer
+
+
+def test_partial_reads():
+    buffer = TCPReceiveBuffer(capacity=20)
+    buffer.append(b'abcde')
+    buffer.append(memoryview(b'fghij'))
+    buffer.append(b'')
+    assert len(buffer) == 10
+    assert buffer.free_space == 10
+
+    assert buffer.read(3) == b'abc'
+    assert buffer.read(4) == b'defg'
+    assert len(buffer) == 3
+    assert buffer.read(100) == b'hij'
+    assert buffer.read() == b''
+    assert not buffer
+
+
+def test_read_everything_and_capacity():
+    buffer = TCPReceiveBuffer(capacity=8)
+    for piece in [b'ab', b'cd', b'efgh', b'ij']:
+        buffer.append(piece)
+
+    assert buffer.free_space == 0
+    assert buffer.read(1) == b'a'
+    assert buffer.read() == b'bcdefghij'
+    assert buffer.free_space == 8
@@ -0,0 +1,17 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.computing.internals.network_data_structures.token_bucket import TokenBucket
+from tests.usefuls import mock_mainloop_time
+
+
+def test_token_bucket_refills_up_to_its_burst():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_mainloop_time(m)
+        bucket = TokenBucket(rate=2, burst=3)
+        assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+
+        main_loop.increase_time_by(1)
+        assert [bucket.take() for _ in range(3)] == [True, True, False]
+
+        main_loop.increase_time_by(100)
+        assert [bucket.take() for _ in range(4)] == [True, True, True, False]
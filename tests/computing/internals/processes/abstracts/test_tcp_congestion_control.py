@@ -0,0 +1,66 @@
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.computing.internals.processes.abstracts.tcp_congestion_control import get_congestion_control, \
+    RenoCongestionControl, CubicCongestionControl
+from NetSym.consts import PROTOCOLS
+from NetSym.exceptions import UnknownCongestionControlError
+from tests.usefuls import mock_mainloop_time
+
+
+@pytest.mark.parametrize(
+    "name, expected_type",
+    [
+        (PROTOCOLS.TCP.CONGESTION_CONTROL.RENO,  RenoCongestionControl),
+        (PROTOCOLS.TCP.CONGESTION_CONTROL.CUBIC, CubicCongestionControl),
+    ]
+)
+def test_get_congestion_control(name, expected_type):
+    with MonkeyPatch.context() as m:
+        mock_mainloop_time(m)
+        assert isinstance(get_congestion_control(name), expected_type)
+
+
+def test_get_unknown_congestion_control():
+    with pytest.raises(UnknownCongestionControlError):
+        get_congestion_control("vegas")
+
+
+def test_reno_slow_start_and_congestion_avoidance():
+    reno = RenoCongestionControl(initial_window=2, initial_ssthresh=8)
+
+    reno.on_ack(2)
+    assert reno.cwnd == 4
+    reno.on_ack(4)
+    assert reno.cwnd == 8
+    assert not reno.is_in_slow_start
+
+    reno.on_ack(8)
+    assert 8.9 < reno.cwnd < 9
+
+
+def test_reno_loss_and_timeout():
+    reno = RenoCongestionControl(initial_window=10, initial_ssthresh=20)
+
+    reno.on_loss(flight_size=10)
+    assert reno.cwnd == reno.ssthresh == 5
+
+    reno.on_timeout(flight_size=2)
+    assert reno.cwnd == 1
+    assert reno.ssthresh == PROTOCOLS.TCP.CONGESTION_CONTROL.MIN_SSTHRESH
+
+
+def test_cubic_grows_back_to_last_max():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_mainloop_time(m)
+        cubic = CubicCongestionControl(initial_window=20, initial_ssthresh=10)
+
+        cubic.on_loss(flight_size=20)
+        assert cubic.cwnd == 20 * PROTOCOLS.TCP.CONGESTION_CONTROL.CUBIC_BETA
+
+        main_loop.increase_time_by(cubic.k)
+        assert cubic.target_window() == pytest.approx(20)
+
+        for _ in range(100):
+            cubic.on_ack(1)
+        assert 14 < cubic.cwnd <= 20
@@ -0,0 +1,225 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.address.ip_address import IPAddress
+from NetSym.address.mac_address import MACAddress
+from NetSym.computing.computer import Computer
+from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
+from NetSym.computing.internals.processes.abstracts.tcp_process import ReceivingWindow, TCPProcess
+from NetSym.consts import OS, OPCODES, PROTOCOLS
+from NetSym.packets.all import TCP
+from tests.computing.test_computer import mock_for_computer_generation
+from tests.usefuls import MACS, IPS, example_ethernet, example_ip
+
+
+def sack_blocks(window):
+    return [(block.left, block.right) for block in window.sack_blocks]
+
+
+def test_add_range_to_sack():
+    window = ReceivingWindow()
+    window.ack_number = 100
+
+    for left, right in [(600, 700), (200, 300), (400, 500), (250, 400), (800, 900)]:
+        window.add_range_to_sack(left, right)
+    assert sack_blocks(window) == [(200, 500), (600, 700), (800, 900)]
+
+    window.add_range_to_sack(500, 850)
+    assert sack_blocks(window) == [(200, 900)]
+    assert window.ack_number == 100
+
+
+def test_merge_sack_blocks_into_ack_number():
+    window = ReceivingWindow()
+    window.ack_number = 200
+    window.add_range_to_sack(300, 400)
+    window.add_range_to_sack(600, 700)
+
+    window.ack_number = 300
+    window.merge_sack_blocks()
+    assert window.ack_number == 400
+    assert sack_blocks(window) == [(600, 700)]
+
+
+def test_contiguous_data_is_delivered_at_once():
+    window = ReceivingWindow()
+    for sequence_number in [20, 0, 10, 40]:
+        window.add_packet(example_data_segment(sequence_number))
+    window.ack_number = 30
+
+    received_data = []
+    window.add_data_and_remove_from_window(received_data)
+    data, = received_data
+    assert isinstance(data, memoryview)
+    assert bytes(data) == b'a' * 30
+    assert list(window.segments) == [40]
+
+
+class ExampleTCPProcess(TCPProcess):
+    def code(self):
+        yield from []
+
+
+def example_tcp_process(patcher):
+    main_loop = mock_for_computer_generation(patcher)
+    computer = Computer("c1", OS.WINDOWS, None, CableNetworkInterface(MACS[0], f"{IPS[0]}/8", "c1i0"))
+    process = ExampleTCPProcess(1, computer, dst_ip=IPAddress("1.0.0.1"))
+    process.dst_mac = MACAddress(MACS[1])
+    sent_acks = []
+    patcher.setattr(process.sending_window, 'add_no_wait', sent_acks.append)
+    return process, sent_acks, main_loop
+
+
+def example_data_segment(sequence_number):
+    return example_ethernet() / example_ip() / TCP(sequence_number=sequence_number, flags=OPCODES.TCP.PSH) / ('a' * 10)
+
+
+def test_in_order_segments_are_acked_together():
+    with MonkeyPatch.context() as m:
+        process, sent_acks, _ = example_tcp_process(m)
+
+        process._delay_ack_for(example_data_segment(0))
+        process._send_delayed_ack_if_needed()
+        assert not sent_acks
+
+        process._delay_ack_for(example_data_segment(10))
+        process._send_delayed_ack_if_needed()
+        ack, = sent_acks
+        assert ack["TCP"].ack_number == 20
+
+
+def test_delayed_ack_timeout():
+    with MonkeyPatch.context() as m:
+        process, sent_acks, main_loop = example_tcp_process(m)
+
+        process._delay_ack_for(example_data_segment(0))
+        main_loop.increase_time_by(PROTOCOLS.TCP.DELAYED_ACK.TIMEOUT / 2)
+        process._send_delayed_ack_if_needed()
+        assert not sent_acks
+
+        main_loop.increase_time_by(PROTOCOLS.TCP.DELAYED_ACK.TIMEOUT)
+        process._send_delayed_ack_if_needed()
+        ack, = sent_acks
+        assert ack["TCP"].ack_number == 10
+
+
+def test_out_of_order_segment_is_acked_immediately():
+    with MonkeyPatch.context() as m:
+        process, sent_acks, _ = example_tcp_process(m)
+
+        process._delay_ack_for(example_data_segment(10))
+        ack, = sent_acks
+        assert ack["TCP"].ack_number == 0
+        assert ack["TCP"].parsed_options.SACK == (10, 20)
+
+
+def test_send_buffer_is_segmented_by_mss():
+    with MonkeyPatch.context() as m:
+        process, _, _ = example_tcp_process(m)
+
+        process.send('a' * 250)
+        process._segment_send_buffer()
+        assert [len(packet["TCP"].payload) for packet in process.sending_window.waiting_for_sending] == [100, 100]
+        assert process.buffered_data_length == 50  # the small segment waits until the window is empty (Nagle)
+
+
+def test_small_writes_are_coalesced():
+    with MonkeyPatch.context() as m:
+        process, _, _ = example_tcp_process(m)
+
+        for _ in range(5):
+            process.send(b'ab')
+        process._segment_send_buffer()
+
+        packet, = process.sending_window.waiting_for_sending
+        assert packet["TCP"].payload.load == b'ab' * 5
+
+
+def test_no_delay_sends_small_segments():
+    with MonkeyPatch.context() as m:
+        process, _, _ = example_tcp_process(m)
+        process.no_delay = True
+
+        process.send('a' * 150)
+        process._segment_send_buffer()
+        assert [len(packet["TCP"].payload) for packet in process.sending_window.waiting_for_sending] == [100, 50]
+        assert process.buffered_data_length == 0
+
+
+def test_segments_beyond_the_receive_window_are_dropped():
+    with MonkeyPatch.context() as m:
+        process, sent_acks, _ = example_tcp_process(m)
+        m.setattr(process, 'receive_buffer_free_space', lambda: 25)
+
+        received_data = []
+        for sequence_number in [0, 10, 20]:
+            next(process._handle_packet(example_data_segment(sequence_number), received_data, False), None)
+
+        assert process.out_of_window_drop_count == 1
+        assert process.receiving_window.ack_number == 20
+        assert process.receive_window == 5
+        assert sent_acks[-1]["TCP"].window_size == 5
+
+        m.setattr(process, 'receive_buffer_free_space', lambda: 100)
+        process.receiving_window.add_data_and_remove_from_window(received_data)
+        process._send_window_update_if_needed()
+        assert sent_acks[-1]["TCP"].window_size == 100
+
+
+def test_sender_stops_at_the_receive_window_and_probes_it():
+    with MonkeyPatch.context() as m:
+        process, _, main_loop = example_tcp_process(m)
+        sent = []
+        m.setattr(process.computer, 'send_packet_stream', lambda pid, mode, packets, interval: sent.extend(packets))
+        window = process.sending_window
+        window.update_receive_window(0, 150)
+
+        def send_window():
+            process._segment_send_buffer()
+            window.fill_window()
+            window.send_window()
+
+        process.send('a' * 300)
+        send_window()
+        assert [packet["TCP"].sequence_number for packet in sent] == [0]
+
+        window.slide_window(1)
+        window.update_receive_window(100, 0)
+        send_window()
+        assert len(sent) == 1
+
+        main_loop.increase_time_by(window.rtt_estimator.rto)
+        send_window()
+        assert [packet["TCP"].sequence_number for packet in sent] == [0, 100]
+        assert window.zero_window_probe_count == 1
+
+        assert window.update_receive_window(100, 200)
+        send_window()
+        assert [packet["TCP"].sequence_number for packet in sent] == [0, 100, 200]
+
+
+def test_retransmissions_do_not_modify_the_sent_packets():
+    with MonkeyPatch.context() as m:
+        process, retransmitted, main_loop = example_tcp_process(m)
+        sent = []
+        m.setattr(process.computer, 'send_packet_stream', lambda pid, mode, packets, interval: sent.extend(packets))
+        window = process.sending_window
+        window.update_receive_window(0, 1000)
+
+        process.send('a' * 200)
+        process._segment_send_buffer()
+        window.fill_window()
+        window.send_window()
+        sent_tcp_layers = [(packet["TCP"].flags, packet["TCP"].ack_number, packet["TCP"].window_size) for packet in sent]
+        assert sent_tcp_layers
+
+        main_loop.increase_time_by(window.rtt_estimator.rto + 1)
+        window.retransmit_unacked()
+        window.congestion_control.cwnd = 10
+        window.send_window(ack_number=1234, receive_window=5)
+
+        assert [(packet["TCP"].flags, packet["TCP"].ack_number, packet["TCP"].window_size) for packet in sent[:len(sent_tcp_layers)]] == \
+            sent_tcp_layers
+        assert not any(getattr(packet["TCP"], 'is_retransmission', False) for packet in sent[:len(sent_tcp_layers)])
+        assert retransmitted[-1]["TCP"].is_retransmission
+        resent = sent[len(sent_tcp_layers):]
+        assert resent and all(packet["TCP"].is_retransmission and packet["TCP"].ack_number == 1234 for packet in resent)
@@ -0,0 +1,55 @@
+import pytest
+
+from NetSym.computing.internals.processes.abstracts.tcp_rtt_estimator import RTTEstimator
+from NetSym.consts import PROTOCOLS
+
+
+def test_initial_rto():
+    assert RTTEstimator().rto == PROTOCOLS.TCP.RTO.INITIAL
+
+
+def test_first_sample():
+    estimator = RTTEstimator()
+    estimator.add_sample(2)
+
+    assert estimator.srtt == 2
+    assert estimator.rttvar == 1
+    assert estimator.rto == 2 + PROTOCOLS.TCP.RTO.K * 1
+
+
+def test_smoothing():
+    estimator = RTTEstimator()
+    estimator.add_sample(2)
+    estimator.add_sample(4)
+
+    assert estimator.rttvar == pytest.approx(0.75 * 1 + 0.25 * 2)
+    assert estimator.srtt == pytest.approx(0.875 * 2 + 0.125 * 4)
+    assert (estimator.min_rtt, estimator.max_rtt, estimator.sample_count) == (2, 4, 2)
+
+
+@pytest.mark.parametrize(
+    "rtt, expected_rto",
+    [
+        (0.01, PROTOCOLS.TCP.RTO.MIN),
+        (100,  PROTOCOLS.TCP.RTO.MAX),
+    ]
+)
+def test_rto_bounds(rtt, expected_rto):
+    estimator = RTTEstimator()
+    estimator.add_sample(rtt)
+    assert estimator.rto == expected_rto
+
+
+def test_backoff():
+    estimator = RTTEstimator()
+    estimator.add_sample(2)
+    rto = estimator.rto
+
+    estimator.back_off()
+    estimator.back_off()
+    assert estimator.rto == rto * 4
+    assert estimator.backoff_count == 2
+
+    estimator.add_sample(2)
+    assert estimator.rto < rto * 4
+    assert estimator.backoff_count == 0
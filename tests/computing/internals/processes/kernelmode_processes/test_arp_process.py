@@ -0,0 +1,73 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.address.ip_address import IPAddress
+from NetSym.computing.computer import Computer
+from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
+from NetSym.computing.internals.processes.kernelmode_processes.arp_process import ResolveNextHopProcess
+from NetSym.consts import OS, OPCODES, PROTOCOLS
+from NetSym.packets.all import IP
+from tests.computing.test_computer import mock_for_computer_generation
+from tests.usefuls import MACS
+
+SENDER_MAC = "00:00:00:00:00:02"
+NEXT_HOP_MAC = "00:00:00:00:00:03"
+
+NEXT_HOP = IPAddress("10.0.0.2")
+
+
+def example_router(patcher):
+    main_loop = mock_for_computer_generation(patcher)
+    router = Computer(
+        "r1", OS.WINDOWS, None,
+        CableNetworkInterface(MACS[0], "10.0.0.1/24", "r1i0"),
+        CableNetworkInterface(MACS[1], "20.0.0.1/24", "r1i1"),
+    )
+    router.arp_cache.add_dynamic("20.0.0.2", SENDER_MAC)
+    return router, main_loop
+
+
+def routed_ip_layers(count):
+    return [IP(src_ip="20.0.0.2", dst_ip=str(NEXT_HOP), id=i) for i in range(count)]
+
+
+def resolving_processes(router):
+    return [process for process in router.process_scheduler.get_all_processes() if isinstance(process, ResolveNextHopProcess)]
+
+
+def test_single_resolution_per_next_hop_and_bulk_flush():
+    with MonkeyPatch.context() as m:
+        router, _ = example_router(m)
+        sent = []
+        m.setattr(router, "send_packet_stream", lambda pid, mode, packets, interval, *args: sent.extend(packets))
+
+        for ip_layer in routed_ip_layers(5):
+            router.send_when_next_hop_is_resolved(NEXT_HOP, ip_layer)
+
+        assert len(resolving_processes(router)) == 1
+        assert len(router.arp_pending_table[NEXT_HOP].packets) == 5
+
+        router.arp_cache.add_dynamic(NEXT_HOP, NEXT_HOP_MAC)
+        router.flush_arp_pending_packets(NEXT_HOP)
+
+        assert NEXT_HOP not in router.arp_pending_table
+        assert [packet["IP"].id for packet in sent] == list(range(5))
+        assert all(packet["Ether"].dst_mac == NEXT_HOP_MAC for packet in sent)
+
+
+def test_unresolved_next_hop_sends_host_unreachable_to_every_sender():
+    with MonkeyPatch.context() as m:
+        router, main_loop = example_router(m)
+        m.setattr(router, "print", lambda string: None)
+        unreachables = []
+        m.setattr(router, "send_ping_to", lambda mac, ip, type_, data, code: unreachables.append((ip, type_, code)))
+
+        for ip_layer in routed_ip_layers(3):
+            router.send_when_next_hop_is_resolved(NEXT_HOP, ip_layer)
+
+        for _ in range(PROTOCOLS.ARP.RESEND_COUNT + 1):
+            main_loop.increase_time_by(PROTOCOLS.ARP.RESEND_TIME + 1)
+            router.process_scheduler.handle_processes()
+
+        assert NEXT_HOP not in router.arp_pending_table
+        assert not resolving_processes(router)
+        assert unreachables == [("20.0.0.2", OPCODES.ICMP.TYPES.UNREACHABLE, OPCODES.ICMP.CODES.HOST_UNREACHABLE)] * 3
@@ -0,0 +1,71 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.computing.computer import Computer
+from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
+from NetSym.consts import OS, OPCODES, PROTOCOLS, COMPUTER
+from NetSym.packets.all import IP, TCP
+from NetSym.packets.cable_packet import CablePacket
+from tests.computing.test_computer import mock_for_computer_generation
+from tests.usefuls import MACS, IPS, example_ethernet
+
+LISTENING_PORT = 21
+
+
+def example_listening_socket(patcher, backlog, syn_backlog):
+    main_loop = mock_for_computer_generation(patcher)
+    computer = Computer("c1", OS.WINDOWS, None, CableNetworkInterface(MACS[0], f"{IPS[0]}/8", "c1i0"))
+    socket = computer.get_tcp_socket(1)
+    socket.bind((None, LISTENING_PORT))
+    socket.listen(backlog, syn_backlog)
+    return computer, socket, main_loop
+
+
+def example_syn(src_port):
+    return CablePacket(
+        example_ethernet() /
+        IP(src_ip="1.0.0.1", dst_ip=IPS[0]) /
+        TCP(src_port=src_port, dst_port=LISTENING_PORT, flags=OPCODES.TCP.SYN, options=[("MSS", PROTOCOLS.TCP.MAX_MSS)])
+    )
+
+
+def test_syn_queue_overflow_and_timeout():
+    with MonkeyPatch.context() as m:
+        computer, socket, main_loop = example_listening_socket(m, backlog=1, syn_backlog=2)
+        listener = socket.listener
+
+        for src_port in [1000, 1001, 1002]:
+            listener._handle_syn(example_syn(src_port))
+
+        assert len(listener.syn_queue) == 2
+        assert listener.stats.syns_dropped == 1
+        assert [socket_data.state for socket_data in computer.sockets.values()].count(COMPUTER.SOCKETS.STATES.SYN_RECEIVED) == 2
+        assert not listener._is_new_syn(example_syn(1000))
+
+        main_loop.increase_time_by(PROTOCOLS.TCP.LISTEN.HANDSHAKE_TIMEOUT + 1)
+        listener._update_syn_queue()
+        assert not listener.syn_queue
+        assert listener.stats.handshake_timeouts == 2
+        assert list(computer.sockets) == [socket]
+
+
+def test_connected_sockets_are_accepted():
+    with MonkeyPatch.context() as m:
+        computer, socket, _ = example_listening_socket(m, backlog=1, syn_backlog=2)
+        listener = socket.listener
+
+        for src_port in [1000, 1001]:
+            listener._handle_syn(example_syn(src_port))
+        for connection in listener.syn_queue.values():
+            connection.socket.is_connected = True
+
+        listener._update_syn_queue()
+        assert len(listener.accept_queue) == 1
+        assert listener.stats.accept_queue_overflows == 1  # the other one waits in the SYN queue
+
+        accepted = socket.accept()
+        assert accepted is not None and accepted.is_connected
+        assert socket.accept() is None
+
+        listener._update_syn_queue()
+        assert not listener.syn_queue
+        assert len(listener.accept_queue) == 1
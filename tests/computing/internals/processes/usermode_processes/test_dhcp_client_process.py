@@ -0,0 +1,126 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.address.mac_address import MACAddress
+from NetSym.computing.computer import Computer
+from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
+from NetSym.computing.internals.processes.abstracts.process import ReturnedPacket, PacketMetadata, WaitingFor
+from NetSym.computing.internals.processes.usermode_processes.dhcp_process.dhcp_client_process import DHCPClientProcess
+from NetSym.computing.internals.processes.usermode_processes.dhcp_process.dhcp_server_process import DHCPServerProcess
+from NetSym.consts import OS, OPCODES, PROTOCOLS
+from tests.computing.test_computer import mock_for_computer_generation
+from tests.usefuls import MACS
+
+NEW_CLIENT_MAC = MACAddress("00:00:00:00:00:03")
+
+
+class FakeRawSocket:
+    """
+    A raw socket that hands the packets that are sent through it straight to a given function
+    """
+    def __init__(self, interface, deliver):
+        self.interface = interface
+        self.deliver = deliver
+        self.received = []
+
+    @property
+    def has_data_to_receive(self):
+        return bool(self.received)
+
+    def bind(self, filter, interface):
+        pass
+
+    def get_interface(self):
+        return self.interface
+
+    def send(self, packet):
+        self.deliver(packet)
+
+    def block_until_received(self):
+        yield WaitingFor(lambda: self.has_data_to_receive)
+
+    def receive(self):
+        received, self.received = self.received, []
+        return received
+
+
+def example_dhcp_session(patcher):
+    """
+    A DHCP server and a client process whose packets reach each other immediately
+    """
+    main_loop = mock_for_computer_generation(patcher)
+    server = Computer("server", OS.LINUX, None, CableNetworkInterface(MACS[0], "10.0.0.1/24", "eth0"))
+    client = Computer("client", OS.LINUX, None, CableNetworkInterface(MACS[1], None, "eth0"))
+    server_interface, client_interface = server.interfaces[0], client.interfaces[0]
+    patcher.setattr(Computer, "print", lambda self, string: None)
+    patcher.setattr(client, "arp_grat", lambda interface: None)
+
+    server_process = DHCPServerProcess(1, server, server)
+    client_process = DHCPClientProcess(1, client)
+
+    client_socket = FakeRawSocket(client_interface, lambda packet: {
+        OPCODES.DHCP.DISCOVER: server_process.send_offer,
+        OPCODES.DHCP.REQUEST:  server_process.send_pack,
+        OPCODES.DHCP.RELEASE:  server_process.release,
+    }[packet["DHCP"].parsed_options.message_type](packet, server_interface))
+    server_process.sockets = [FakeRawSocket(server_interface, lambda packet: client_socket.received.append(
+        ReturnedPacket(packet, PacketMetadata(client_interface, main_loop.get_time(), "incoming"))
+    ))]
+    patcher.setattr(client, "get_raw_socket", lambda pid: client_socket)
+    return server_process, client_process, main_loop
+
+
+class ProcessRunner:
+    """
+    Runs the code of a process second by second, continuing it whenever the thing it waits for happened
+    """
+    def __init__(self, process, main_loop):
+        self.code = process.code()
+        self.main_loop = main_loop
+        self.waiting_for = next(self.code)
+
+    def run_for(self, seconds):
+        for _ in range(int(seconds)):
+            self.main_loop.increase_time_by(1)
+            if self.waiting_for.condition() or (self.waiting_for.has_timeout() and self.waiting_for.timeout):
+                self.waiting_for = next(self.code)
+
+
+def test_client_renews_its_lease_so_it_is_not_given_to_another_client():
+    with MonkeyPatch.context() as m:
+        server_process, client_process, main_loop = example_dhcp_session(m)
+
+        ProcessRunner(client_process, main_loop).run_for(PROTOCOLS.DHCP.LEASE_TIME * 1.5)
+        server_process.lease_database.expire_leases()
+
+        client_ip = client_process.computer.interfaces[0].get_ip()
+        assert client_process.lease is not None
+        assert server_process.lease_database[client_process.computer.interfaces[0].mac].ip == client_ip
+        assert server_process.lease_database.offer(NEW_CLIENT_MAC, server_process.computer.interfaces[0]) != client_ip
+
+
+def test_released_address_is_given_to_another_client():
+    with MonkeyPatch.context() as m:
+        server_process, client_process, main_loop = example_dhcp_session(m)
+
+        ProcessRunner(client_process, main_loop).run_for(2)
+        client_ip = client_process.computer.interfaces[0].get_ip()
+        client_process.release()
+
+        assert not client_process.computer.interfaces[0].has_ip()
+        assert client_process.computer.interfaces[0].mac not in server_process.lease_database
+        assert server_process.lease_database.offer(NEW_CLIENT_MAC, server_process.computer.interfaces[0]) == client_ip
+
+
+def test_client_stops_using_the_address_if_the_lease_is_not_renewed():
+    with MonkeyPatch.context() as m:
+        server_process, client_process, main_loop = example_dhcp_session(m)
+
+        runner = ProcessRunner(client_process, main_loop)
+        runner.run_for(2)
+        client_process.sockets[0].deliver = lambda packet: None  # the server is gone
+        runner.run_for(PROTOCOLS.DHCP.LEASE_TIME - 5)
+        assert client_process.computer.interfaces[0].has_ip()
+
+        runner.run_for(10)
+        assert client_process.lease is None
+        assert not client_process.computer.interfaces[0].has_ip()
@@ -0,0 +1,63 @@
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.address.ip_address import IPAddress
+from NetSym.computing.computer import Computer
+from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
+from NetSym.computing.internals.processes.abstracts.process import WaitingFor
+from NetSym.computing.internals.processes.usermode_processes.dns_process.dns_client_process import DNSClientProcess
+from NetSym.computing.internals.sockets.udp_socket import ReturnedUDPPacket
+from NetSym.consts import OS, PORTS
+from NetSym.usefuls.dotdict import DotDict
+from tests.computing.test_computer import mock_for_computer_generation
+
+ASKED_SERVER, OTHER_SERVER = IPAddress("10.0.0.53"), IPAddress("10.0.0.54")
+
+
+def example_dns_client(patcher, answers):
+    main_loop = mock_for_computer_generation(patcher)
+    computer = Computer("c1", OS.LINUX, None, CableNetworkInterface("00:00:00:00:00:01", "10.0.0.1/24", "eth0"))
+    process = DNSClientProcess(1, computer, [ASKED_SERVER, OTHER_SERVER], "host.example.com.")
+    patcher.setattr(process, "_build_dns_query", lambda name: b"query")
+    process.socket = DotDict(
+        sendto=lambda data, address: None,
+        block_until_received=lambda timeout: (yield WaitingFor.nothing()),
+        receivefrom=lambda: answers.pop(0) if answers else [],
+    )
+    return computer, process, main_loop
+
+
+def test_answers_from_servers_that_were_not_asked_are_ignored():
+    with MonkeyPatch.context() as m:
+        answers = [
+            [ReturnedUDPPacket(b"late answer", OTHER_SERVER, PORTS.DNS)],
+            [ReturnedUDPPacket(b"answer", ASKED_SERVER, PORTS.DNS)],
+        ]
+        computer, process, main_loop = example_dns_client(m, answers)
+
+        query = process._query_servers([ASKED_SERVER])
+        next(query)
+        main_loop.increase_time_by(0.1)
+        next(query)
+        main_loop.increase_time_by(0.1)
+        with pytest.raises(StopIteration) as stop:
+            next(query)
+
+        assert stop.value.value == b"answer"
+        assert computer.nameserver_health[ASKED_SERVER].answer_count == 1
+        assert computer.nameserver_health[OTHER_SERVER].answer_count == 0
+
+
+def test_query_times_out_if_only_servers_that_were_not_asked_answer():
+    with MonkeyPatch.context() as m:
+        computer, process, main_loop = example_dns_client(m, [[ReturnedUDPPacket(b"late answer", OTHER_SERVER, PORTS.DNS)]])
+
+        query = process._query_servers([ASKED_SERVER])
+        next(query)
+        main_loop.increase_time_by(process._query_timeout + 1)
+        with pytest.raises(StopIteration) as stop:
+            next(query)
+
+        assert stop.value.value is None
+        assert computer.nameserver_health[ASKED_SERVER].timeout_count == 1
+        assert computer.nameserver_health[OTHER_SERVER].answer_count == 0
@@ -0,0 +1,99 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.address.ip_address import IPAddress
+from NetSym.computing.computer import Computer
+from NetSym.computing.internals.filesystem.file import File
+from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
+from NetSym.computing.internals.processes.usermode_processes.dns_process.dns_server_process import DNSServerProcess
+from NetSym.computing.internals.processes.usermode_processes.dns_process.zone import Zone
+from NetSym.consts import OS
+from NetSym.usefuls.dotdict import DotDict
+from tests.computing.test_computer import mock_for_computer_generation
+
+DOMAIN_NAME = "example.com."
+
+
+def example_dns_server(patcher):
+    mock_for_computer_generation(patcher)
+    computer = Computer("dns", OS.LINUX, None, CableNetworkInterface("00:00:00:00:00:01", "10.0.0.1/24", "eth0"))
+    process = DNSServerProcess(1, computer, [DOMAIN_NAME])
+    process._init_zone_file(DOMAIN_NAME)
+    return computer, process
+
+
+def count_zone_parsing(patcher):
+    parse_count = []
+    original_from_file_format = Zone.from_file_format.__func__
+    patcher.setattr(Zone, "from_file_format", classmethod(lambda cls, content: parse_count.append(1) or original_from_file_format(cls, content)))
+    return parse_count
+
+
+def test_zone_is_parsed_only_when_the_file_changes():
+    with MonkeyPatch.context() as m:
+        computer, process = example_dns_server(m)
+        parse_count = count_zone_parsing(m)
+
+        zone = process._zone_by_domain_name(DOMAIN_NAME)
+        assert process._zone_by_domain_name("example.com") is zone
+        assert len(parse_count) == 1
+
+        with process._zone_file_by_domain_name(DOMAIN_NAME) as zone_file:
+            zone_file.append("mail IN A 10.0.0.5\n")
+        assert process._zone_by_domain_name(DOMAIN_NAME)["mail"].record_data == "10.0.0.5"
+        assert len(parse_count) == 2
+
+
+def test_add_dns_record_updates_the_cached_zone_and_the_file():
+    with MonkeyPatch.context() as m:
+        computer, process = example_dns_server(m)
+        parse_count = count_zone_parsing(m)
+        zone = process._zone_by_domain_name(DOMAIN_NAME)
+
+        process.add_dns_record("mail", IPAddress("10.0.0.5"))
+        assert process._zone_by_domain_name(DOMAIN_NAME) is zone
+        assert zone["mail"].record_data == "10.0.0.5"
+        assert len(parse_count) == 1
+
+        with process._zone_file_by_domain_name(DOMAIN_NAME) as zone_file:
+            assert Zone.from_file_format(zone_file.read()) == zone
+
+
+def test_clients_of_the_same_name_share_a_single_query():
+    with MonkeyPatch.context() as m:
+        computer, process = example_dns_server(m)
+        started, sent = [], []
+        m.setattr(process, "_start_single_dns_query", lambda name, dns_server: started.append(name))
+        m.setattr(process, "socket", DotDict(sendto=lambda data, address: sent.append(address)))
+        with process._zone_file_by_domain_name(DOMAIN_NAME) as zone_file:
+            zone_file.append("cool IN NS 10.0.0.2\n")
+
+        clients = [(IPAddress(f"10.0.0.{i}"), 1000 + i) for i in range(10, 13)]
+        for client_ip, client_port in clients:
+            process._resolve_name("a.cool.example.com.", client_ip, client_port)
+
+        assert started == ["a.cool.example.com."]
+        assert process.coalesced_query_count == 2
+        assert process._is_active_client(*clients[2])
+
+        computer.dns_cache.add_item("a.cool.example.com.", IPAddress("10.0.0.99"), 100)
+        process._send_query_answers_to_clients(process._get_resolved_names())
+        assert sent == clients
+        assert not process._active_queries
+
+
+def test_add_dns_record_does_not_read_the_zone_file():
+    with MonkeyPatch.context() as m:
+        computer, process = example_dns_server(m)
+        with process._zone_file_by_domain_name(DOMAIN_NAME) as zone_file:
+            zone_file.append("www IN A 10.0.0.4")
+        zone = process._zone_by_domain_name(DOMAIN_NAME)
+
+        read_count = []
+        m.setattr(File, "read", lambda self: read_count.append(1) or self._joined_content())
+        process.add_dns_record("mail", IPAddress("10.0.0.5"))
+        process.add_dns_record("ftp", IPAddress("10.0.0.6"))
+        assert not read_count
+
+        with process._zone_file_by_domain_name(DOMAIN_NAME) as zone_file:
+            assert Zone.from_file_format(zone_file.read()) == zone
+            assert [line.split()[0] for line in zone_file.readlines()[-3:]] == ["www", "mail", "ftp"]
@@ -0,0 +1,75 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.computing.computer import Computer
+from NetSym.computing.internals.processes.abstracts.process import WaitingFor
+from NetSym.computing.internals.processes.usermode_processes.ftp_process.ftp_server_process import ServerFTPSessionProcess
+from NetSym.consts import OS, PROTOCOLS
+from tests.computing.test_computer import mock_for_computer_generation
+
+CHUNK_SIZE = PROTOCOLS.FTP.CHUNK_SIZE
+
+
+class RecordingSocket:
+    """Holds what was sent until `drain` is called - like a TCP socket whose data was not divided into segments yet"""
+    def __init__(self):
+        self.unsent = []
+        self.sent = []
+        self.is_closed = False
+
+    @property
+    def unsent_data_length(self):
+        return sum(map(len, self.unsent))
+
+    def block_until_unsent_data_below(self, length):
+        yield WaitingFor(lambda: self.unsent_data_length < length or self.is_closed)
+
+    def send(self, data):
+        self.unsent.append(data)
+
+    def drain(self):
+        self.sent.extend(self.unsent)
+        self.unsent.clear()
+
+
+def test_file_append_keeps_content_and_version():
+    with MonkeyPatch.context() as m:
+        mock_for_computer_generation(m)
+        computer = Computer("c1", OS.WINDOWS)
+        computer.filesystem.output_to_file("abc", "/f")
+        file = computer.filesystem.file_at_path(None, "/f")
+        version = file.version
+
+        for piece in ["de", "", "fgh"]:
+            computer.filesystem.output_to_file(piece, "/f", append=True)
+
+        with file:
+            assert file.read() == "abcdefgh"
+            assert file.version == version + 3
+            file.write("x")
+            file.append("y")
+            assert file.read() == "xy"
+
+
+def test_server_sends_file_in_bounded_chunks():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_for_computer_generation(m)
+        computer = Computer("c1", OS.WINDOWS)
+        m.setattr(computer, "print", lambda string: None)
+        content = ''.join(chr(ord('a') + (i % 26)) if i % 3 else '\u05d0' for i in range(10 * CHUNK_SIZE + 17))
+        # ^ some of the characters take two bytes, so chunks end in the middle of characters
+        computer.filesystem.output_to_file(content, "/f")
+
+        socket = RecordingSocket()
+        process = ServerFTPSessionProcess(1, computer, socket)
+        for waiting_for in process._send_file("/f"):
+            if not waiting_for.condition():
+                assert socket.unsent_data_length >= PROTOCOLS.FTP.MAX_UNSENT_DATA
+                main_loop.increase_time_by(1)
+                socket.drain()
+            assert socket.unsent_data_length < PROTOCOLS.FTP.MAX_UNSENT_DATA
+
+        socket.drain()
+        assert all(len(chunk) <= CHUNK_SIZE for chunk in socket.sent)
+        assert b''.join(socket.sent).decode() == content
+        assert process.progress.transferred == process.progress.total_size == len(content.encode())
+        assert process.progress.throughput > 0
@@ -0,0 +1,150 @@
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.address.mac_address import MACAddress
+from NetSym.computing.connections.cable_connection import CableConnection
+from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
+from NetSym.computing.internals.processes.usermode_processes.rstp_process import RSTPProcess
+from NetSym.computing.internals.processes.usermode_processes.stp_process import STPProcess
+from NetSym.computing.switch import Switch
+from NetSym.consts import PROTOCOLS
+from NetSym.packets.all import Ether, LLC, STP
+from NetSym.packets.cable_packet import CablePacket
+from tests.computing.test_computer import mock_for_computer_generation
+
+ROOT_PRIORITY, MY_PRIORITY, WORSE_PRIORITY, BETTER_PRIORITY = 1000, 2000, 3000, 1500
+RSTP = PROTOCOLS.STP.RSTP
+
+
+def example_rstp_switch(patcher, port_count=2):
+    main_loop = mock_for_computer_generation(patcher)
+    patcher.setattr(CableConnection, "length", property(lambda self: 100))
+    switch = Switch("s1", MY_PRIORITY, PROTOCOLS.STP.MODES.RSTP)
+    patcher.setattr(switch, "print", lambda string: None)
+    for i in range(port_count):
+        switch.interfaces.append(CableNetworkInterface(f"00:00:00:00:01:0{i}", name=f"s1i{i}"))
+        switch.interfaces[i].connect(CableNetworkInterface(f"00:00:00:00:02:0{i}"))
+
+    sent = []
+    patcher.setattr(switch, "send_rstp", lambda interface, *args: sent.append((interface, args[-2])))
+
+    process = RSTPProcess(1, switch)
+    process._update_ports()
+    return switch, process, sent, main_loop
+
+
+def bpdu(root_priority, path_cost, bridge_priority, role=RSTP.ROLES.DESIGNATED, flags=0, port_id=1):
+    return CablePacket(
+        Ether(src_mac="00:00:00:00:03:00", dst_mac=str(MACAddress.stp_multicast())) /
+        LLC() /
+        STP(
+            version=RSTP.VERSION,
+            bpdu_type=RSTP.BPDU_TYPE,
+            bpdu_flags=(role << RSTP.FLAGS.ROLE_SHIFT) | flags,
+            root_id=root_priority,
+            root_mac="00:00:00:00:00:01",
+            path_cost=path_cost,
+            bridge_id=bridge_priority,
+            bridge_mac="00:00:00:00:00:02",
+            port_id=port_id,
+            age=0,
+            max_age=RSTP.MAX_AGE,
+        )
+    )
+
+
+def run_once(process):
+    process._update_roles()
+    process._answer_proposals()
+    process._update_port_states()
+    process._send_bpdus()
+    process._update_convergence()
+
+
+def roles_and_states(switch, process):
+    return [(process.stp_ports[port].state, process.stp_ports[port].port_state) for port in switch.interfaces]
+
+
+def test_port_roles():
+    with MonkeyPatch.context() as m:
+        switch, process, _, _ = example_rstp_switch(m, port_count=3)
+        process._receive_bpdu(bpdu(ROOT_PRIORITY, 0, ROOT_PRIORITY), switch.interfaces[0])
+        process._receive_bpdu(bpdu(ROOT_PRIORITY, 66, WORSE_PRIORITY), switch.interfaces[1])
+        process._receive_bpdu(bpdu(ROOT_PRIORITY, 66, BETTER_PRIORITY), switch.interfaces[2])
+        run_once(process)
+
+        assert process.root_port is switch.interfaces[0]
+        assert process.root_bid.priority == ROOT_PRIORITY
+        assert [role for role, _ in roles_and_states(switch, process)] == \
+            [PROTOCOLS.STP.ROOT_PORT, PROTOCOLS.STP.DESIGNATED_PORT, RSTP.ALTERNATE_PORT]
+        assert [port_state for _, port_state in roles_and_states(switch, process)] == [RSTP.FORWARDING, RSTP.DISCARDING, RSTP.DISCARDING]
+
+
+def test_proposal_on_root_port_syncs_and_agrees():
+    with MonkeyPatch.context() as m:
+        switch, process, sent, _ = example_rstp_switch(m)
+        root_port, designated_port = switch.interfaces
+        process._receive_bpdu(bpdu(ROOT_PRIORITY, 0, ROOT_PRIORITY), root_port)
+        process._receive_bpdu(bpdu(ROOT_PRIORITY, 66, WORSE_PRIORITY), designated_port)
+        run_once(process)
+
+        process._receive_bpdu(bpdu(ROOT_PRIORITY, 66, WORSE_PRIORITY, role=RSTP.ROLES.ROOT, flags=RSTP.FLAGS.AGREEMENT), designated_port)
+        run_once(process)
+        assert process.stp_ports[designated_port].is_forwarding
+        assert process.is_converged
+
+        process._receive_bpdu(bpdu(ROOT_PRIORITY - 1, 0, ROOT_PRIORITY - 1, flags=RSTP.FLAGS.PROPOSAL), root_port)
+        sent.clear()
+        run_once(process)
+
+        assert not process.stp_ports[designated_port].is_forwarding
+        assert process.stp_ports[root_port].is_forwarding
+        assert (root_port, RSTP.FLAGS.AGREEMENT | (RSTP.ROLES.ROOT << RSTP.FLAGS.ROLE_SHIFT) | RSTP.FLAGS.LEARNING | RSTP.FLAGS.FORWARDING) in \
+            [(interface, flags & ~RSTP.FLAGS.TOPOLOGY_CHANGE) for interface, flags in sent]
+        assert any(interface is designated_port and flags & RSTP.FLAGS.PROPOSAL for interface, flags in sent)
+
+
+def test_alternate_port_takes_over_right_away():
+    with MonkeyPatch.context() as m:
+        switch, process, _, _ = example_rstp_switch(m)
+        root_port, alternate_port = switch.interfaces
+        process._receive_bpdu(bpdu(ROOT_PRIORITY, 0, ROOT_PRIORITY), root_port)
+        process._receive_bpdu(bpdu(ROOT_PRIORITY, 66, BETTER_PRIORITY), alternate_port)
+        run_once(process)
+        assert process.stp_ports[alternate_port].state == RSTP.ALTERNATE_PORT
+
+        root_port.disconnect()
+        process._update_ports()
+        run_once(process)
+
+        assert process.root_port is alternate_port
+        assert process.stp_ports[alternate_port].is_forwarding
+        assert process.last_convergence_time is not None
+
+
+def test_ports_without_bpdus_become_forwarding_edge_ports():
+    with MonkeyPatch.context() as m:
+        switch, process, _, main_loop = example_rstp_switch(m, port_count=1)
+        run_once(process)
+        assert roles_and_states(switch, process) == [(PROTOCOLS.STP.DESIGNATED_PORT, RSTP.DISCARDING)]
+
+        main_loop.increase_time_by(RSTP.EDGE_DETECTION_TIME + 1)
+        process._update_ports()
+        run_once(process)
+        assert process.stp_ports[switch.interfaces[0]].is_edge
+        assert roles_and_states(switch, process) == [(PROTOCOLS.STP.DESIGNATED_PORT, RSTP.FORWARDING)]
+        assert process.topology_change_count == 0
+
+        process._receive_bpdu(bpdu(ROOT_PRIORITY, 0, ROOT_PRIORITY), switch.interfaces[0])
+        assert not process.stp_ports[switch.interfaces[0]].is_edge
+
+
+def test_stp_mode_switch_restarts_the_spanning_tree():
+    with MonkeyPatch.context() as m:
+        switch, _, _, _ = example_rstp_switch(m)
+        switch.stp_mode = PROTOCOLS.STP.MODES.STP
+        switch.start_stp()
+        assert not switch.process_scheduler.is_usermode_process_running_by_type(RSTPProcess)
+
+        switch.set_stp_mode(PROTOCOLS.STP.MODES.RSTP)
+        stp_processes = [process for process, _ in switch.process_scheduler.waiting_usermode_processes if isinstance(process, STPProcess)]
+        assert len(stp_processes) == 1 and isinstance(stp_processes[0], RSTPProcess)
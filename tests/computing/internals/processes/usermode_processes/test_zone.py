@@ -0,0 +1,52 @@
+import pytest
+
+from NetSym.computing.internals.processes.usermode_processes.dns_process.zone import Zone, ZoneRecord, EXAMPLE
+from NetSym.consts import OPCODES
+from NetSym.packets.usefuls.dns import does_domain_hostname_end_with, canonize_domain_hostname
+
+NAMES = [
+    "example.com.", "www.example.com.", "mail.example.com", "nothing.example.com.", "a.b.cool.example.com.",
+    "cool.example.com.", "ns.example.com.", "example.org.", "wwwtest.example.com.",
+]
+
+
+def linear_longest_matching_ns_record(name, zone):
+    longest_record = None
+    for record in zone:
+        if does_domain_hostname_end_with(name, record.record_name, zone_origin=zone.origin):
+            if longest_record is None:
+                longest_record = record
+            elif len(canonize_domain_hostname(record.record_name, zone.origin)) > \
+                    len(canonize_domain_hostname(longest_record.record_name, zone.origin)) and \
+                    record.record_type in [OPCODES.DNS.TYPES.CANONICAL_NAME_FOR_AN_ALIAS, OPCODES.DNS.TYPES.AUTHORITATIVE_NAME_SERVER]:
+                longest_record = record
+    return longest_record
+
+
+def linear_exact_host_record(name, zone):
+    for record in zone:
+        if canonize_domain_hostname(record.record_name, zone.origin) == canonize_domain_hostname(name) and \
+                record.record_type in [OPCODES.DNS.TYPES.CANONICAL_NAME_FOR_AN_ALIAS, OPCODES.DNS.TYPES.HOST_ADDRESS]:
+            return record
+    return None
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_trie_lookups_match_a_scan_of_the_records(name):
+    zone = Zone.from_file_format(EXAMPLE)
+    zone.add_record(ZoneRecord("deep.cool.example.com.", OPCODES.DNS.CLASSES.INTERNET, OPCODES.DNS.TYPES.AUTHORITATIVE_NAME_SERVER, "192.0.2.253"))
+
+    assert zone.longest_matching_name_server_record(name) is linear_longest_matching_ns_record(name, zone)
+    assert zone.exact_host_record(name) is linear_exact_host_record(name, zone)
+
+
+def test_delegation_and_aliases():
+    zone = Zone.from_file_format(EXAMPLE)
+    assert zone.longest_matching_name_server_record("a.b.cool.example.com.").record_data == "192.0.2.254"
+    assert zone.exact_host_record("mail2.example.com.").record_data == "192.0.2.4"
+    assert zone.resolve_aliasing(zone["wwwtest"]) == "192.0.2.1"
+
+    zone.add_record(ZoneRecord("mail4", OPCODES.DNS.CLASSES.INTERNET, OPCODES.DNS.TYPES.HOST_ADDRESS, "192.0.2.6"))
+    assert zone.exact_host_record("mail4.example.com.").record_data == "192.0.2.6"
+    with pytest.raises(KeyError):
+        zone["mail5"]
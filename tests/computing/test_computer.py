@@ -10,12 +10,14 @@ from NetSym.address.mac_address import MACAddress
 from NetSym.computing.computer import Computer
 from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
 from NetSym.computing.internals.network_interfaces.wireless_network_interface import WirelessNetworkInterface
-from NetSym.computing.internals.processes.abstracts.process import ReturnedPacket, PacketMetadata
+from NetSym.computing.internals.processes.abstracts.process import ReturnedPacket, PacketMetadata, WaitingFor
+from NetSym.computing.internals.processes.usermode_processes.dns_process.dns_client_process import DNSClientProcess
 from NetSym.computing.internals.processes.usermode_processes.sniffing_process import SniffingProcess
-from NetSym.consts import OS, FILE_PATHS, DIRECTORIES, COMPUTER, INTERFACES, PACKET, OPCODES
+from NetSym.consts import OS, FILE_PATHS, DIRECTORIES, COMPUTER, INTERFACES, PACKET, OPCODES, PROTOCOLS
 from NetSym.exceptions import NoSuchInterfaceError, PopupWindowWithThisError, NoSuchProcessError, NoIPAddressError
 from NetSym.gui.abstracts.graphics_object import GraphicsObject
 from NetSym.gui.user_interface.popup_windows.popup_window import PopupWindow
+from NetSym.packets.all import UDP
 from NetSym.packets.cable_packet import CablePacket
 from NetSym.usefuls.dotdict import DotDict
 from tests.usefuls import MACS, IPS, example_ethernet, example_arp, mock_mainloop_time, example_ip
@@ -1102,57 +1104,131 @@ def test_handle_arp(example_computers):
 #     yield from ARPProcess(requesting_process.pid, self, ip_for_the_mac.string_ip).code()
 #     return ip_for_the_mac, self.arp_cache[ip_for_the_mac].mac
 #
-# def test_send_packet_stream(self,
-#                        pid: int,
-#                        mode: str,
-#                        packets: Iterator[Packet],
-#                        interval_between_packets: T_Time,
-#                        interface: Optional[Interface] = None,
-#                        sending_socket: Optional[RawSocket] = None):
-#     """
-#     Send a large amount of packets that should be sent in quick succession one after the other
-#     This will make sure they are sent with the appropriate time gaps - in order to allow the user to see them
-#     """
-#     existing_sending_queue = self.get_packet_sending_queue(pid, mode)
-#     if existing_sending_queue is not None:
-#         existing_sending_queue.packets.extend(packets)
-#         return
-#
-#     self._packet_sending_queues.append(
-#         PacketSendingQueue(
-#             self,
-#             pid,
-#             mode,
-#             deque(packets),
-#             interval_between_packets,
-#             interface,
-#             sending_socket,
-#         )
-#     )
-#
-# def test__handle_packet_streams(self):
-#     """
-#     Allows all of the PacketSendingQueue-s to perform their actions (send their packets with time gaps)
-#     Deletes the queues that are done sending.
-#     """
-#     for packet_sending_queue in self._packet_sending_queues[:]:
-#         packet_sending_queue.send_packets_with_time_gaps()
-#
-# def test__cleanup_unused_packet_sending_queues(self):
-#     """
-#     Remove PacketSendingQueues that have no running process attached to them
-#     """
-#     for packet_sending_queue in self._packet_sending_queues[:]:
-#         if not self.process_scheduler.is_process_running(packet_sending_queue.pid, packet_sending_queue.process_mode) and \
-#            packet_sending_queue.pid != COMPUTER.PROCESSES.INIT_PID:
-#             self._packet_sending_queues.remove(packet_sending_queue)
-#
-# def test_get_packet_sending_queue(self, pid: int, mode: str):
-#     """
-#     Get the PacketSendingQueue object of the process with the given ID
-#     """
-#     return get_the_one(self._packet_sending_queues, lambda psq: (psq.pid == pid and psq.process_mode == mode))
-#
+
+
+def _connected_computer_and_stream_packets(count):
+    computer, = get_example_computers()
+    cast(CableNetworkInterface, computer.interfaces[0]).connect(CableNetworkInterface())
+    return computer, [CablePacket(example_ethernet() / example_ip()) for _ in range(count)]
+
+
+def test_send_packet_stream_time_gaps():
+    with MonkeyPatch.context() as m:
+        main_loop = mock_for_computer_generation(m)
+        computer, packets = _connected_computer_and_stream_packets(3)
+        to_send = computer.interfaces[0].connection_side._packets_to_send
+
+        computer.send_packet_stream(COMPUTER.PROCESSES.INIT_PID, COMPUTER.PROCESSES.MODES.KERNELMODE, packets, 1, computer.interfaces[0])
+        computer._handle_packet_streams()
+        assert len(to_send) == 0
+
+        for expected_sent_count in [1, 2, 3, 3]:
+            main_loop.increase_time_by(1.5)
+            computer._handle_packet_streams()
+            computer._handle_packet_streams()
+            assert len(to_send) == expected_sent_count
+
+        assert not computer._packet_sending_schedule
+
+
+def test_send_packet_stream_same_queue():
+    with MonkeyPatch.context() as m:
+        mock_for_computer_generation(m)
+        computer, packets = _connected_computer_and_stream_packets(4)
+
+        computer.send_packet_stream(5, COMPUTER.PROCESSES.MODES.KERNELMODE, packets[:2], 1, computer.interfaces[0])
+        computer.send_packet_stream(5, COMPUTER.PROCESSES.MODES.KERNELMODE, packets[2:], 1, computer.interfaces[0])
+        computer.send_packet_stream(5, COMPUTER.PROCESSES.MODES.USERMODE, packets[:1], 1, computer.interfaces[0])
+
+        assert len(computer.get_packet_sending_queue(5, COMPUTER.PROCESSES.MODES.KERNELMODE).packets) == 4
+        assert len(computer.get_packet_sending_queue(5, COMPUTER.PROCESSES.MODES.USERMODE).packets) == 1
+        assert computer.get_packet_sending_queue(6, COMPUTER.PROCESSES.MODES.KERNELMODE) is None
+        assert len(computer._packet_sending_schedule) == 2
+
+
+def test_send_packet_stream_burst_mode():
+    with MonkeyPatch.context() as m:
+        mock_for_computer_generation(m)
+        m.setattr(COMPUTER.PACKET_SENDING_QUEUES, 'IS_BURST_MODE', True)
+        computer, packets = _connected_computer_and_stream_packets(3)
+
+        computer.send_packet_stream(COMPUTER.PROCESSES.INIT_PID, COMPUTER.PROCESSES.MODES.KERNELMODE, packets, 1, computer.interfaces[0])
+
+        assert len(computer.interfaces[0].connection_side._packets_to_send) == 3
+        assert not computer.get_packet_sending_queue(COMPUTER.PROCESSES.INIT_PID, COMPUTER.PROCESSES.MODES.KERNELMODE).packets
+        assert not computer._packet_sending_schedule
+
+
+def test_cleanup_unused_packet_sending_queues():
+    with MonkeyPatch.context() as m:
+        mock_for_computer_generation(m)
+        computer, packets = _connected_computer_and_stream_packets(2)
+
+        computer.send_packet_stream(COMPUTER.PROCESSES.INIT_PID, COMPUTER.PROCESSES.MODES.KERNELMODE, packets[:1], 1, computer.interfaces[0])
+        computer.send_packet_stream(1234, COMPUTER.PROCESSES.MODES.KERNELMODE, packets[1:], 1, computer.interfaces[0])
+        computer._cleanup_unused_packet_sending_queues()
+
+        assert computer.get_packet_sending_queue(COMPUTER.PROCESSES.INIT_PID, COMPUTER.PROCESSES.MODES.KERNELMODE) is not None
+        assert computer.get_packet_sending_queue(1234, COMPUTER.PROCESSES.MODES.KERNELMODE) is None
+
+
+def test_dns_servers_and_resolver_policy(example_computers):
+    computer, = example_computers
+    assert computer.dns_servers == []
+    assert computer.dns_resolver_policy == PROTOCOLS.DNS.RESOLVER_POLICIES.SEQUENTIAL
+
+    with computer.filesystem.parsed_editable_conf_file(COMPUTER.FILES.CONFIGURATIONS.DNS_CLIENT_PATH, raise_if_does_not_exist=False) as conf:
+        conf['nameserver'] = IPS
+        conf['options'] = ['rotate']
+    assert computer.dns_servers == list(map(IPAddress, IPS))
+    assert computer.dns_server == IPAddress(IPS[0])
+
+    computer.dns_resolver_policy = PROTOCOLS.DNS.RESOLVER_POLICIES.PARALLEL
+    assert computer.dns_resolver_policy == PROTOCOLS.DNS.RESOLVER_POLICIES.PARALLEL
+    computer.dns_resolver_policy = PROTOCOLS.DNS.RESOLVER_POLICIES.SEQUENTIAL
+    assert computer.filesystem.parse_conf_file_format(COMPUTER.FILES.CONFIGURATIONS.DNS_CLIENT_PATH)['options'] == ['rotate']
+
+
+def test_resolve_domain_name_waits_for_a_pending_query():
+    with MonkeyPatch.context() as m:
+        mock_for_computer_generation(m)
+        computer, = get_example_computers()
+        queries = []
+
+        def fake_dns_query(process):
+            queries.append(process._name_to_resolve)
+            yield WaitingFor.nothing()
+            computer.dns_cache.add_item(process._name_to_resolve, IPAddress(IPS[1]), 100)
+
+        m.setattr(DNSClientProcess, "code", fake_dns_query)
+        requesting_process = DotDict(pid=1)
+        resolvers = [computer.resolve_domain_name(requesting_process, "host.example.com.", IPAddress(IPS[0])) for _ in range(3)]
+
+        waiting = [next(resolver) for resolver in resolvers]
+        assert len(queries) == 1
+        assert not waiting[1].condition()
+
+        for resolver in resolvers:
+            with pytest.raises(StopIteration) as stop:
+                next(resolver)
+            assert stop.value.value == IPAddress(IPS[1])
+        assert not computer.dns_cache.pending_queries
+
+
+def test_pending_dns_query_is_waited_for_as_long_as_it_may_take():
+    with MonkeyPatch.context() as m:
+        mock_for_computer_generation(m)
+        computer, = get_example_computers()
+        m.setattr(DNSClientProcess, "code", lambda process: (yield WaitingFor.nothing()))
+        with computer.filesystem.parsed_editable_conf_file(COMPUTER.FILES.CONFIGURATIONS.DNS_CLIENT_PATH, raise_if_does_not_exist=False) as conf:
+            conf['nameserver'] = IPS
+
+        for policy, attempts_per_retry in [(PROTOCOLS.DNS.RESOLVER_POLICIES.SEQUENTIAL, len(IPS)), (PROTOCOLS.DNS.RESOLVER_POLICIES.PARALLEL, 1)]:
+            computer.dns_resolver_policy = policy
+            resolvers = [computer.resolve_domain_name(DotDict(pid=1), f"{policy}.example.com.") for _ in range(2)]
+            _, waiting = [next(resolver) for resolver in resolvers]
+            assert waiting.timeout.seconds == PROTOCOLS.DNS.CLIENT_QUERY_TIMEOUT * PROTOCOLS.DNS.DEFAULT_RETRY_COUNT * attempts_per_retry
+
 # # ------------------------------- v  Sockets  v ----------------------------------------------------------------------
 #
 # def test_get_socket(self,
@@ -1465,3 +1541,19 @@ def test_handle_arp(example_computers):
 #     returned.filesystem = Filesystem.from_dict_load(dict_["filesystem"])
 #     # returned.scale_factor = dict_["scale_factor"]
 #     return returned
+
+
+def test_port_unreachables_are_rate_limited(example_computers):
+    computer, = example_computers
+    with MonkeyPatch.context() as m:
+        mock_mainloop_time(m)
+        sent = []
+        m.setattr(computer, "send_to", lambda *args, **kwargs: sent.append(args[-1]))
+        computer.icmp_rate_limiter.configure(OPCODES.ICMP.TYPES.UNREACHABLE, rate=1, burst=3)
+
+        packet = CablePacket(example_ethernet() / example_ip() / UDP(src_port=1234, dst_port=4321))
+        for _ in range(5):
+            computer._handle_udp(ReturnedPacket(packet, PacketMetadata(computer.interfaces[0], 1.0, PACKET.DIRECTION.INCOMING)))
+
+        assert len(sent) == 3
+        assert computer.icmp_rate_limiter.statistics[OPCODES.ICMP.TYPES.UNREACHABLE].suppressed_count == 2
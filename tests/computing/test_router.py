@@ -0,0 +1,65 @@
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from NetSym.computing.computer import Computer
+from NetSym.computing.internals.network_interfaces.cable_network_interface import CableNetworkInterface
+from NetSym.computing.internals.processes.kernelmode_processes.route_packet_process import RoutePacket
+from NetSym.computing.router import Router
+from NetSym.consts import OS, COMPUTER
+from NetSym.packets.all import Ether, IP
+from NetSym.packets.cable_packet import CablePacket
+from tests.computing.test_computer import mock_for_computer_generation
+
+ROUTER_MACS = ["00:00:00:00:01:00", "00:00:00:00:01:01"]
+SENDER_MAC, DESTINATION_MAC = "00:00:00:00:02:00", "00:00:00:00:02:01"
+
+
+def example_router(patcher):
+    mock_for_computer_generation(patcher)
+    router = Router("r1", [CableNetworkInterface(mac, f"{i}0.0.0.1/24", f"r1i{i}") for i, mac in enumerate(ROUTER_MACS, start=1)], False)
+    for i, mac in enumerate([SENDER_MAC, DESTINATION_MAC], start=1):
+        router.interfaces[i - 1].connect(Computer(f"c{i}", OS.WINDOWS, None, CableNetworkInterface(mac, f"{i}0.0.0.2/24")).interfaces[0])
+
+    sent = []
+    patcher.setattr(router, "send_packet_stream", lambda pid, mode, packets, interval, *args: sent.extend(packets))
+    return router, sent
+
+
+def routed_packet(ttl=64, length=10):
+    return CablePacket(Ether(src_mac=SENDER_MAC, dst_mac=ROUTER_MACS[0]) / IP(src_ip="10.0.0.2", dst_ip="20.0.0.2", ttl=ttl) / ("a" * length))
+
+
+def routing_processes(router):
+    return [process for process in router.process_scheduler.get_all_processes(COMPUTER.PROCESSES.MODES.KERNELMODE) if isinstance(process, RoutePacket)]
+
+
+def test_known_next_hop_is_forwarded_in_kernel():
+    with MonkeyPatch.context() as m:
+        router, sent = example_router(m)
+        router.arp_cache.add_dynamic("20.0.0.2", DESTINATION_MAC)
+        packet = routed_packet()
+
+        assert router._forward_in_kernel(packet)
+        assert not routing_processes(router)
+        assert sent[0]["Ether"].dst_mac == DESTINATION_MAC
+        assert sent[0]["Ether"].src_mac == ROUTER_MACS[1]
+        assert sent[0]["IP"].ttl == 63
+        assert packet["IP"].ttl == 64
+
+
+@pytest.mark.parametrize(
+    "is_next_hop_known, ttl, length",
+    [
+        (False, 64, 10),     # needs ARP
+        (True,  1,  10),     # needs an ICMP time exceeded
+        (True,  64, 10000),  # needs fragmentation
+    ]
+)
+def test_other_packets_are_left_for_a_process(is_next_hop_known, ttl, length):
+    with MonkeyPatch.context() as m:
+        router, sent = example_router(m)
+        if is_next_hop_known:
+            router.arp_cache.add_dynamic("20.0.0.2", DESTINATION_MAC)
+
+        assert not router._forward_in_kernel(routed_packet(ttl, length))
+        assert not sent
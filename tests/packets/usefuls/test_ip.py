@@ -0,0 +1,15 @@
+from NetSym.packets.all import IP, TCP, UDP
+from NetSym.packets.packet import Packet
+from NetSym.packets.usefuls.ip import flow_hash
+from tests.usefuls import example_ethernet
+
+
+def test_flow_hash():
+    def packet(transport, src_ip="1.1.1.1"):
+        return Packet(example_ethernet() / IP(src_ip=src_ip, dst_ip="2.2.2.2") / transport)
+
+    tcp_flow = flow_hash(packet(TCP(src_port=1000, dst_port=80)))
+    assert tcp_flow == flow_hash(packet(TCP(src_port=1000, dst_port=80, sequence_number=5)))
+    assert tcp_flow != flow_hash(packet(TCP(src_port=1001, dst_port=80)))
+    assert tcp_flow != flow_hash(packet(UDP(src_port=1000, dst_port=80)))
+    assert tcp_flow != flow_hash(packet(TCP(src_port=1000, dst_port=80), src_ip="1.1.1.3"))